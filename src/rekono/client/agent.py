@@ -0,0 +1,410 @@
+'''Local agent that keeps HTTP connections to Rekono open for short-lived CLI processes.'''
+
+import json
+import os
+import socket
+import socketserver
+import struct
+import threading
+import time
+from datetime import timedelta
+from http.cookiejar import DefaultCookiePolicy
+from typing import Any, Dict, Optional, Tuple, cast
+
+import requests
+from requests.adapters import HTTPAdapter, Retry
+from requests.exceptions import RetryError, Timeout
+from requests.models import PreparedRequest, Response
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from rekono.client.cache import get_cache_directory
+from rekono.client.exceptions import DeadlineError
+from rekono.client.retry import RekonoRetry
+
+socket_env = 'REKONO_AGENT_SOCKET'                                              # Environment variable to set socket
+header_format = '!II'                                                           # Sizes of message header and body
+
+
+def get_socket_path() -> str:
+    '''Get path of the Unix domain socket where the agent listens.
+
+    Returns:
+        str: Socket path. It's taken from REKONO_AGENT_SOCKET or the user cache directory.
+    '''
+    return os.getenv(socket_env) or os.path.join(get_cache_directory(), 'agent.sock')
+
+
+def is_supported() -> bool:
+    '''Check if the agent can be used in this platform.
+
+    Returns:
+        bool: Indicates if Unix domain sockets are available.
+    '''
+    return hasattr(socket, 'AF_UNIX')
+
+
+def _send_message(connection: socket.socket, header: Dict[str, Any], body: bytes = b'') -> None:
+    '''Send message through agent connection.
+
+    Args:
+        connection (socket.socket): Agent connection.
+        header (Dict[str, Any]): Message metadata.
+        body (bytes, optional): Message body. Defaults to b''.
+    '''
+    encoded_header = json.dumps(header).encode()
+    connection.sendall(struct.pack(header_format, len(encoded_header), len(body)) + encoded_header + body)
+
+
+def _receive_exactly(connection: socket.socket, size: int) -> bytes:
+    '''Receive exact number of bytes from agent connection.
+
+    Args:
+        connection (socket.socket): Agent connection.
+        size (int): Number of bytes to receive.
+
+    Raises:
+        ConnectionError: Connection closed before receiving all bytes.
+
+    Returns:
+        bytes: Received bytes.
+    '''
+    chunks = []
+    while size > 0:
+        chunk = connection.recv(min(size, 1024 * 1024))
+        if not chunk:
+            raise ConnectionError('Agent connection closed')
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+
+def _receive_message(connection: socket.socket) -> Tuple[Dict[str, Any], bytes]:
+    '''Receive message from agent connection.
+
+    Args:
+        connection (socket.socket): Agent connection.
+
+    Returns:
+        Tuple[Dict[str, Any], bytes]: Message metadata and body.
+    '''
+    header_size, body_size = struct.unpack(header_format, _receive_exactly(connection, struct.calcsize(header_format)))
+    header = json.loads(_receive_exactly(connection, header_size))
+    return header, _receive_exactly(connection, body_size)
+
+
+def send_command(command: str, path: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    '''Send control command to the agent.
+
+    Args:
+        command (str): Command to send: "status" or "stop".
+        path (Optional[str], optional): Agent socket path. Defaults to the configured one.
+
+    Returns:
+        Optional[Dict[str, Any]]: Agent response, or None if the agent isn't running.
+    '''
+    path = path or get_socket_path()
+    if not is_supported() or not os.path.exists(path):
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+            connection.settimeout(5)
+            connection.connect(path)
+            _send_message(connection, {'command': command})
+            return _receive_message(connection)[0]
+    except (OSError, ValueError, struct.error):
+        return None
+
+
+def is_running(path: Optional[str] = None) -> bool:
+    '''Check if the agent is running.
+
+    Args:
+        path (Optional[str], optional): Agent socket path. Defaults to the configured one.
+
+    Returns:
+        bool: Indicates if the agent answers.
+    '''
+    return send_command('status', path) is not None
+
+
+class AgentAdapter(HTTPAdapter):
+    '''HTTP adapter that forwards requests to the agent, which sends them using its open connections to Rekono.
+
+    The agent performs the retries, using the retry policy and the remaining deadline of this adapter. Requests whose
+    body is a file-like object, like streamed uploads, are sent directly to Rekono, so that their bodies are read in
+    chunks instead of being loaded in memory to be forwarded.
+    '''
+
+    errors = {                                                                  # Errors reported by the agent
+        'timeout': Timeout,
+        'retry': RetryError,
+        'connection': requests.exceptions.ConnectionError
+    }
+
+    def __init__(self, path: str, **kwargs: Any) -> None:
+        '''Agent adapter constructor.
+
+        Args:
+            path (str): Agent socket path.
+        '''
+        super().__init__(**kwargs)
+        self.path = path
+        self.direct = HTTPAdapter(**kwargs)                                     # Adapter for streamed bodies
+
+    def _get_retry_policy(self) -> Dict[str, Any]:
+        '''Get retry policy to be applied by the agent.
+
+        Returns:
+            Dict[str, Any]: Retry policy.
+        '''
+        retries = self.max_retries
+        deadline = getattr(retries, 'deadline', None)
+        return {
+            'total': retries.total,
+            'backoff_factor': retries.backoff_factor,
+            'status_forcelist': list(retries.status_forcelist or []),
+            'jitter': getattr(retries, 'jitter', 0),
+            'deadline': deadline - time.monotonic() if deadline is not None else None   # Remaining seconds
+        }
+
+    def _get_agent_timeout(self, timeout: Any) -> Optional[float]:
+        '''Get maximum time to wait for the agent, that sends the request and performs its retries.
+
+        Args:
+            timeout (Any): Connect and read timeouts of each attempt.
+
+        Returns:
+            Optional[float]: Seconds for all attempts and waits between them, capped by the remaining deadline, or None
+                if there isn't any timeout nor deadline.
+        '''
+        retries = self.max_retries
+        attempts = int(retries.total or 0) + 1
+        timeouts = timeout if isinstance(timeout, tuple) else (timeout,)
+        limit = None
+        if None not in timeouts:
+            jitter = getattr(retries, 'jitter', 0)
+            waits = sum(retries.backoff_factor * 2 ** attempt + jitter for attempt in range(attempts - 1))
+            limit = sum(timeouts) * attempts + waits                            # Worst case of all attempts
+        deadline = getattr(retries, 'deadline', None)
+        if deadline is not None:
+            remaining = max(deadline - time.monotonic(), 0.001)
+            limit = remaining if limit is None else min(limit, remaining)
+        return limit
+
+    def send(
+        self,
+        request: PreparedRequest,
+        stream: bool = False,
+        timeout: Any = None,
+        verify: Any = True,
+        cert: Any = None,
+        proxies: Any = None
+    ) -> Response:
+        '''Send request through the agent.
+
+        Args:
+            request (PreparedRequest): Prepared HTTP request.
+            stream (bool, optional): Ignored, the whole response is received. Defaults to False.
+            timeout (Any, optional): Connect and read timeouts. Defaults to None.
+            verify (Any, optional): TLS verification or CA bundle path. Defaults to True.
+            cert (Any, optional): Ignored, client certificates aren't supported. Defaults to None.
+            proxies (Any, optional): Ignored, proxies aren't supported. Defaults to None.
+
+        Raises:
+            ConnectionError: Agent isn't available or Rekono can't be reached.
+            Timeout: Rekono or the agent didn't respond in time.
+            RetryError: Rekono responses failed after all retries.
+            DeadlineError: Deadline has been exceeded.
+
+        Returns:
+            Response: HTTP response.
+        '''
+        if hasattr(request.body, 'read'):                                       # Streamed body, like file uploads
+            return self.direct.send(request, stream, timeout, verify, cert, proxies)
+        body = request.body
+        header = {
+            'method': request.method,
+            'url': request.url,
+            'headers': dict(request.headers),
+            'timeout': list(timeout) if isinstance(timeout, tuple) else timeout,
+            'verify': verify,
+            'retries': self._get_retry_policy()
+        }
+        wait = self._get_agent_timeout(timeout)
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+                connection.settimeout(wait)                                     # Agent could hang
+                connection.connect(self.path)
+                _send_message(connection, header, body.encode() if isinstance(body, str) else (body or b''))
+                response_header, content = _receive_message(connection)
+        except socket.timeout:
+            deadline = getattr(self.max_retries, 'deadline', None)
+            if deadline is not None and time.monotonic() >= deadline:
+                raise DeadlineError()
+            raise Timeout(f'Agent didn\'t respond in {wait:.1f} seconds', request=request)
+        except (OSError, ValueError, struct.error) as error:
+            raise requests.exceptions.ConnectionError(f'Agent isn\'t available: {error}', request=request)
+        if response_header.get('error') == 'deadline':
+            raise DeadlineError()
+        elif response_header.get('error'):
+            raise self.errors.get(response_header['error'], requests.exceptions.ConnectionError)(
+                response_header.get('message'), request=request
+            )
+        response = Response()
+        response.request = request
+        response.url = response_header['url']
+        response.status_code = response_header['status_code']
+        response.reason = response_header['reason']
+        response.headers = CaseInsensitiveDict(response_header['headers'])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.elapsed = timedelta(seconds=response_header['elapsed'])
+        response._content = content
+        return response
+
+    def close(self) -> None:
+        '''Close connections opened to send streamed bodies.'''
+        super().close()
+        self.direct.close()
+
+
+class _ForwardingAdapter(HTTPAdapter):
+    '''HTTP adapter used by the agent, whose retry policy is set for each forwarded request.'''
+
+    local = threading.local()                                                   # Retry policy of each agent thread
+
+    @property                                                                   # type: ignore
+    def max_retries(self) -> Retry:
+        '''Get retry policy of the request that is being forwarded by the current thread.
+
+        Returns:
+            Retry: Retry policy.
+        '''
+        return getattr(self.local, 'retries', Retry(0, read=False))
+
+    @max_retries.setter
+    def max_retries(self, retries: Retry) -> None:
+        '''Set retry policy of the request that is being forwarded by the current thread.
+
+        Args:
+            retries (Retry): Retry policy.
+        '''
+        self.local.retries = retries
+
+
+class _AgentHandler(socketserver.BaseRequestHandler):
+    '''Handler of the connections from Rekono CLI processes to the agent.'''
+
+    def handle(self) -> None:
+        '''Handle one message from a Rekono CLI process.'''
+        server = cast(AgentServer, self.server)
+        server.last_activity = time.monotonic()
+        try:
+            header, body = _receive_message(self.request)
+        except (OSError, ValueError, struct.error):
+            return
+        if header.get('command') in ['status', 'stop']:                         # Control command
+            _send_message(self.request, {'pid': os.getpid(), 'urls': sorted(server.urls)})
+            if header['command'] == 'stop':
+                threading.Thread(target=server.shutdown).start()                # Can't stop from handler thread
+            return
+        _send_message(self.request, *server.forward(header, body))
+        server.last_activity = time.monotonic()
+
+
+class AgentServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    '''Agent that sends HTTP requests to Rekono on behalf of Rekono CLI processes, reusing its open connections.
+
+    It listens on a Unix domain socket only accessible by the current user, and it stops after some time without
+    receiving requests. Cookies aren't saved, because the same session forwards requests of different processes,
+    URLs and tokens.
+    '''
+
+    daemon_threads = True                                                       # Don't wait for handlers to stop
+
+    def __init__(self, path: str, pool_maxsize: int = 10, idle_timeout: float = 3600) -> None:
+        '''Agent constructor.
+
+        Args:
+            path (str): Socket path.
+            pool_maxsize (int, optional): Maximum number of connections to keep with each host. Defaults to 10.
+            idle_timeout (float, optional): Seconds without requests before stopping. Defaults to 3600.
+        '''
+        self.path = path
+        self.idle_timeout = idle_timeout
+        self.last_activity = time.monotonic()
+        self.urls: set = set()                                                  # Rekono instances already requested
+        self.session = requests.Session()
+        self.session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))   # Not shared between callers
+        adapter = _ForwardingAdapter(pool_maxsize=pool_maxsize)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+        if os.path.exists(path):                                                # Socket from an agent that has died
+            os.remove(path)
+        previous_umask = os.umask(0o177)                                        # Socket only accessible by user
+        try:
+            super().__init__(path, _AgentHandler)
+        finally:
+            os.umask(previous_umask)
+
+    def forward(self, header: Dict[str, Any], body: bytes) -> Tuple[Dict[str, Any], bytes]:
+        '''Send HTTP request to Rekono.
+
+        Args:
+            header (Dict[str, Any]): Request metadata.
+            body (bytes): Request body.
+
+        Returns:
+            Tuple[Dict[str, Any], bytes]: Response metadata and body.
+        '''
+        request = PreparedRequest()
+        request.method = header['method']
+        request.url = header['url']
+        request.headers = CaseInsensitiveDict(header['headers'])
+        request.body = body or None
+        policy = header.get('retries') or {}
+        deadline = policy.pop('deadline', None)
+        cast(_ForwardingAdapter, self.session.get_adapter(request.url)).max_retries = RekonoRetry(
+            **policy, deadline=time.monotonic() + deadline if deadline is not None else None
+        )
+        timeout = tuple(header['timeout']) if isinstance(header.get('timeout'), list) else header.get('timeout')
+        self.urls.add(request.url.split('/api/')[0])
+        try:
+            response = self.session.send(
+                request, timeout=timeout, verify=header.get('verify', True), allow_redirects=False  # Client redirects
+            )
+        except DeadlineError:
+            return {'error': 'deadline'}, b''
+        except Timeout as error:
+            return {'error': 'timeout', 'message': str(error)}, b''
+        except RetryError as error:
+            return {'error': 'retry', 'message': str(error)}, b''
+        except requests.exceptions.RequestException as error:
+            return {'error': 'connection', 'message': str(error)}, b''
+        return {
+            'url': response.url,
+            'status_code': response.status_code,
+            'reason': response.reason,
+            'headers': dict(response.headers),
+            'elapsed': response.elapsed.total_seconds()
+        }, response.content
+
+    def _stop_when_idle(self) -> None:
+        '''Stop agent when no requests are received for the idle timeout.'''
+        while time.monotonic() - self.last_activity < self.idle_timeout:
+            time.sleep(min(self.idle_timeout, 10))
+        self.shutdown()
+
+    def run(self) -> None:
+        '''Run agent until it's stopped or idle.'''
+        threading.Thread(target=self._stop_when_idle, daemon=True).start()
+        try:
+            self.serve_forever()
+        finally:
+            self.server_close()
+            self.session.close()
+            if os.path.exists(self.path):
+                os.remove(self.path)
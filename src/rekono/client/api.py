@@ -1,34 +1,86 @@
 '''Rekono API.'''
 
-import json
+import math
 import os
-from typing import Any, Callable, Dict, List, Optional, Union
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import (Any, Callable, Deque, Dict, Iterable, Iterator, List,
+                    Optional, Union)
 
 import requests
-from requests.adapters import HTTPAdapter, Retry
+from requests.adapters import HTTPAdapter
 from requests.exceptions import RetryError, Timeout
 from requests.models import Response
+from urllib3.exceptions import UnrewindableBodyError
+from urllib3.util import make_headers
 
-from rekono.client.exceptions import AuthenticationError, AuthorizationError
+from rekono.client.agent import AgentAdapter
+from rekono.client.cache import HttpCache
+from rekono.client.codec import codec
+from rekono.client.exceptions import (AuthenticationError, AuthorizationError,
+                                      RequestError)
+from rekono.client.metrics import TransferMetrics
+from rekono.client.multipart import MultipartEncoder
+from rekono.client.pagination import PageSize, plan_page, split_id_range
+from rekono.client.retry import (RekonoRetry, check_deadline,
+                                 get_remaining_time)
+from rekono.client.stream import iter_response_data
 
 
 class Rekono:
     '''Rekono API.'''
 
+    page_size = 100                                                             # Default page size (max is 1000)
+    status_forcelist = [429, 500, 502, 503, 504]                                # Status codes to retry
+
     def __init__(
         self,
         url: str,
         token: str,
         headers: Optional[Dict[str, str]] = None,
-        verify: bool = True
+        verify: bool = True,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        cache: Optional[HttpCache] = None,
+        connect_timeout: float = 10,
+        read_timeout: float = 60,
+        deadline: Optional[float] = None,
+        retries: int = 5,
+        backoff_factor: float = 0.1,
+        backoff_jitter: float = 0.1,
+        agent: Optional[str] = None,
+        compression: bool = True
     ) -> None:
         '''Rekono API client constructor.
 
+        The client can be shared between threads: request headers are built for each request and the HTTP connections
+        are reused from a pool whose size can be adapted to the number of threads.
+
+        Failed requests are retried with exponential backoff, honoring Retry-After header. If a deadline is set, all
+        requests and retries made by the client must finish before it.
+
+        Compressed responses are requested with all the encodings that can be decoded while the body is received, and
+        the bytes received before and after their decompression are counted in the client metrics.
+
         Args:
             url (str): Base Rekono URL.
             token (str): API token for Rekono authentication. Defaults to None.
             headers (Optional[Dict[str, str]], optional): Extra HTTP request headers. Defaults to None.
             verify (bool, optional): Indicates if TLS verification should be performed or not. Defaults to True.
+            pool_connections (int, optional): Number of connection pools to cache. Defaults to 10.
+            pool_maxsize (int, optional): Maximum number of connections to keep in each pool. Defaults to 10.
+            cache (Optional[HttpCache], optional): Cache to make conditional GET requests. Defaults to None.
+            connect_timeout (float, optional): Seconds to wait for the connection. Defaults to 10.
+            read_timeout (float, optional): Seconds to wait for data from the server. Defaults to 60.
+            deadline (Optional[float], optional): Seconds for all requests made by the client. Defaults to None.
+            retries (int, optional): Maximum number of retries of each request. Defaults to 5.
+            backoff_factor (float, optional): Backoff factor between retries. Defaults to 0.1.
+            backoff_jitter (float, optional): Maximum random seconds added to each backoff. Defaults to 0.1.
+            agent (Optional[str], optional): Socket of the agent to send requests through it. Defaults to None.
+            compression (bool, optional): Request compressed response bodies. Defaults to True.
 
         Raises:
             AuthenticationError: Authentication error during basic authentication attempt.
@@ -37,12 +89,43 @@ class Rekono:
         self.token = token
         self.headers = headers or {}
         self.headers.update({'Authorization': f'Token {self.token}'})           # Configure HTTP request headers
+        if not any(header.lower() == 'accept-encoding' for header in self.headers):   # Negotiate compression
+            self.headers['Accept-Encoding'] = (
+                make_headers(accept_encoding=True)['accept-encoding'] if compression else 'identity'
+            )
+        self.metrics = TransferMetrics()                                        # Bytes received from Rekono
         self.verify = verify
+        self.cache = cache
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
         self.session = requests.Session()                                       # Configure retries of HTTP requests
-        retries = Retry(total=5, backoff_factor=0.1, status_forcelist=[429, 500, 502, 503, 504])
-        self.session.mount(self.url, HTTPAdapter(max_retries=retries))
+        self.retries = RekonoRetry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=self.status_forcelist,
+            jitter=backoff_jitter
+        )
+        self.set_deadline(deadline)
+        if agent:                                                               # Agent keeps the connections open
+            self.session.mount(self.url, AgentAdapter(agent, max_retries=self.retries))
+        else:
+            self.session.mount(self.url, HTTPAdapter(
+                pool_connections=pool_connections,
+                pool_maxsize=pool_maxsize,
+                max_retries=self.retries
+            ))
+
+    def set_deadline(self, deadline: Optional[float]) -> None:
+        '''Set deadline for the next requests made by the client, including retries.
 
-    def _get_endpoint(self, endpoint: str) -> str:
+        Args:
+            deadline (Optional[float]): Seconds from now, or None to remove the deadline.
+        '''
+        self.deadline = time.monotonic() + deadline if deadline is not None else None   # Monotonic time limit
+        self.retries.deadline = self.deadline
+
+    @staticmethod
+    def _get_endpoint(endpoint: str) -> str:
         '''Get valid Rekono endpoint from the provided value.
 
         Args:
@@ -64,8 +147,9 @@ class Rekono:
         method: Callable,
         endpoint: str,
         parameters: Optional[Dict[str, Any]] = None,
-        body: Optional[str] = None,
-        files: Optional[Dict[str, Any]] = None
+        body: Optional[Union[str, MultipartEncoder]] = None,
+        extra_headers: Optional[Dict[str, str]] = None,
+        stream: bool = False
     ) -> Response:
         '''Perform HTTP request to Rekono API.
 
@@ -73,38 +157,473 @@ class Rekono:
             method (Callable): HTTP method to use.
             endpoint (str): Endpoint to call.
             parameters (Optional[Dict[str, Any]], optional): Query parameters to send. Defaults to None.
-            body (Optional[str], optional): Body to send. Defaults to None.
-            files (Optional[Dict[str, Any]], optional): Files to send. Defaults to None.
+            body (Optional[Union[str, MultipartEncoder]], optional): JSON body or multipart form to send. Defaults to
+                None.
+            extra_headers (Optional[Dict[str, str]], optional): Headers only for this request. Defaults to None.
+            stream (bool, optional): Receive body when it's consumed instead of with the response. Defaults to False.
 
         Raises:
             AuthenticationError: Unauthenticated, API token is invalid
             AuthorizationError: Unauthorized, user hasn't required permissions.
+            RequestError: No response after all retries.
+            DeadlineError: Deadline has been exceeded.
 
         Returns:
             Response: HTTP response.
         '''
-        if files:
-            self.headers.pop('Content-Type', None)                              # If files provided, remove Content-Type
+        headers = {**self.headers, **(extra_headers or {})}                     # Headers of this request
+        if isinstance(body, MultipartEncoder):                                  # File upload
+            headers['Content-Type'] = body.content_type
         else:
-            self.headers['Content-Type'] = 'application/json'                   # If not, set application/json
+            headers['Content-Type'] = 'application/json'                        # If files not provided, set JSON
         url = self.url + self._get_endpoint(endpoint)                           # Prepare URL to call
-        try:
-            # First attempt
-            response = method(url, params=parameters, data=body, files=files, headers=self.headers, verify=self.verify)
-        except (ConnectionError, RetryError, Timeout):                          # Unexpected error during HTTP request
-            # Second attempt
-            response = method(url, params=parameters, data=body, files=files, headers=self.headers, verify=self.verify)
+        check_deadline(self.deadline)
+        timeout = (
+            get_remaining_time(self.deadline, self.connect_timeout),
+            get_remaining_time(self.deadline, self.read_timeout)
+        )
+        try:                                                                    # Retries are made by the HTTP adapter
+            response = method(
+                url, params=parameters, data=body, headers=headers, verify=self.verify, timeout=timeout, stream=stream
+            )
+        except (requests.exceptions.ConnectionError, RetryError, Timeout) as error:    # No response after retries
+            check_deadline(self.deadline)                                       # Report exceeded deadline
+            raise RequestError(error) from error
+        except UnrewindableBodyError as error:                                  # Partially sent upload isn't retried
+            raise RequestError(error.__cause__ if isinstance(error.__cause__, OSError) else error) from error
+        if stream:                                                              # Body is received when it's consumed
+            self.metrics.track(response)
+        else:
+            self.metrics.record(response)
         if response.status_code == 401:                                         # Unauthenticated
             raise AuthenticationError(response)
         elif response.status_code == 403:                                       # Access Denied
             raise AuthorizationError(response)
         return response
 
+    def _get(self, endpoint: str, parameters: Dict[str, Any], stream: bool = False) -> Response:
+        '''GET request to Rekono API, using the cached response if the server confirms it's not modified.
+
+        Args:
+            endpoint (str): Endpoint to call.
+            parameters (Dict[str, Any]): Query parameters to send.
+            stream (bool, optional): Receive body when it's consumed, without cache. Defaults to False.
+
+        Returns:
+            Response: HTTP response.
+        '''
+        if self.cache is None or stream:                                        # Streamed bodies aren't cached
+            return self._request(self.session.get, endpoint, parameters=parameters, stream=stream)
+        key = self.cache.get_key(self.url + self._get_endpoint(endpoint), parameters, self.headers)
+        entry = self.cache.load(key)
+        response = self._request(
+            self.session.get, endpoint, parameters=parameters,
+            extra_headers=self.cache.get_conditional_headers(entry[0]) if entry else None
+        )
+        if response.status_code == 304 and entry:                               # Cached response is still valid
+            return self.cache.build_response(key, entry[0], entry[1], response)
+        self.cache.save(key, response)
+        return response
+
+    def _get_page(
+        self,
+        endpoint: str,
+        parameters: Dict[str, Any],
+        page: int,
+        size: int,
+        stream: bool = False
+    ) -> Response:
+        '''GET request to retrieve one page from Rekono API.
+
+        Args:
+            endpoint (str): Endpoint to call.
+            parameters (Dict[str, Any]): Query parameters to send.
+            page (int): Page number to retrieve.
+            size (int): Page size.
+            stream (bool, optional): Receive body when it's consumed. Defaults to False.
+
+        Returns:
+            Response: HTTP response.
+        '''
+        parameters = {**parameters, 'page': page, 'size': size}                 # Set pagination parameters
+        return self._get(endpoint, parameters, stream)
+
+    @staticmethod
+    def _get_count(response: Response) -> Optional[int]:
+        '''Get total number of items from paginated response.
+
+        Args:
+            response (Response): Paginated HTTP response.
+
+        Returns:
+            Optional[int]: Total number of items or None if the endpoint doesn't support pagination.
+        '''
+        body = codec.loads(response.content)
+        if not body or not isinstance(body, dict) or 'count' not in body:       # Endpoint without pagination
+            return None
+        return body.get('count', 0)
+
+    def _get_pages_concurrently(
+        self,
+        endpoint: str,
+        parameters: Dict[str, Any],
+        pages: Iterable[int],
+        size: int,
+        concurrency: int
+    ) -> Iterator[Response]:
+        '''GET requests to retrieve multiple pages at the same time from Rekono API.
+
+        Args:
+            endpoint (str): Endpoint to call.
+            parameters (Dict[str, Any]): Query parameters to send.
+            pages (Iterable[int]): Page numbers to retrieve.
+            size (int): Page size.
+            concurrency (int): Number of pages to retrieve at the same time.
+
+        Yields:
+            Iterator[Response]: HTTP responses in page order.
+        '''
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            pending: Deque[Future] = deque()                                    # Requested pages in page order
+            for page in pages:
+                pending.append(executor.submit(self._get_page, endpoint, parameters, page, size))
+                if len(pending) >= concurrency:                                 # Limit pages requested in advance
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def _get_pages_sequentially(
+        self,
+        endpoint: str,
+        parameters: Dict[str, Any],
+        position: int,
+        count: int,
+        page_size: PageSize,
+        stream: bool = False
+    ) -> Iterator[Response]:
+        '''GET requests to retrieve pages one after another from Rekono API, adapting the page size if enabled.
+
+        Args:
+            endpoint (str): Endpoint to call.
+            parameters (Dict[str, Any]): Query parameters to send.
+            position (int): Number of items already retrieved.
+            count (int): Total number of items.
+            page_size (PageSize): Page size to use.
+            stream (bool, optional): Receive bodies when they are consumed. Defaults to False.
+
+        Yields:
+            Iterator[Response]: HTTP responses in page order.
+        '''
+        while position < count:
+            size = page_size.size
+            response = self._get_page(endpoint, parameters, position // size + 1, size, stream)
+            position += size
+            page_size.update(response, position)                                # Adapt size for next page
+            yield response
+
+    @staticmethod
+    def _slice_page(response: Response, start: int, end: int) -> Response:
+        '''Remove the items of a paginated response that are out of a range.
+
+        Args:
+            response (Response): Paginated HTTP response.
+            start (int): Index of the first item to keep.
+            end (int): Index after the last item to keep.
+
+        Returns:
+            Response: HTTP response with the items in the range.
+        '''
+        body = codec.loads(response.content)
+        results = body.get('results') if isinstance(body, dict) else None
+        if results is None or (start == 0 and end >= len(results)):             # Nothing to remove
+            return response
+        response._content = codec.dumps({**body, 'results': results[start:end]}).encode()
+        return response
+
+    def _get_page_range(
+        self,
+        endpoint: str,
+        parameters: Dict[str, Any],
+        offset: int,
+        limit: Optional[int],
+        size: int,
+        stream: bool = False
+    ) -> Iterator[Response]:
+        '''GET requests to retrieve only a range of items, stopping when all of them have been retrieved.
+
+        Only the pages whose items are all in the range are streamed, because the rest of them have to be sliced.
+
+        Pages after the last item, that Rekono rejects as invalid pages, end the iteration. Other failed requests are
+        returned, so that the range isn't truncated silently.
+
+        Args:
+            endpoint (str): Endpoint to call.
+            parameters (Dict[str, Any]): Query parameters to send.
+            offset (int): Number of items to skip.
+            limit (Optional[int]): Maximum number of items to retrieve, or None to retrieve all after the offset.
+            size (int): Maximum page size.
+            stream (bool, optional): Receive bodies of whole pages when they are consumed. Defaults to False.
+
+        Yields:
+            Iterator[Response]: HTTP responses in page order, only with the items in the range.
+        '''
+        position = offset
+        end = offset + limit if limit is not None else math.inf
+        count: Optional[int] = None                                             # Count is unknown until first page
+        while position < end:
+            page = plan_page(position, end - position, size)
+            whole = stream and page.start == 0 and page.end == page.size        # Page doesn't need to be sliced
+            response = self._get_page(endpoint, parameters, page.page, page.size, whole)
+            if response.status_code != 200:                                     # Invalid page or failed request
+                if count is None and response.status_code == 404 and page.page > 1:
+                    count = self.count(endpoint, parameters)                    # Offset may be past the last item
+                if count is None or (response.status_code != 404 and page.page <= math.ceil(count / page.size)):
+                    yield response                                              # Error isn't caused by the range
+                return
+            if whole:
+                yield response                                                  # Count is known once it's consumed
+            last_count, count = count, self._get_count(response)
+            if count is None:                                                   # Endpoint without pagination
+                if last_count is None and not whole:
+                    yield response
+                return
+            end = min(end, count)
+            if not whole:
+                yield self._slice_page(response, page.start, page.end)
+            position += page.end - page.start
+
+    def iter_pages(
+        self,
+        endpoint: str,
+        parameters: Optional[Dict[str, Any]] = None,
+        concurrency: int = 1,
+        page_size: Union[int, PageSize, None] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        stream: bool = False
+    ) -> Iterator[Response]:
+        '''GET requests to iterate over all API pages, retrieving them as they are consumed.
+
+        Adaptive page size is only applied when pages are retrieved one after another. If a limit or an offset is set,
+        pages are retrieved one after another and sized to fetch only the items in that range.
+
+        If stream is enabled, bodies of the pages retrieved one after another are received while they are consumed,
+        so that they can be decoded item by item with iter_response_data. Page size is fixed in that case.
+
+        Args:
+            endpoint (str): Endpoint to call.
+            parameters (Optional[Dict[str, Any]], optional): Query parameters to send. Defaults to {}.
+            concurrency (int, optional): Number of pages to retrieve at the same time. Defaults to 1.
+            page_size (Union[int, PageSize, None], optional): Page size, fixed or adaptive. Defaults to 100.
+            limit (Optional[int], optional): Maximum number of items to retrieve. Defaults to None.
+            offset (int, optional): Number of items to skip. Defaults to 0.
+            stream (bool, optional): Receive bodies when they are consumed. Defaults to False.
+
+        Raises:
+            AuthenticationError: Unauthenticated, API token is invalid
+            AuthorizationError: Unauthorizated, user doesn't have required permissions.
+
+        Yields:
+            Iterator[Response]: HTTP responses in page order.
+        '''
+        parameters = parameters or {}
+        page_size = page_size if isinstance(page_size, PageSize) else PageSize(page_size or self.page_size)
+        if stream:                                                              # Size isn't adapted to streamed pages
+            page_size = PageSize(page_size.size)
+        size = page_size.size
+        if limit is not None or offset:                                         # Only a range of items is needed
+            yield from self._get_page_range(endpoint, parameters, offset, limit, size, stream)
+            return
+        response = self._get_page(endpoint, parameters, 1, size, stream)        # First page includes total count
+        yield response
+        count = self._get_count(response)                                       # Once the body has been consumed
+        page_size.update(response, size)
+        del response                                                            # Release first page
+        if count is None:
+            return
+        if concurrency > 1:                                                     # Fixed page size for all pages
+            pages = range(2, math.ceil(count / size) + 1)                       # Remaining page numbers
+            yield from self._get_pages_concurrently(endpoint, parameters, pages, size, concurrency)
+        else:
+            yield from self._get_pages_sequentially(endpoint, parameters, size, count, page_size, stream)
+
+    def iter_items(
+        self,
+        endpoint: str,
+        parameters: Optional[Dict[str, Any]] = None,
+        concurrency: int = 1,
+        page_size: Union[int, PageSize, None] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        stream: bool = False
+    ) -> Iterator[Dict[str, Any]]:
+        '''GET requests to iterate over the items of all API pages, decoding one page at a time.
+
+        If stream is enabled, items are decoded one by one while the pages are received, so that memory usage doesn't
+        depend on the page size.
+
+        Args:
+            endpoint (str): Endpoint to call.
+            parameters (Optional[Dict[str, Any]], optional): Query parameters to send. Defaults to {}.
+            concurrency (int, optional): Number of pages to retrieve at the same time. Defaults to 1.
+            page_size (Union[int, PageSize, None], optional): Page size, fixed or adaptive. Defaults to 100.
+            limit (Optional[int], optional): Maximum number of items to retrieve. Defaults to None.
+            offset (int, optional): Number of items to skip. Defaults to 0.
+            stream (bool, optional): Decode items while pages are received. Defaults to False.
+
+        Raises:
+            AuthenticationError: Unauthenticated, API token is invalid
+            AuthorizationError: Unauthorizated, user doesn't have required permissions.
+
+        Yields:
+            Iterator[Dict[str, Any]]: Items returned by Rekono API.
+        '''
+        for response in self.iter_pages(endpoint, parameters, concurrency, page_size, limit, offset, stream):
+            for data in iter_response_data(response):                           # Results or the whole body
+                yield from (data if isinstance(data, list) else [data])
+
+    def get_id_shards(
+        self,
+        endpoint: str,
+        parameters: Optional[Dict[str, Any]] = None,
+        shards: int = 4
+    ) -> List[Dict[str, Any]]:
+        '''Split a listing into ranges of entity IDs, so that each range can be paginated with shallow offsets.
+
+        Lowest and highest IDs are retrieved with requests of one item. If Rekono ignores the ID filters, the listing
+        isn't split, so that entities aren't retrieved more than once.
+
+        Args:
+            endpoint (str): Endpoint to call.
+            parameters (Optional[Dict[str, Any]], optional): Query parameters to send. Defaults to {}.
+            shards (int, optional): Maximum number of shards. Defaults to 4.
+
+        Raises:
+            AuthenticationError: Unauthenticated, API token is invalid
+            AuthorizationError: Unauthorizated, user doesn't have required permissions.
+
+        Returns:
+            List[Dict[str, Any]]: Query parameters of each shard. Only one empty shard if the listing can't be split.
+        '''
+        parameters = {k: v for k, v in (parameters or {}).items() if k not in ['o', 'ordering']}
+        bounds = []
+        for ordering in ['id', '-id']:                                          # Lowest and highest IDs
+            body = codec.loads(self._get_page(endpoint, {**parameters, 'o': ordering}, 1, 1).content)
+            results = body.get('results') if isinstance(body, dict) else None
+            if not results or not isinstance(results[0], dict) or 'id' not in results[0]:   # Empty or without IDs
+                return [{}]
+            bounds.append(int(results[0]['id']))
+        id_shards: List[Dict[str, Any]] = list(split_id_range(bounds[0], bounds[1], shards))
+        if len(id_shards) < 2 or self.count(endpoint, {**parameters, **id_shards[0]}) == body.get('count'):
+            return [{}]                                                         # Only one ID or unsupported filters
+        return id_shards
+
+    @staticmethod
+    def _put_shard_page(pages: queue.Queue, stop: threading.Event, page: Any) -> bool:
+        '''Pass shard page to the consumer, waiting while the queue is full.
+
+        Args:
+            pages (queue.Queue): Bounded queue of retrieved pages.
+            stop (threading.Event): Event set when the consumer stops.
+            page (Any): HTTP response, error raised while retrieving the shard or None when the shard is finished.
+
+        Returns:
+            bool: Indicates if the page has been passed, or False if the consumer has stopped.
+        '''
+        while not stop.is_set():
+            try:
+                pages.put(page, timeout=0.1)
+                return True
+            except queue.Full:                                                  # Consumer is slower than shards
+                continue
+        return False
+
+    def _get_shard(
+        self,
+        endpoint: str,
+        parameters: Dict[str, Any],
+        size: int,
+        pages: queue.Queue,
+        stop: threading.Event
+    ) -> None:
+        '''GET requests to retrieve all pages of a shard, passing them to the consumer.
+
+        Args:
+            endpoint (str): Endpoint to call.
+            parameters (Dict[str, Any]): Query parameters of the shard.
+            size (int): Page size.
+            pages (queue.Queue): Bounded queue of retrieved pages.
+            stop (threading.Event): Event set when the consumer stops.
+        '''
+        try:
+            if stop.is_set():
+                return
+            for response in self.iter_pages(endpoint, parameters, page_size=size):
+                if not self._put_shard_page(pages, stop, response):
+                    return
+        except Exception as error:                                              # Raised in the consumer thread
+            self._put_shard_page(pages, stop, error)
+        finally:
+            self._put_shard_page(pages, stop, None)                             # Shard is finished
+
+    def iter_shards(
+        self,
+        endpoint: str,
+        shards: List[Dict[str, Any]],
+        parameters: Optional[Dict[str, Any]] = None,
+        concurrency: Optional[int] = None,
+        page_size: Union[int, PageSize, None] = None
+    ) -> Iterator[Response]:
+        '''GET requests to retrieve independent shards of a listing at the same time, merging their pages.
+
+        Each shard is paginated from its first page, so deep offsets that are slow for Rekono are avoided. Pages are
+        yielded as they are retrieved, so items aren't sorted between shards, and the page size is fixed.
+
+        Args:
+            endpoint (str): Endpoint to call.
+            shards (List[Dict[str, Any]]): Query parameters of each shard, like ID ranges or filter values.
+            parameters (Optional[Dict[str, Any]], optional): Query parameters to send. Defaults to {}.
+            concurrency (Optional[int], optional): Number of shards to retrieve at the same time. Defaults to all.
+            page_size (Union[int, PageSize, None], optional): Page size. Defaults to 100.
+
+        Raises:
+            AuthenticationError: Unauthenticated, API token is invalid
+            AuthorizationError: Unauthorizated, user doesn't have required permissions.
+
+        Yields:
+            Iterator[Response]: HTTP responses of all shards.
+        '''
+        parameters = parameters or {}
+        size = page_size.size if isinstance(page_size, PageSize) else page_size or self.page_size
+        workers = min(concurrency or len(shards), len(shards))
+        pages: queue.Queue = queue.Queue(maxsize=workers * 2)                   # Limit pages retrieved in advance
+        stop = threading.Event()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for shard in shards:
+                executor.submit(self._get_shard, endpoint, {**parameters, **shard}, size, pages, stop)
+            try:
+                pending = len(shards)
+                while pending:
+                    page = pages.get()
+                    if page is None:                                            # Shard is finished
+                        pending -= 1
+                    elif isinstance(page, Exception):
+                        raise page
+                    else:
+                        yield page
+            finally:
+                stop.set()                                                      # Release blocked shards
+
     def get(
         self,
         endpoint: str,
         parameters: Optional[Dict[str, Any]] = None,
-        pagination: bool = False
+        pagination: bool = False,
+        concurrency: int = 1,
+        page_size: Union[int, PageSize, None] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        stream: bool = False
     ) -> Union[List[Response], Response]:
         '''GET request to Rekono API.
 
@@ -112,6 +631,11 @@ class Rekono:
             endpoint (str): Endpoint to call.
             parameters (Optional[Dict[str, Any]], optional): Query parameters to send. Defaults to {}.
             pagination (bool, optional): Enables iteration over all API pages. Defaults to False.
+            concurrency (int, optional): Number of pages to retrieve at the same time. Defaults to 1.
+            page_size (Union[int, PageSize, None], optional): Page size, fixed or adaptive. Defaults to 100.
+            limit (Optional[int], optional): Maximum number of items to retrieve, with pagination. Defaults to None.
+            offset (int, optional): Number of items to skip, with pagination. Defaults to 0.
+            stream (bool, optional): Receive body when it's consumed, without pagination. Defaults to False.
 
         Raises:
             AuthenticationError: Unauthenticated, API token is invalid
@@ -120,61 +644,87 @@ class Rekono:
         Returns:
             Union[List[Response], Response]: HTTP responses if pagination is enabled or one HTTP response if not.
         '''
-        parameters = parameters or {}
-        if not pagination:                                                      # Pagination is disabled
-            return self._request(self.session.get, endpoint, parameters=parameters)     # Perform only one GET request
-        page = 1                                                                # Start page number
-        size = 100                                                              # Default page size (max is 1000)
-        count = 101                                                             # Initial fake count value
-        responses = []
-        while page * size < count:
-            parameters.update({'page': page, 'size': size})                     # Set pagination parameters
-            response = self._request(self.session.get, endpoint, parameters=parameters)     # Paginated GET request
-            responses.append(response)                                          # Save HTTP response
-            body = response.json()
-            if body and 'count' in body:
-                count = body.get('count', 0)                                    # Update count value
-                page += 1                                                       # Increase page number
-            else:
-                break
-        return responses
-
-    def post(self, endpoint: str, body: Optional[str] = None, filepath: Optional[str] = None) -> Response:
+        if pagination or limit is not None or offset:                           # Pagination is enabled
+            return list(self.iter_pages(endpoint, parameters, concurrency, page_size, limit, offset))
+        return self._get(endpoint, parameters or {}, stream)                    # Perform only one request
+
+    def count(self, endpoint: str, parameters: Optional[Dict[str, Any]] = None) -> Optional[int]:
+        '''Get number of items from Rekono API, requesting one page with only one item.
+
+        Args:
+            endpoint (str): Endpoint to call.
+            parameters (Optional[Dict[str, Any]], optional): Query parameters to send. Defaults to {}.
+
+        Raises:
+            AuthenticationError: Unauthenticated, API token is invalid
+            AuthorizationError: Unauthorizated, user doesn't have required permissions.
+
+        Returns:
+            Optional[int]: Number of items or None if the endpoint doesn't support pagination.
+        '''
+        return self._get_count(self._get_page(endpoint, parameters or {}, 1, 1))
+
+    def post(
+        self,
+        endpoint: str,
+        body: Optional[str] = None,
+        filepath: Optional[str] = None,
+        progress: Optional[Callable[[int, int], Any]] = None
+    ) -> Response:
         '''POST request to Rekono API.
 
+        Files are sent as multipart forms that are read in chunks while they are uploaded, so memory usage doesn't
+        depend on the file size. Uploads that fail after sending some bytes aren't retried.
+
         Args:
             endpoint (str): Endpoint to call.
             body (Optional[str], optional): Body to send. Defaults to None.
             filepath (Optional[str], optional): File to send. Defaults to None.
+            progress (Optional[Callable[[int, int], Any]], optional): Function called with the number of bytes sent and
+                the total upload size while the file is uploaded. Defaults to None.
 
         Raises:
             AuthenticationError: Unauthenticated, API token is invalid
             AuthorizationError: Unauthorizated, user doesn't have required permissions.
+            RequestError: Upload failed.
 
         Returns:
             Response: HTTP response.
         '''
         if filepath and os.path.isfile(filepath):                               # If filepath is provided
-            with open(filepath, 'rb') as file:                                  # Read file
-                return self._request(                                           # Perform POST request
-                    self.session.post, endpoint, body=json.loads(body) if body else None, files={'file': file}
-                )
+            with MultipartEncoder(filepath, codec.loads(body) if body else None, progress=progress) as form:
+                return self._request(self.session.post, endpoint, body=form)    # Perform POST request
         return self._request(self.session.post, endpoint, body=body)            # Perform POST request without files
 
-    def put(self, endpoint: str, body: Optional[str] = None) -> Response:
+    def put(
+        self,
+        endpoint: str,
+        body: Optional[str] = None,
+        filepath: Optional[str] = None,
+        progress: Optional[Callable[[int, int], Any]] = None
+    ) -> Response:
         '''PUT request to Rekono API.
 
+        Files are sent in the same way as POST requests, so that entities can be updated with new files.
+
         Args:
             endpoint (str): Endpoint to call.
             body (Optional[str], optional): Body to send. Defaults to None.
+            filepath (Optional[str], optional): File to send. Defaults to None.
+            progress (Optional[Callable[[int, int], Any]], optional): Function called with the number of bytes sent and
+                the total upload size while the file is uploaded. Defaults to None.
 
         Raises:
             AuthenticationError: Unauthenticated, API token is invalid
             AuthorizationError: Unauthorizated, user doesn't have required permissions.
+            RequestError: Upload failed.
 
         Returns:
             Response: HTTP response.
         '''
+        if filepath and os.path.isfile(filepath):                               # If filepath is provided
+            with MultipartEncoder(filepath, codec.loads(body) if body else None, progress=progress) as form:
+                return self._request(self.session.put, endpoint, body=form)     # Perform PUT request
         return self._request(self.session.put, endpoint, body=body)             # Perform PUT request
 
     def delete(self, endpoint: str) -> Response:
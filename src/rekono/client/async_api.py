@@ -0,0 +1,556 @@
+'''Rekono asynchronous API.'''
+
+import asyncio
+import importlib.util
+import math
+import os
+import random
+import time
+from collections import deque
+from typing import (Any, AsyncIterator, Deque, Dict, Iterable, Iterator, List,
+                    Mapping, Optional, Union)
+
+from requests.exceptions import RetryError
+from requests.models import Request, Response
+from requests.structures import CaseInsensitiveDict
+
+from rekono.client.api import Rekono
+from rekono.client.cache import HttpCache
+from rekono.client.codec import codec
+from rekono.client.exceptions import (AuthenticationError, AuthorizationError,
+                                      RequestError)
+from rekono.client.metrics import TransferMetrics
+from rekono.client.pagination import PageSize
+from rekono.client.retry import (check_deadline, get_remaining_time,
+                                 parse_retry_after, retry_after_status)
+
+aiohttp: Any = None                                                             # Imported by the first client
+
+
+class AsyncRekono:
+    '''Rekono asynchronous API.
+
+    It offers the same operations than the Rekono API client, but using non-blocking I/O. Responses are returned as
+    requests responses with the body already read, so they can be processed in the same way in both clients.
+    '''
+
+    page_size = Rekono.page_size                                                # Default page size (max is 1000)
+    status_forcelist = Rekono.status_forcelist                                  # Status codes to retry
+    idempotent_methods = ['GET', 'PUT', 'DELETE']                               # HTTP methods that can be retried
+
+    def __init__(
+        self,
+        url: str,
+        token: str,
+        headers: Optional[Dict[str, str]] = None,
+        verify: bool = True,
+        max_connections: int = 10,
+        cache: Optional[HttpCache] = None,
+        connect_timeout: float = 10,
+        read_timeout: float = 60,
+        deadline: Optional[float] = None,
+        retries: int = 5,
+        backoff_factor: float = 0.1,
+        backoff_jitter: float = 0.1,
+        compression: bool = True
+    ) -> None:
+        '''Rekono asynchronous API client constructor.
+
+        Failed requests are retried with exponential backoff, honoring Retry-After header. If a deadline is set, all
+        requests and retries made by the client must finish before it.
+
+        Args:
+            url (str): Base Rekono URL.
+            token (str): API token for Rekono authentication.
+            headers (Optional[Dict[str, str]], optional): Extra HTTP request headers. Defaults to None.
+            verify (bool, optional): Indicates if TLS verification should be performed or not. Defaults to True.
+            max_connections (int, optional): Maximum number of simultaneous connections. Defaults to 10.
+            cache (Optional[HttpCache], optional): Cache to make conditional GET requests. Defaults to None.
+            connect_timeout (float, optional): Seconds to wait for the connection. Defaults to 10.
+            read_timeout (float, optional): Seconds to wait for data from the server. Defaults to 60.
+            deadline (Optional[float], optional): Seconds for all requests made by the client. Defaults to None.
+            retries (int, optional): Maximum number of retries of idempotent requests. Defaults to 5.
+            backoff_factor (float, optional): Backoff factor between retries. Defaults to 0.1.
+            backoff_jitter (float, optional): Maximum random seconds added to each backoff. Defaults to 0.1.
+            compression (bool, optional): Request compressed response bodies. Defaults to True.
+
+        Raises:
+            ImportError: aiohttp isn't installed.
+        '''
+        if not self.is_available():
+            raise ImportError('aiohttp is required by the asynchronous client: pip3 install rekono-cli[async]')
+        global aiohttp
+        aiohttp = importlib.import_module('aiohttp')                            # Slow to import, so only when used
+        self.url = url
+        self.token = token
+        self.headers = headers or {}
+        self.headers.update({'Authorization': f'Token {self.token}'})           # Configure HTTP request headers
+        if not any(header.lower() == 'accept-encoding' for header in self.headers):   # Negotiate compression
+            self.headers['Accept-Encoding'] = 'gzip, deflate' if compression else 'identity'
+        self.metrics = TransferMetrics()                                        # Bytes received from Rekono
+        self.verify = verify
+        self.max_connections = max_connections
+        self.cache = cache
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.deadline = time.monotonic() + deadline if deadline is not None else None   # Monotonic time limit
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.backoff_jitter = backoff_jitter
+        self.session: Optional[Any] = None                                      # Created on the first request
+
+    @staticmethod
+    def is_available() -> bool:
+        '''Check if the asynchronous client can be used.
+
+        Returns:
+            bool: Indicates if aiohttp is installed.
+        '''
+        return importlib.util.find_spec('aiohttp') is not None
+
+    async def __aenter__(self) -> 'AsyncRekono':
+        '''Use client as asynchronous context manager.
+
+        Returns:
+            AsyncRekono: Rekono asynchronous API client.
+        '''
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        '''Close client when the asynchronous context manager finishes.'''
+        await self.close()
+
+    async def close(self) -> None:
+        '''Close HTTP session and its connection pool.'''
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    def _get_session(self) -> Any:
+        '''Get HTTP session, creating it if it doesn't exist yet.
+
+        Returns:
+            Any: aiohttp session with bounded connection pool.
+        '''
+        if self.session is None:
+            connector = aiohttp.TCPConnector(limit=self.max_connections, ssl=self.verify)     # Bounded connection pool
+            self.session = aiohttp.ClientSession(connector=connector)
+        return self.session
+
+    async def _send(self, method: str, url: str, **kwargs: Any) -> Response:
+        '''Send HTTP request and read the whole response.
+
+        Args:
+            method (str): HTTP method to use.
+            url (str): URL to call.
+
+        Returns:
+            Response: HTTP response.
+        '''
+        async with self._get_session().request(method, url, **kwargs) as aiohttp_response:
+            response = Response()                                               # Build requests response
+            response.request = Request(method=method, url=str(aiohttp_response.url)).prepare()
+            response.url = str(aiohttp_response.url)
+            response.status_code = aiohttp_response.status
+            response.headers = CaseInsensitiveDict(aiohttp_response.headers)
+            response._content = await aiohttp_response.read()
+            self.metrics.record(response)
+            return response
+
+    def _get_backoff_time(self, attempt: int, response: Optional[Response] = None) -> float:
+        '''Get seconds to wait before the next attempt, from Retry-After header or backoff with random jitter.
+
+        Args:
+            attempt (int): Number of the failed attempt, starting at 0.
+            response (Optional[Response], optional): Response of the failed attempt, if any. Defaults to None.
+
+        Returns:
+            float: Seconds to wait.
+        '''
+        if response is not None and response.status_code in retry_after_status:   # Honor Retry-After header
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            if retry_after is not None:
+                return retry_after
+        backoff = self.backoff_factor * (2 ** attempt) if attempt > 0 else 0    # Same backoff as requests retries
+        return backoff + random.uniform(0, self.backoff_jitter)
+
+    async def _request(
+        self,
+        method: str,
+        endpoint: str,
+        parameters: Optional[Mapping[str, Any]] = None,
+        body: Optional[str] = None,
+        form: Optional[Any] = None,
+        extra_headers: Optional[Dict[str, str]] = None
+    ) -> Response:
+        '''Perform HTTP request to Rekono API.
+
+        Args:
+            method (str): HTTP method to use.
+            endpoint (str): Endpoint to call.
+            parameters (Optional[Mapping[str, Any]], optional): Query parameters to send. Defaults to None.
+            body (Optional[str], optional): Body to send. Defaults to None.
+            form (Optional[Any], optional): Multipart form to send. Defaults to None.
+            extra_headers (Optional[Dict[str, str]], optional): Headers only for this request. Defaults to None.
+
+        Raises:
+            AuthenticationError: Unauthenticated, API token is invalid
+            AuthorizationError: Unauthorized, user hasn't required permissions.
+            RequestError: No response or only failed responses after all retries.
+            DeadlineError: Deadline has been exceeded.
+
+        Returns:
+            Response: HTTP response.
+        '''
+        headers = {**self.headers, **(extra_headers or {})}                     # Headers of this request
+        if form is None:
+            headers['Content-Type'] = 'application/json'                        # If files aren't sent
+        url = self.url + Rekono._get_endpoint(endpoint)                         # Prepare URL to call
+        params = {key: str(value) for key, value in (parameters or {}).items()}
+        retries = self.retries if method in self.idempotent_methods else 0
+        wait = 0.0
+        for attempt in range(retries + 1):
+            if wait > 0:
+                check_deadline(self.deadline, wait)                             # Fail fast instead of waiting
+                await asyncio.sleep(wait)
+            check_deadline(self.deadline)
+            timeout = aiohttp.ClientTimeout(
+                total=get_remaining_time(self.deadline, self.connect_timeout + self.read_timeout),
+                sock_connect=get_remaining_time(self.deadline, self.connect_timeout),
+                sock_read=get_remaining_time(self.deadline, self.read_timeout)
+            )
+            try:
+                response = await self._send(
+                    method, url, params=params, data=form if form is not None else body, headers=headers,
+                    timeout=timeout
+                )
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as error:  # Unexpected error during request
+                if attempt == retries:
+                    check_deadline(self.deadline)                               # Report exceeded deadline
+                    raise RequestError(error) from error
+                wait = self._get_backoff_time(attempt)
+                continue
+            if response.status_code not in self.status_forcelist or attempt == retries:
+                break
+            wait = self._get_backoff_time(attempt, response)
+        return self._check_response(method, url, response)
+
+    def _check_response(self, method: str, url: str, response: Response) -> Response:
+        '''Check last response of a request, raising the same errors than the synchronous client.
+
+        Args:
+            method (str): HTTP method used.
+            url (str): Requested URL.
+            response (Response): Last HTTP response, after all retries.
+
+        Raises:
+            AuthenticationError: Unauthenticated, API token is invalid
+            AuthorizationError: Unauthorized, user hasn't required permissions.
+            RequestError: Request could be retried, but it failed after all retries.
+
+        Returns:
+            Response: HTTP response.
+        '''
+        if response.status_code == 401:                                         # Unauthenticated
+            raise AuthenticationError(response)
+        elif response.status_code == 403:                                       # Access Denied
+            raise AuthorizationError(response)
+        elif response.status_code in self.status_forcelist and method in self.idempotent_methods:   # Retries exhausted
+            raise RequestError(RetryError(f'Too many {response.status_code} error responses from {url}'))
+        return response
+
+    async def _get(self, endpoint: str, parameters: Mapping[str, Any]) -> Response:
+        '''GET request to Rekono API, using the cached response if the server confirms it's not modified.
+
+        Args:
+            endpoint (str): Endpoint to call.
+            parameters (Mapping[str, Any]): Query parameters to send.
+
+        Returns:
+            Response: HTTP response.
+        '''
+        if self.cache is None:
+            return await self._request('GET', endpoint, parameters=parameters)
+        key = self.cache.get_key(self.url + Rekono._get_endpoint(endpoint), parameters, self.headers)
+        entry = self.cache.load(key)
+        response = await self._request(
+            'GET', endpoint, parameters=parameters,
+            extra_headers=self.cache.get_conditional_headers(entry[0]) if entry else None
+        )
+        if response.status_code == 304 and entry:                               # Cached response is still valid
+            return self.cache.build_response(key, entry[0], entry[1], response)
+        self.cache.save(key, response)
+        return response
+
+    async def _get_page(self, endpoint: str, parameters: Dict[str, Any], page: int, size: int) -> Response:
+        '''GET request to retrieve one page from Rekono API.
+
+        Args:
+            endpoint (str): Endpoint to call.
+            parameters (Dict[str, Any]): Query parameters to send.
+            page (int): Page number to retrieve.
+            size (int): Page size.
+
+        Returns:
+            Response: HTTP response.
+        '''
+        return await self._get(endpoint, {**parameters, 'page': page, 'size': size})
+
+    async def _get_pages_concurrently(
+        self,
+        endpoint: str,
+        parameters: Dict[str, Any],
+        pages: Iterable[int],
+        size: int,
+        concurrency: int
+    ) -> AsyncIterator[Response]:
+        '''GET requests to retrieve multiple pages at the same time from Rekono API.
+
+        Args:
+            endpoint (str): Endpoint to call.
+            parameters (Dict[str, Any]): Query parameters to send.
+            pages (Iterable[int]): Page numbers to retrieve.
+            size (int): Page size.
+            concurrency (int): Number of pages to retrieve at the same time.
+
+        Yields:
+            AsyncIterator[Response]: HTTP responses in page order.
+        '''
+        pending: Deque[asyncio.Future] = deque()                                # Requested pages in page order
+        try:
+            for page in pages:
+                pending.append(asyncio.ensure_future(self._get_page(endpoint, parameters, page, size)))
+                if len(pending) >= concurrency:                                 # Limit pages requested in advance
+                    yield await pending.popleft()
+            while pending:
+                yield await pending.popleft()
+        finally:
+            for task in pending:                                                # Iteration has been stopped
+                task.cancel()
+
+    async def _get_pages_sequentially(
+        self,
+        endpoint: str,
+        parameters: Dict[str, Any],
+        position: int,
+        count: int,
+        page_size: PageSize
+    ) -> AsyncIterator[Response]:
+        '''GET requests to retrieve pages one after another from Rekono API, adapting the page size if enabled.
+
+        Args:
+            endpoint (str): Endpoint to call.
+            parameters (Dict[str, Any]): Query parameters to send.
+            position (int): Number of items already retrieved.
+            count (int): Total number of items.
+            page_size (PageSize): Page size to use.
+
+        Yields:
+            AsyncIterator[Response]: HTTP responses in page order.
+        '''
+        while position < count:
+            size = page_size.size
+            response = await self._get_page(endpoint, parameters, position // size + 1, size)
+            position += size
+            page_size.update(response, position)                                # Adapt size for next page
+            yield response
+
+    async def iter_pages(
+        self,
+        endpoint: str,
+        parameters: Optional[Dict[str, Any]] = None,
+        concurrency: int = 1,
+        page_size: Union[int, PageSize, None] = None
+    ) -> AsyncIterator[Response]:
+        '''GET requests to iterate over all API pages, retrieving them as they are consumed.
+
+        Adaptive page size is only applied when pages are retrieved one after another.
+
+        Args:
+            endpoint (str): Endpoint to call.
+            parameters (Optional[Dict[str, Any]], optional): Query parameters to send. Defaults to {}.
+            concurrency (int, optional): Number of pages to retrieve at the same time. Defaults to 1.
+            page_size (Union[int, PageSize, None], optional): Page size, fixed or adaptive. Defaults to 100.
+
+        Raises:
+            AuthenticationError: Unauthenticated, API token is invalid
+            AuthorizationError: Unauthorizated, user doesn't have required permissions.
+
+        Yields:
+            AsyncIterator[Response]: HTTP responses in page order.
+        '''
+        parameters = parameters or {}
+        page_size = page_size if isinstance(page_size, PageSize) else PageSize(page_size or self.page_size)
+        size = page_size.size
+        response = await self._get_page(endpoint, parameters, 1, size)          # First page includes total count
+        count = Rekono._get_count(response)
+        page_size.update(response, size)
+        yield response
+        del response                                                            # Release first page
+        if count is None:
+            return
+        if concurrency > 1:                                                     # Fixed page size for all pages
+            pages = range(2, math.ceil(count / size) + 1)                       # Remaining page numbers
+            remaining = self._get_pages_concurrently(endpoint, parameters, pages, size, concurrency)
+        else:
+            remaining = self._get_pages_sequentially(endpoint, parameters, size, count, page_size)
+        async for response in remaining:
+            yield response
+
+    async def iter_items(
+        self,
+        endpoint: str,
+        parameters: Optional[Dict[str, Any]] = None,
+        concurrency: int = 1,
+        page_size: Union[int, PageSize, None] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        '''GET requests to iterate over the items of all API pages, decoding one page at a time.
+
+        Args:
+            endpoint (str): Endpoint to call.
+            parameters (Optional[Dict[str, Any]], optional): Query parameters to send. Defaults to {}.
+            concurrency (int, optional): Number of pages to retrieve at the same time. Defaults to 1.
+            page_size (Union[int, PageSize, None], optional): Page size, fixed or adaptive. Defaults to 100.
+
+        Yields:
+            AsyncIterator[Dict[str, Any]]: Items returned by Rekono API.
+        '''
+        async for response in self.iter_pages(endpoint, parameters, concurrency, page_size):
+            body = codec.loads(response.content)
+            results = body.get('results', body) if isinstance(body, dict) else body   # Get results if it exists
+            for item in results if isinstance(results, list) else [results]:
+                yield item
+
+    def iter_pages_blocking(
+        self,
+        endpoint: str,
+        parameters: Optional[Dict[str, Any]] = None,
+        concurrency: int = 1,
+        page_size: Union[int, PageSize, None] = None
+    ) -> Iterator[Response]:
+        '''Iterate over all API pages from synchronous code, like CLI commands.
+
+        The event loop only runs while the next page is being awaited, and the client is closed at the end.
+
+        Args:
+            endpoint (str): Endpoint to call.
+            parameters (Optional[Dict[str, Any]], optional): Query parameters to send. Defaults to {}.
+            concurrency (int, optional): Number of pages to retrieve at the same time. Defaults to 1.
+            page_size (Union[int, PageSize, None], optional): Page size, fixed or adaptive. Defaults to 100.
+
+        Yields:
+            Iterator[Response]: HTTP responses in page order.
+        '''
+        loop = asyncio.new_event_loop()
+        pages = self.iter_pages(endpoint, parameters, concurrency, page_size)
+        try:
+            while True:
+                try:
+                    yield loop.run_until_complete(pages.__anext__())
+                except StopAsyncIteration:
+                    break
+        finally:
+            loop.run_until_complete(pages.aclose())                             # type: ignore
+            loop.run_until_complete(self.close())
+            loop.close()
+
+    async def get(
+        self,
+        endpoint: str,
+        parameters: Optional[Dict[str, Any]] = None,
+        pagination: bool = False,
+        concurrency: int = 1,
+        page_size: Union[int, PageSize, None] = None
+    ) -> Union[List[Response], Response]:
+        '''GET request to Rekono API.
+
+        Args:
+            endpoint (str): Endpoint to call.
+            parameters (Optional[Dict[str, Any]], optional): Query parameters to send. Defaults to {}.
+            pagination (bool, optional): Enables iteration over all API pages. Defaults to False.
+            concurrency (int, optional): Number of pages to retrieve at the same time. Defaults to 1.
+            page_size (Union[int, PageSize, None], optional): Page size, fixed or adaptive. Defaults to 100.
+
+        Raises:
+            AuthenticationError: Unauthenticated, API token is invalid
+            AuthorizationError: Unauthorizated, user doesn't have required permissions.
+
+        Returns:
+            Union[List[Response], Response]: HTTP responses if pagination is enabled or one HTTP response if not.
+        '''
+        if pagination:                                                          # Pagination is enabled
+            return [response async for response in self.iter_pages(endpoint, parameters, concurrency, page_size)]
+        return await self._get(endpoint, parameters or {})                      # Perform only one request
+
+    async def _send_form(self, method: str, endpoint: str, body: Optional[str], filepath: str) -> Response:
+        '''Request to Rekono API with body fields and file sent as multipart form.
+
+        Args:
+            method (str): HTTP method.
+            endpoint (str): Endpoint to call.
+            body (Optional[str]): Body whose fields are sent as form fields.
+            filepath (str): File to send.
+
+        Returns:
+            Response: HTTP response.
+        '''
+        form = aiohttp.FormData()
+        for key, value in (codec.loads(body) if body else {}).items():          # Body fields as form fields
+            for field_value in value if isinstance(value, list) else [value]:
+                form.add_field(key, str(field_value))
+        with open(filepath, 'rb') as file:                                      # Read file
+            form.add_field('file', file, filename=os.path.basename(filepath))
+            return await self._request(method, endpoint, form=form)
+
+    async def post(self, endpoint: str, body: Optional[str] = None, filepath: Optional[str] = None) -> Response:
+        '''POST request to Rekono API.
+
+        Args:
+            endpoint (str): Endpoint to call.
+            body (Optional[str], optional): Body to send. Defaults to None.
+            filepath (Optional[str], optional): File to send. Defaults to None.
+
+        Raises:
+            AuthenticationError: Unauthenticated, API token is invalid
+            AuthorizationError: Unauthorizated, user doesn't have required permissions.
+
+        Returns:
+            Response: HTTP response.
+        '''
+        if filepath and os.path.isfile(filepath):                               # If filepath is provided
+            return await self._send_form('POST', endpoint, body, filepath)      # Perform POST request with file
+        return await self._request('POST', endpoint, body=body)                 # Perform POST request without files
+
+    async def put(self, endpoint: str, body: Optional[str] = None, filepath: Optional[str] = None) -> Response:
+        '''PUT request to Rekono API.
+
+        Args:
+            endpoint (str): Endpoint to call.
+            body (Optional[str], optional): Body to send. Defaults to None.
+            filepath (Optional[str], optional): File to send. Defaults to None.
+
+        Raises:
+            AuthenticationError: Unauthenticated, API token is invalid
+            AuthorizationError: Unauthorizated, user doesn't have required permissions.
+
+        Returns:
+            Response: HTTP response.
+        '''
+        if filepath and os.path.isfile(filepath):                               # If filepath is provided
+            return await self._send_form('PUT', endpoint, body, filepath)       # Perform PUT request with file
+        return await self._request('PUT', endpoint, body=body)                  # Perform PUT request
+
+    async def delete(self, endpoint: str) -> Response:
+        '''DELETE request to Rekono API.
+
+        Args:
+            endpoint (str): Endpoint to call.
+
+        Raises:
+            AuthenticationError: Unauthenticated, API token is invalid
+            AuthorizationError: Unauthorizated, user doesn't have required permissions.
+
+        Returns:
+            Response: HTTP response.
+        '''
+        return await self._request('DELETE', endpoint)                          # Perform DELETE request
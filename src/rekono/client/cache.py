@@ -0,0 +1,441 @@
+'''On-disk cache of Rekono API responses.'''
+
+import hashlib
+import json
+import mmap
+import os
+import tempfile
+import time
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from requests.models import Request, Response
+from requests.structures import CaseInsensitiveDict
+
+
+def get_cache_directory(name: str = '') -> str:
+    '''Get directory where Rekono CLI can cache data.
+
+    Args:
+        name (str, optional): Subdirectory name. Defaults to ''.
+
+    Returns:
+        str: Directory path. It's taken from REKONO_CACHE_DIR or the user cache directory.
+    '''
+    base = os.getenv('REKONO_CACHE_DIR') or os.path.join(
+        os.getenv('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'), 'rekono-cli'
+    )
+    return os.path.join(base, name) if name else base
+
+
+def _write_atomically(directory: str, path: str, content: bytes) -> None:
+    '''Write file in cache directory, replacing it atomically so concurrent readers never see partial content.
+
+    Args:
+        directory (str): Cache directory, created if it doesn't exist.
+        path (str): File path.
+        content (bytes): File content.
+    '''
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    descriptor, temporal_path = tempfile.mkstemp(dir=directory)                 # Only readable by current user
+    with os.fdopen(descriptor, 'wb') as file:
+        file.write(content)
+    os.replace(temporal_path, path)
+
+
+class HttpCache:
+    '''On-disk cache of Rekono API responses with their validators, to make conditional GET requests.
+
+    Only responses with ETag or Last-Modified headers are stored. The least recently used responses are removed when
+    the cache exceeds its maximum size.
+    '''
+
+    validators = {'ETag': 'If-None-Match', 'Last-Modified': 'If-Modified-Since'}   # Validator and request header
+
+    def __init__(self, directory: Optional[str] = None, max_size: int = 100 * 1024 * 1024) -> None:
+        '''HTTP cache constructor.
+
+        Args:
+            directory (Optional[str], optional): Cache directory. Defaults to the user cache directory.
+            max_size (int, optional): Maximum size of the cache in bytes. Defaults to 100 MiB.
+        '''
+        self.directory = directory or get_cache_directory('http')
+        self.max_size = max_size
+
+    def get_key(self, url: str, parameters: Optional[Mapping[str, Any]], headers: Mapping[str, str]) -> str:
+        '''Get cache key for a GET request.
+
+        Request headers are included, so the same URL requested with different API tokens has different keys.
+
+        Args:
+            url (str): Requested URL.
+            parameters (Optional[Mapping[str, Any]]): Query parameters.
+            headers (Mapping[str, str]): Request headers.
+
+        Returns:
+            str: Cache key.
+        '''
+        request = json.dumps(
+            [url, sorted((parameters or {}).items()), sorted(headers.items())], default=str
+        )
+        return hashlib.sha256(request.encode()).hexdigest()
+
+    def _get_path(self, key: str) -> str:
+        '''Get file path of a cache entry.
+
+        Args:
+            key (str): Cache key.
+
+        Returns:
+            str: Cache entry path.
+        '''
+        return os.path.join(self.directory, key)
+
+    def load(self, key: str) -> Optional[Tuple[Dict[str, Any], bytes]]:
+        '''Load cache entry.
+
+        Args:
+            key (str): Cache key.
+
+        Returns:
+            Optional[Tuple[Dict[str, Any], bytes]]: Response metadata and body, or None if there is no entry.
+        '''
+        try:
+            with open(self._get_path(key), 'rb') as entry:
+                metadata = json.loads(entry.readline())                         # First line contains metadata
+                return metadata, entry.read()                                   # Rest of the file is the body
+        except (OSError, ValueError):
+            return None
+
+    def get_conditional_headers(self, metadata: Dict[str, Any]) -> Dict[str, str]:
+        '''Get HTTP headers to make a conditional request using the validators of a cache entry.
+
+        Args:
+            metadata (Dict[str, Any]): Cached response metadata.
+
+        Returns:
+            Dict[str, str]: Conditional request headers.
+        '''
+        headers = CaseInsensitiveDict(metadata.get('headers', {}))
+        return {header: headers[validator] for validator, header in self.validators.items() if validator in headers}
+
+    def save(self, key: str, response: Response) -> None:
+        '''Save response in cache, if it can be validated later.
+
+        Args:
+            key (str): Cache key.
+            response (Response): HTTP response.
+        '''
+        if response.status_code != 200 or not any(validator in response.headers for validator in self.validators):
+            return
+        metadata = json.dumps({'url': response.url, 'headers': dict(response.headers)}).encode()
+        try:
+            _write_atomically(self.directory, self._get_path(key), metadata + b'\n' + response.content)
+        except OSError:
+            return                                                              # Cache errors don't break requests
+        self._evict()
+
+    def build_response(self, key: str, metadata: Dict[str, Any], body: bytes, not_modified: Response) -> Response:
+        '''Build response from cache entry after server confirmed that it's not modified.
+
+        Args:
+            key (str): Cache key.
+            metadata (Dict[str, Any]): Cached response metadata.
+            body (bytes): Cached response body.
+            not_modified (Response): Not modified response returned by server.
+
+        Returns:
+            Response: HTTP response with cached content.
+        '''
+        try:
+            os.utime(self._get_path(key))                                       # Mark entry as recently used
+        except OSError:
+            pass
+        response = Response()
+        response.request = not_modified.request
+        response.url = metadata.get('url') or not_modified.url
+        response.status_code = 200
+        response.headers = CaseInsensitiveDict(metadata.get('headers', {}))
+        response.headers.update(not_modified.headers)                           # Updated headers from server
+        response.headers.pop('Content-Length', None)
+        response.headers.pop('Content-Encoding', None)                          # Cached body is already decoded
+        response._content = body
+        response.elapsed = not_modified.elapsed
+        return response
+
+    def _evict(self) -> None:
+        '''Remove least recently used entries until the cache size is under its maximum size.'''
+        try:
+            entries = [os.path.join(self.directory, name) for name in os.listdir(self.directory)]
+            stats = [(path, os.stat(path)) for path in entries if os.path.isfile(path)]
+        except OSError:
+            return
+        size = sum(stat.st_size for _, stat in stats)
+        for path, stat in sorted(stats, key=lambda entry: entry[1].st_mtime):   # Least recently used first
+            if size <= self.max_size:
+                break
+            try:
+                os.remove(path)
+                size -= stat.st_size
+            except OSError:
+                continue
+
+
+class CatalogCache:
+    '''On-disk cache of Rekono catalogs, like tools or configurations, that rarely change.
+
+    Catalogs are returned without any request to the server until their time to live expires.
+    '''
+
+    def __init__(self, directory: Optional[str] = None) -> None:
+        '''Catalog cache constructor.
+
+        Args:
+            directory (Optional[str], optional): Cache directory. Defaults to the user cache directory.
+        '''
+        self.directory = directory or get_cache_directory('catalogs')
+
+    def _get_server_directory(self, url: str) -> str:
+        '''Get cache directory for one Rekono instance.
+
+        Args:
+            url (str): Base Rekono URL.
+
+        Returns:
+            str: Directory path.
+        '''
+        return os.path.join(self.directory, hashlib.sha256(url.encode()).hexdigest())
+
+    @staticmethod
+    def _get_name(endpoint: str) -> str:
+        '''Get file name prefix for the catalog of an endpoint.
+
+        Args:
+            endpoint (str): Catalog endpoint.
+
+        Returns:
+            str: File name prefix.
+        '''
+        return endpoint.strip('/').replace('/', '_')
+
+    def _get_path(self, url: str, endpoint: str, headers: Mapping[str, str]) -> str:
+        '''Get file path of a catalog.
+
+        Request headers are included, so the same catalog requested with different API tokens has different paths.
+
+        Args:
+            url (str): Base Rekono URL.
+            endpoint (str): Catalog endpoint.
+            headers (Mapping[str, str]): Request headers.
+
+        Returns:
+            str: Catalog path.
+        '''
+        key = hashlib.sha256(json.dumps([endpoint, sorted(headers.items())]).encode()).hexdigest()
+        return os.path.join(self._get_server_directory(url), f'{self._get_name(endpoint)}-{key}.json')
+
+    def load(self, url: str, endpoint: str, headers: Mapping[str, str], ttl: int) -> Optional[List[Response]]:
+        '''Load catalog if it hasn't expired.
+
+        Args:
+            url (str): Base Rekono URL.
+            endpoint (str): Catalog endpoint.
+            headers (Mapping[str, str]): Request headers.
+            ttl (int): Time to live of the catalog in seconds.
+
+        Returns:
+            Optional[List[Response]]: Cached HTTP responses, or None if the catalog isn't cached or has expired.
+        '''
+        try:
+            with open(self._get_path(url, endpoint, headers), 'r', encoding='utf-8') as file:
+                catalog = json.load(file)
+        except (OSError, ValueError):
+            return None
+        if time.time() - catalog.get('created', 0) > ttl:                       # Expired catalog
+            return None
+        responses = []
+        for page in catalog.get('pages', []):
+            response = Response()
+            response.request = Request(method='GET', url=page['url']).prepare()
+            response.url = page['url']
+            response.status_code = 200
+            response.headers = CaseInsensitiveDict(page['headers'])
+            response._content = page['content'].encode()
+            responses.append(response)
+        return responses
+
+    def save(
+        self,
+        url: str,
+        endpoint: str,
+        headers: Mapping[str, str],
+        responses: List[Response]
+    ) -> None:
+        '''Save catalog, if all its pages have been retrieved successfully.
+
+        Args:
+            url (str): Base Rekono URL.
+            endpoint (str): Catalog endpoint.
+            headers (Mapping[str, str]): Request headers.
+            responses (List[Response]): HTTP responses with the catalog pages.
+        '''
+        if not responses or any(response.status_code != 200 for response in responses):
+            return
+        directory = self._get_server_directory(url)
+        catalog = {
+            'created': time.time(),
+            'pages': [
+                {'url': response.url, 'headers': dict(response.headers), 'content': response.content.decode()}
+                for response in responses
+            ]
+        }
+        try:
+            _write_atomically(directory, self._get_path(url, endpoint, headers), json.dumps(catalog).encode())
+        except (OSError, UnicodeDecodeError):
+            return                                                              # Cache errors don't break requests
+
+    def invalidate(self, endpoint: str) -> None:
+        '''Discard cached catalogs of an endpoint for all Rekono instances, after modifying its entities.
+
+        Args:
+            endpoint (str): Catalog endpoint.
+        '''
+        try:
+            servers = [os.path.join(self.directory, name) for name in os.listdir(self.directory)]
+        except OSError:
+            return
+        for directory in servers:
+            self._remove(directory, f'{self._get_name(endpoint)}-')
+
+    @staticmethod
+    def _remove(directory: str, prefix: str) -> None:
+        '''Remove cached catalogs from a directory.
+
+        Args:
+            directory (str): Directory of one Rekono instance.
+            prefix (str): File name prefix of the catalogs to remove.
+        '''
+        try:
+            names = os.listdir(directory)
+        except OSError:
+            return
+        for name in names:
+            if name.startswith(prefix) and name.endswith('.json'):
+                try:
+                    os.remove(os.path.join(directory, name))
+                except OSError:
+                    continue
+
+
+def get_file_hash(filepath: str, chunk_size: int = 1024 * 1024) -> str:
+    '''Get SHA-256 hash of a file content, reading it through a memory map so that big files aren't copied in memory.
+
+    Args:
+        filepath (str): File path.
+        chunk_size (int, optional): Number of bytes hashed at a time. Defaults to 1 MiB.
+
+    Returns:
+        str: Hexadecimal hash.
+    '''
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as file:
+        size = os.fstat(file.fileno()).st_size
+        try:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if size > 0 else None
+        except (OSError, ValueError):                                           # File can't be mapped, like pipes
+            mapped = None
+        if mapped is None:
+            for chunk in iter(lambda: file.read(chunk_size), b''):
+                digest.update(chunk)
+            return digest.hexdigest()
+        with mapped, memoryview(mapped) as view:                                # Pages are read as they are hashed
+            for offset in range(0, len(view), chunk_size):
+                digest.update(view[offset:offset + chunk_size])
+    return digest.hexdigest()
+
+
+class UploadIndex:
+    '''On-disk index of the files uploaded to each Rekono instance, by content hash.
+
+    It's used to skip uploads of files whose content has been already uploaded, like the same wordlists uploaded on
+    each environment rebuild. Entries are identified by endpoint and entity name, and they include the other form
+    fields sent with the file, so that changes in those fields aren't skipped.
+    '''
+
+    def __init__(self, directory: Optional[str] = None) -> None:
+        '''Upload index constructor.
+
+        Args:
+            directory (Optional[str], optional): Cache directory. Defaults to the user cache directory.
+        '''
+        self.directory = directory or get_cache_directory('uploads')
+
+    def _get_path(self, url: str, endpoint: str) -> str:
+        '''Get file path of the index of one endpoint in one Rekono instance.
+
+        Args:
+            url (str): Base Rekono URL.
+            endpoint (str): Endpoint where files are uploaded.
+
+        Returns:
+            str: Index path.
+        '''
+        server = hashlib.sha256(url.encode()).hexdigest()                       # Same server key as catalogs
+        return os.path.join(self.directory, f'{server}-{CatalogCache._get_name(endpoint)}.json')
+
+    def _load(self, url: str, endpoint: str) -> Dict[str, Dict[str, Any]]:
+        '''Load index of one endpoint in one Rekono instance.
+
+        Args:
+            url (str): Base Rekono URL.
+            endpoint (str): Endpoint where files are uploaded.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Uploaded files by entity name.
+        '''
+        try:
+            with open(self._get_path(url, endpoint), 'r', encoding='utf-8') as file:
+                index = json.load(file)
+        except (OSError, ValueError):
+            return {}
+        return index if isinstance(index, dict) else {}
+
+    def get(self, url: str, endpoint: str, name: str) -> Optional[Dict[str, Any]]:
+        '''Get uploaded file of an entity.
+
+        Args:
+            url (str): Base Rekono URL.
+            endpoint (str): Endpoint where files are uploaded.
+            name (str): Entity name.
+
+        Returns:
+            Optional[Dict[str, Any]]: Entity ID, content hash of its file and form fields, or None if it hasn't been
+                uploaded.
+        '''
+        entry = self._load(url, endpoint).get(name)
+        return entry if isinstance(entry, dict) and 'id' in entry and 'hash' in entry else None
+
+    def save(
+        self,
+        url: str,
+        endpoint: str,
+        name: str,
+        id: Any,
+        file_hash: str,
+        fields: Optional[Dict[str, Any]] = None
+    ) -> None:
+        '''Save uploaded file of an entity.
+
+        Args:
+            url (str): Base Rekono URL.
+            endpoint (str): Endpoint where files are uploaded.
+            name (str): Entity name.
+            id (Any): Entity ID.
+            file_hash (str): Content hash of the uploaded file.
+            fields (Optional[Dict[str, Any]], optional): Form fields sent with the file. Defaults to {}.
+        '''
+        index = self._load(url, endpoint)
+        index[name] = {'id': id, 'hash': file_hash, 'fields': fields or {}}
+        try:
+            _write_atomically(self.directory, self._get_path(url, endpoint), json.dumps(index).encode())
+        except OSError:
+            return                                                              # Cache errors don't break uploads
@@ -0,0 +1,172 @@
+'''JSON codecs to decode and encode Rekono API data, using a faster backend if it's installed.'''
+
+import importlib
+import json
+import os
+import re
+from typing import Any, Dict, Match, Optional, Type, Union
+
+try:
+    orjson: Any = importlib.import_module('orjson')                             # Optional faster JSON backend
+except ImportError:
+    orjson = None
+
+_INDENTATION = re.compile(r'\n( +)')                                            # Indentation of each line
+_NON_ASCII = re.compile(r'[^\x00-\x7e]')                                        # Escaped by json, DEL included
+
+
+def _escape(match: Match) -> str:
+    '''Escape non ASCII character in the same way than the standard library.
+
+    Args:
+        match (Match): Non ASCII character.
+
+    Returns:
+        str: JSON escape sequence, with surrogate pair if needed.
+    '''
+    code = ord(match.group(0))
+    if code < 0x10000:
+        return '\\u{0:04x}'.format(code)
+    code -= 0x10000
+    return '\\u{0:04x}\\u{1:04x}'.format(0xd800 | (code >> 10), 0xdc00 | (code & 0x3ff))
+
+
+class JsonCodec:
+    '''JSON codec based on the standard library.'''
+
+    name = 'json'                                                               # Backend name
+
+    @staticmethod
+    def is_available() -> bool:
+        '''Check if the codec can be used.
+
+        Returns:
+            bool: Indicates if its backend is installed.
+        '''
+        return True
+
+    def loads(self, data: Union[bytes, bytearray, str]) -> Any:
+        '''Decode JSON document.
+
+        Args:
+            data (Union[bytes, bytearray, str]): JSON document, like the raw body of a response.
+
+        Raises:
+            ValueError: Invalid JSON document.
+
+        Returns:
+            Any: Decoded data.
+        '''
+        return json.loads(data)
+
+    def dumps(self, data: Any) -> str:
+        '''Encode data as compact JSON, keeping non ASCII characters.
+
+        Args:
+            data (Any): Data to encode.
+
+        Returns:
+            str: JSON document.
+        '''
+        return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+
+    def dumps_pretty(self, data: Any, indent: int = 4) -> str:
+        '''Encode data as indented JSON, escaping non ASCII characters.
+
+        Args:
+            data (Any): Data to encode.
+            indent (int, optional): Number of spaces for each indentation level. Defaults to 4.
+
+        Returns:
+            str: JSON document.
+        '''
+        return json.dumps(data, ensure_ascii=True, indent=indent)
+
+
+class OrjsonCodec(JsonCodec):
+    '''JSON codec based on orjson, that decodes bytes without text copies and encodes faster than the standard library.
+
+    Encoded documents are the same than the standard library ones, so the backend doesn't change the output.
+    '''
+
+    name = 'orjson'                                                             # Backend name
+
+    @staticmethod
+    def is_available() -> bool:
+        '''Check if the codec can be used.
+
+        Returns:
+            bool: Indicates if orjson is installed.
+        '''
+        return orjson is not None
+
+    def loads(self, data: Union[bytes, bytearray, str]) -> Any:
+        '''Decode JSON document.
+
+        Args:
+            data (Union[bytes, bytearray, str]): JSON document, like the raw body of a response.
+
+        Raises:
+            ValueError: Invalid JSON document.
+
+        Returns:
+            Any: Decoded data.
+        '''
+        return orjson.loads(data)
+
+    def dumps(self, data: Any) -> str:
+        '''Encode data as compact JSON, keeping non ASCII characters.
+
+        Args:
+            data (Any): Data to encode.
+
+        Returns:
+            str: JSON document.
+        '''
+        try:
+            return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:                                                       # Unsupported, like very big integers
+            return super().dumps(data)
+
+    def dumps_pretty(self, data: Any, indent: int = 4) -> str:
+        '''Encode data as indented JSON, escaping non ASCII characters.
+
+        Args:
+            data (Any): Data to encode.
+            indent (int, optional): Number of spaces for each indentation level. Defaults to 4.
+
+        Returns:
+            str: JSON document.
+        '''
+        try:
+            text = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:                                                       # Unsupported, like very big integers
+            return super().dumps_pretty(data, indent)
+        if indent != 2:                                                         # orjson only indents with 2 spaces
+            text = _INDENTATION.sub(lambda match: '\n' + ' ' * (len(match.group(1)) // 2 * indent), text)
+        if not text.isascii() or '\x7f' in text:
+            text = _NON_ASCII.sub(_escape, text)
+        return text
+
+
+codecs: Dict[str, Type[JsonCodec]] = {                                          # Codec for each JSON backend
+    JsonCodec.name: JsonCodec,
+    OrjsonCodec.name: OrjsonCodec
+}
+
+
+def get_codec(name: Optional[str] = None) -> JsonCodec:
+    '''Get JSON codec.
+
+    Args:
+        name (Optional[str], optional): Backend name. Defaults to the fastest installed backend.
+
+    Returns:
+        JsonCodec: Codec of the requested backend if it's installed, or the fastest installed one if not.
+    '''
+    if name and name in codecs and codecs[name].is_available():
+        return codecs[name]()
+    return OrjsonCodec() if OrjsonCodec.is_available() else JsonCodec()
+
+
+codec = get_codec(os.getenv('REKONO_JSON_BACKEND'))                             # Codec used by Rekono CLI
@@ -46,3 +46,24 @@ class WordlistType(Enum):
 
     ENDPOINT = 'Endpoint'
     SUBDOMAIN = 'Subdomain'
+
+
+class Severity(Enum):
+    '''Vulnerability severities.'''
+
+    INFO = 'Info'
+    LOW = 'Low'
+    MEDIUM = 'Medium'
+    HIGH = 'High'
+    CRITICAL = 'Critical'
+
+
+class Status(Enum):
+    '''Task and execution statuses.'''
+
+    REQUESTED = 'Requested'
+    SKIPPED = 'Skipped'
+    RUNNING = 'Running'
+    CANCELLED = 'Cancelled'
+    ERROR = 'Error'
+    COMPLETED = 'Completed'
@@ -10,12 +10,12 @@ from requests.models import Response
 class RekonoException(ClickException):
     '''Base exception for Rekono client'''
 
-    def __init__(self, message: str, response: Response) -> None:
+    def __init__(self, message: str, response: Optional[Response] = None) -> None:
         '''Exception constructor.
 
         Args:
             message (str): Error message.
-            response (Response): Http response that causes the error.
+            response (Optional[Response], optional): Http response that causes the error. Defaults to None.
         '''
         self.response = response
         self.message = message
@@ -52,3 +52,23 @@ class AuthorizationError(RekonoException):
             response (Response): Http response that causes the error.
         '''
         super().__init__('Unauthorized: User hasn\'t required permissions to perform this action', response)
+
+
+class RequestError(RekonoException):
+    '''Error that prevents getting a response from Rekono API, even after retries.'''
+
+    def __init__(self, error: Exception) -> None:
+        '''Exception constructor.
+
+        Args:
+            error (Exception): Error raised during HTTP request.
+        '''
+        super().__init__(f'Request error: {error}')
+
+
+class DeadlineError(RekonoException):
+    '''Deadline for Rekono API requests has been exceeded.'''
+
+    def __init__(self) -> None:
+        '''Exception constructor.'''
+        super().__init__('Deadline exceeded: Rekono API requests took longer than allowed')
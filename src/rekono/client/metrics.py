@@ -0,0 +1,96 @@
+'''Metrics of the data received from Rekono API, before and after the decompression of the response bodies.'''
+
+import threading
+import weakref
+from typing import Any, Dict, Optional
+
+from requests.models import Response
+
+_streamed: 'weakref.WeakKeyDictionary[Response, TransferMetrics]' = weakref.WeakKeyDictionary()   # Pending bodies
+
+
+class TransferMetrics:
+    '''Counters of the response bodies received by a Rekono client.
+
+    Received bytes are counted as they were transferred over the network, so compressed bodies are counted before
+    their decompression. The client can be shared between threads, so counters are updated with a lock.
+    '''
+
+    def __init__(self) -> None:
+        '''Transfer metrics constructor.'''
+        self.lock = threading.Lock()
+        self.responses = 0                                                      # Responses whose body was received
+        self.compressed_responses = 0                                           # Responses with compressed body
+        self.received_bytes = 0                                                 # Body bytes received from network
+        self.decoded_bytes = 0                                                  # Body bytes after decompression
+
+    @staticmethod
+    def _get_received_bytes(response: Response, decoded_bytes: int) -> int:
+        '''Get number of body bytes received from the network.
+
+        Args:
+            response (Response): HTTP response whose body has been received.
+            decoded_bytes (int): Number of body bytes after decompression.
+
+        Returns:
+            int: Number of body bytes before decompression.
+        '''
+        tell = getattr(response.raw, 'tell', None)
+        if callable(tell):                                                      # Bytes read from the connection
+            return tell()
+        length = response.headers.get('Content-Length', '')
+        if response.headers.get('Content-Encoding') and length.isdigit():       # Decompressed by another client
+            return int(length)
+        return decoded_bytes
+
+    def record(self, response: Response, decoded_bytes: Optional[int] = None) -> None:
+        '''Record response whose body has been received.
+
+        Args:
+            response (Response): HTTP response.
+            decoded_bytes (Optional[int], optional): Number of body bytes after decompression. Defaults to the
+                length of the response content.
+        '''
+        decoded = len(response.content or b'') if decoded_bytes is None else decoded_bytes
+        received = self._get_received_bytes(response, decoded)
+        compressed = response.headers.get('Content-Encoding', 'identity').lower() != 'identity'
+        with self.lock:
+            self.responses += 1
+            self.compressed_responses += 1 if compressed else 0
+            self.received_bytes += received
+            self.decoded_bytes += decoded
+
+    def track(self, response: Response) -> None:
+        '''Record response once its body is received, because it was requested with stream enabled.
+
+        Args:
+            response (Response): HTTP response whose body hasn't been received yet.
+        '''
+        _streamed[response] = self
+
+    def to_dict(self) -> Dict[str, Any]:
+        '''Get metrics values.
+
+        Returns:
+            Dict[str, Any]: Counters and compression ratio, as decoded bytes per received byte.
+        '''
+        with self.lock:
+            return {
+                'responses': self.responses,
+                'compressed_responses': self.compressed_responses,
+                'received_bytes': self.received_bytes,
+                'decoded_bytes': self.decoded_bytes,
+                'compression_ratio': round(self.decoded_bytes / self.received_bytes, 2) if self.received_bytes else 1.0
+            }
+
+
+def record_streamed(response: Response, decoded_bytes: int) -> None:
+    '''Record response requested with stream enabled, once its body has been received.
+
+    Args:
+        response (Response): HTTP response.
+        decoded_bytes (int): Number of body bytes after decompression.
+    '''
+    metrics = _streamed.pop(response, None)
+    if metrics is not None:
+        metrics.record(response, decoded_bytes)
@@ -0,0 +1,168 @@
+'''Streaming multipart encoding of file uploads, so that files are read in chunks while the request is sent.'''
+
+import os
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from urllib3.fields import RequestField
+from urllib3.filepost import choose_boundary
+
+
+class MultipartEncoder:
+    '''Multipart form whose body is read while the request is sent, with the file content read in chunks.
+
+    Memory usage is bounded by the chunk size instead of the file size, and the number of bytes sent is reported
+    after each chunk. The body can't be sent again once some bytes have been sent, so failed uploads aren't retried
+    with a partially consumed body.
+    '''
+
+    def __init__(
+        self,
+        filepath: str,
+        fields: Optional[Dict[str, Any]] = None,
+        file_field: str = 'file',
+        chunk_size: int = 64 * 1024,
+        progress: Optional[Callable[[int, int], Any]] = None
+    ) -> None:
+        '''Multipart encoder constructor.
+
+        Args:
+            filepath (str): File to upload.
+            fields (Optional[Dict[str, Any]], optional): Form fields sent before the file. Defaults to None.
+            file_field (str, optional): Form field of the file. Defaults to 'file'.
+            chunk_size (int, optional): Number of file bytes to read at a time. Defaults to 64 KiB.
+            progress (Optional[Callable[[int, int], Any]], optional): Function called with the number of bytes sent
+                and the body size after each chunk. Defaults to None.
+        '''
+        self.boundary = choose_boundary()
+        self.content_type = f'multipart/form-data; boundary={self.boundary}'    # Header value to send the body
+        parts: List[bytes] = []
+        for name, value in (fields or {}).items():                              # Same fields as requests encoding
+            for field_value in value if isinstance(value, list) else [value]:
+                if field_value is not None:
+                    parts.append(self._render_part(RequestField(name, b'')))
+                    parts.append(str(field_value).encode('utf-8') + b'\r\n')
+        parts.append(self._render_part(RequestField(file_field, b'', filename=os.path.basename(filepath))))
+        self.head = b''.join(parts)                                             # Form fields and file headers
+        self.tail = f'\r\n--{self.boundary}--\r\n'.encode()                     # End of the file and the form
+        self.file_size = os.path.getsize(filepath)
+        self.total = len(self.head) + self.file_size + len(self.tail)           # Body size
+        self.chunk_size = chunk_size
+        self.progress = progress
+        self.sent = 0                                                           # Body bytes read by the transport
+        self.file = open(filepath, 'rb')
+
+    def _render_part(self, field: RequestField) -> bytes:
+        '''Render boundary and headers of one form part.
+
+        Args:
+            field (RequestField): Form field.
+
+        Returns:
+            bytes: Part boundary and headers.
+        '''
+        field.make_multipart()
+        return f'--{self.boundary}\r\n'.encode() + field.render_headers().encode()
+
+    def __len__(self) -> int:
+        '''Get body size, sent as Content-Length header.
+
+        Returns:
+            int: Number of body bytes.
+        '''
+        return self.total
+
+    def __iter__(self) -> Iterator[bytes]:
+        '''Iterate over the body chunks.
+
+        Yields:
+            Iterator[bytes]: Next body chunk.
+        '''
+        chunk = self.read(self.chunk_size)
+        while chunk:
+            yield chunk
+            chunk = self.read(self.chunk_size)
+
+    def __enter__(self) -> 'MultipartEncoder':
+        '''Use encoder as context manager, so that the file is closed when the upload finishes.
+
+        Returns:
+            MultipartEncoder: Multipart encoder.
+        '''
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        '''Close file when the context manager finishes.'''
+        self.close()
+
+    def close(self) -> None:
+        '''Close uploaded file.'''
+        self.file.close()
+
+    def _read_part(self, position: int, size: int) -> bytes:
+        '''Read body bytes from one of its parts.
+
+        Args:
+            position (int): Body position.
+            size (int): Maximum number of bytes to read.
+
+        Raises:
+            OSError: File has been truncated while it's uploaded.
+
+        Returns:
+            bytes: Body bytes from the part that contains the position.
+        '''
+        file_end = len(self.head) + self.file_size
+        if position < len(self.head):                                           # Form fields and file headers
+            return self.head[position:position + size]
+        elif position < file_end:                                               # File content
+            content = self.file.read(min(size, self.chunk_size, file_end - position))
+            if not content:
+                raise OSError('File has been truncated while it was uploaded')
+            return content
+        return self.tail[position - file_end:position - file_end + size]
+
+    def read(self, size: Optional[int] = -1) -> bytes:
+        '''Read the next body bytes.
+
+        Args:
+            size (Optional[int], optional): Maximum number of bytes to read. Defaults to all the remaining bytes.
+
+        Raises:
+            OSError: File has been truncated while it's uploaded.
+
+        Returns:
+            bytes: Body bytes, or empty bytes once the whole body has been read.
+        '''
+        size = self.total - self.sent if size is None or size < 0 else min(size, self.total - self.sent)
+        chunk = bytearray()
+        while len(chunk) < size:
+            chunk += self._read_part(self.sent + len(chunk), size - len(chunk))
+        self.sent += len(chunk)
+        if self.progress and chunk:
+            self.progress(self.sent, self.total)
+        return bytes(chunk)
+
+    def tell(self) -> int:
+        '''Get number of body bytes already read, so that the transport can rewind the body before retries.
+
+        Returns:
+            int: Body position.
+        '''
+        return self.sent
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        '''Rewind body before a retry, which is only possible if no bytes have been sent yet.
+
+        Args:
+            offset (int): Body position.
+            whence (int, optional): Reference of the position. Only the body start is supported. Defaults to SEEK_SET.
+
+        Raises:
+            OSError: Body can't be sent again, because some bytes have been already sent.
+
+        Returns:
+            int: Body position.
+        '''
+        if offset != self.sent or whence != os.SEEK_SET:
+            raise OSError(f'Upload can\'t be retried after sending {self.sent} of {self.total} bytes')
+        return self.sent
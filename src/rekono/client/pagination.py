@@ -0,0 +1,110 @@
+'''Pagination of Rekono API listings.'''
+
+import math
+from typing import Dict, List, NamedTuple
+
+from requests.models import Response
+
+
+class PageSize:
+    '''Page size for paginated requests to Rekono API, that can be adapted to the observed responses.
+
+    Page numbers depend on the page size, so the adaptive mode only doubles or halves the size when the number of items
+    already retrieved is a multiple of the new size. This way, the next page starts exactly after the previous one.
+    '''
+
+    def __init__(
+        self,
+        size: int = 100,
+        adaptive: bool = False,
+        min_size: int = 10,
+        max_size: int = 1000,
+        target_time: float = 1.0,
+        max_bytes: int = 5 * 1024 * 1024
+    ) -> None:
+        '''Page size constructor.
+
+        Args:
+            size (int, optional): Initial page size. Defaults to 100.
+            adaptive (bool, optional): Adapt page size to response time and body size. Defaults to False.
+            min_size (int, optional): Minimum page size in adaptive mode. Defaults to 10.
+            max_size (int, optional): Maximum page size in adaptive mode (Rekono API max is 1000). Defaults to 1000.
+            target_time (float, optional): Desired response time in seconds. Defaults to 1.0.
+            max_bytes (int, optional): Maximum desired body size in bytes. Defaults to 5 MiB.
+        '''
+        self.size = max(min(size, max_size), min_size) if adaptive else size
+        self.adaptive = adaptive
+        self.min_size = min_size
+        self.max_size = max_size
+        self.target_time = target_time
+        self.max_bytes = max_bytes
+
+    def update(self, response: Response, position: int) -> None:
+        '''Adapt page size to the last retrieved page, if adaptive mode is enabled.
+
+        Args:
+            response (Response): Last retrieved page.
+            position (int): Number of items retrieved until the last page, included.
+        '''
+        if not self.adaptive:
+            return
+        elapsed = max(response.elapsed.total_seconds(), 0.001)
+        ideal_size = min(                                                       # Page size to reach desired limits
+            self.size * self.target_time / elapsed,
+            self.size * self.max_bytes / max(len(response.content or b''), 1)
+        )
+        if ideal_size >= self.size * 2 and self.size * 2 <= self.max_size and position % (self.size * 2) == 0:
+            self.size *= 2                                                      # Fast and small pages
+        elif ideal_size <= self.size / 2 and self.size % 2 == 0 and self.size // 2 >= self.min_size:
+            self.size //= 2                                                     # Slow or large pages
+
+
+class PageSlice(NamedTuple):
+    '''Page to request from Rekono API and range of its items that are needed.'''
+
+    page: int                                                                   # Page number
+    size: int                                                                   # Page size
+    start: int                                                                  # Index of first needed item in page
+    end: int                                                                    # Index after last needed item in page
+
+
+def plan_page(position: int, remaining: float, max_size: int) -> PageSlice:
+    '''Plan the next page to retrieve a range of items, without fetching items out of the range when possible.
+
+    Pages start at multiples of their size, so the smallest page size whose page contains all the wanted items from
+    the position is chosen. If there isn't any, the page that contains the position is retrieved until its end.
+
+    Args:
+        position (int): Index of the next needed item.
+        remaining (float): Number of needed items from the position. It can be infinite.
+        max_size (int): Maximum page size.
+
+    Returns:
+        PageSlice: Page to request and range of its needed items.
+    '''
+    wanted = int(min(remaining, max_size))                                      # Items to retrieve in this page
+    for size in range(wanted, max_size + 1):
+        if size - position % size >= wanted:                                    # Page contains all wanted items
+            break
+    else:
+        size = max_size
+    start = position % size
+    return PageSlice(position // size + 1, size, start, int(min(start + remaining, size)))
+
+
+def split_id_range(first: int, last: int, shards: int) -> List[Dict[str, int]]:
+    '''Split a range of entity IDs into shards of similar width, that can be paginated independently.
+
+    Args:
+        first (int): Lowest entity ID.
+        last (int): Highest entity ID.
+        shards (int): Maximum number of shards.
+
+    Returns:
+        List[Dict[str, int]]: Query parameters to filter the entities of each shard.
+    '''
+    width = math.ceil((last - first + 1) / shards)                              # IDs per shard
+    return [
+        {'id__gte': start, 'id__lte': min(start + width - 1, last)}
+        for start in range(first, last + 1, width)
+    ]
@@ -0,0 +1,111 @@
+'''Retry policy of requests to Rekono API.'''
+
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Optional, cast
+
+from requests.adapters import Retry
+
+from rekono.client.exceptions import DeadlineError
+
+retry_after_status = [429, 503]                                                 # Status codes with Retry-After header
+
+
+def check_deadline(deadline: Optional[float], wait: float = 0) -> None:
+    '''Check that there is time to continue before the deadline.
+
+    Args:
+        deadline (Optional[float]): Monotonic time when requests must have finished, or None if there is no deadline.
+        wait (float, optional): Seconds to wait before continuing. Defaults to 0.
+
+    Raises:
+        DeadlineError: Deadline has been exceeded or would be exceeded after waiting.
+    '''
+    if deadline is not None and time.monotonic() + wait >= deadline:
+        raise DeadlineError()
+
+
+def get_remaining_time(deadline: Optional[float], timeout: float) -> float:
+    '''Get timeout for the next attempt, so that it doesn't exceed the deadline.
+
+    Args:
+        deadline (Optional[float]): Monotonic time when requests must have finished, or None if there is no deadline.
+        timeout (float): Configured timeout in seconds.
+
+    Returns:
+        float: Timeout in seconds.
+    '''
+    return timeout if deadline is None else max(min(timeout, deadline - time.monotonic()), 0.001)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    '''Parse Retry-After header value.
+
+    Args:
+        value (Optional[str]): Header value, in seconds or as HTTP date.
+
+    Returns:
+        Optional[float]: Seconds to wait, or None if the value is invalid.
+    '''
+    if not value:
+        return None
+    if value.strip().isdigit():
+        return float(value)
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0)
+    except (TypeError, ValueError):
+        return None
+
+
+class RekonoRetry(Retry):
+    '''Retry policy with random jitter between attempts and an optional deadline for all of them.
+
+    Retry-After header is honored for 429 and 503 responses, but waits never exceed the deadline.
+    '''
+
+    def __init__(self, *args: Any, jitter: float = 0, deadline: Optional[float] = None, **kwargs: Any) -> None:
+        '''Retry policy constructor.
+
+        Args:
+            jitter (float, optional): Maximum random seconds added to each backoff. Defaults to 0.
+            deadline (Optional[float], optional): Monotonic time when requests must have finished. Defaults to None.
+        '''
+        super().__init__(*args, **kwargs)
+        self.jitter = jitter
+        self.deadline = deadline
+
+    def new(self, **kwargs: Any) -> 'RekonoRetry':
+        '''Create retry policy for the next attempt, keeping jitter and deadline.
+
+        Returns:
+            RekonoRetry: Retry policy.
+        '''
+        retry = cast(RekonoRetry, super().new(**kwargs))
+        retry.jitter = self.jitter
+        retry.deadline = self.deadline
+        return retry
+
+    def get_backoff_time(self) -> float:
+        '''Get seconds to wait before the next attempt, including random jitter.
+
+        Returns:
+            float: Seconds to wait.
+        '''
+        return super().get_backoff_time() + random.uniform(0, self.jitter)
+
+    def sleep(self, response: Optional[Any] = None) -> None:
+        '''Wait before the next attempt.
+
+        Args:
+            response (Optional[Any], optional): Last HTTP response, if any. Defaults to None.
+
+        Raises:
+            DeadlineError: Deadline would be exceeded after waiting.
+        '''
+        wait = None
+        if self.respect_retry_after_header and response is not None and response.status in retry_after_status:
+            wait = parse_retry_after(response.headers.get('Retry-After'))
+        wait = self.get_backoff_time() if wait is None else wait
+        check_deadline(self.deadline, wait)                                     # Fail fast instead of waiting
+        time.sleep(wait)
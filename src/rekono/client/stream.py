@@ -0,0 +1,241 @@
+'''Incremental parsing of Rekono API responses, decoding their items while the body is received.'''
+
+import re
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+import requests
+from requests.models import Response
+
+from rekono.client.codec import codec
+from rekono.client.exceptions import RekonoException, RequestError
+from rekono.client.metrics import record_streamed
+
+_TOKENS = re.compile(rb'[{}\[\]",]')                                            # Structural tokens out of strings
+_STRING = re.compile(rb'[^"\\]*(?:\\.[^"\\]*)*', re.DOTALL)                     # String content until its end quote
+
+
+class ResultsParser:
+    '''Incremental parser of JSON bodies that returns the items of the "results" list as soon as they are complete.
+
+    Only the structure of the body is scanned, and each item is decoded once all its bytes are received, so memory
+    usage is bounded by the size of one item instead of the whole body. The rest of the body, like the total count of
+    paginated responses, is decoded at the end.
+    '''
+
+    results_key = b'results'                                                    # Key of the list to parse by items
+
+    def __init__(self) -> None:
+        '''Results parser constructor.'''
+        self.buffer = bytearray()                                               # Received bytes not discarded yet
+        self.head = bytearray()                                                 # Body until the results list
+        self.position = 0                                                       # Next byte to scan in the buffer
+        self.depth = 0                                                          # Nesting level of the next byte
+        self.is_object = False                                                  # Body is a JSON object
+        self.in_string = False                                                  # Next byte is inside a string
+        self.string_start = 0                                                   # First byte of the current string
+        self.key = b''                                                          # Last string in the body object
+        self.item_start: Optional[int] = None                                   # First byte of the current item
+        self.found = False                                                      # Results list has been found
+
+    def _scan_string(self) -> bool:
+        '''Scan the current string until its end quote.
+
+        Returns:
+            bool: Indicates if the string has finished, or False if more bytes are needed.
+        '''
+        self.position = _STRING.match(self.buffer, self.position).end()         # type: ignore
+        if self.position >= len(self.buffer) or self.buffer[self.position] != ord('"'):   # Continues in next chunk
+            return False
+        self.position += 1
+        self.in_string = False
+        if self.depth == 1 and self.item_start is None:                         # String in the body object
+            self.key = bytes(self.buffer[self.string_start:self.position - 1])
+        return True
+
+    def _add_item(self, end: int, items: List[Any]) -> None:
+        '''Decode the current item of the results list.
+
+        Args:
+            end (int): Index after the last byte of the item.
+            items (List[Any]): Decoded items.
+        '''
+        content = self.buffer[self.item_start or 0:end]
+        if content.strip():                                                     # Empty results list has no items
+            items.append(codec.loads(content))
+
+    def _process_token(self, token: bytes, items: List[Any]) -> None:
+        '''Process structural token found out of strings.
+
+        Args:
+            token (bytes): Structural token.
+            items (List[Any]): Decoded items.
+        '''
+        if token == b'"':
+            self.in_string = True
+            self.string_start = self.position
+        elif token in (b'{', b'['):
+            if self.depth == 0:
+                self.is_object = token == b'{'
+            elif self.depth == 1 and token == b'[' and self.is_object and self.key == self.results_key:
+                self.head += self.buffer[:self.position]                        # Results list starts
+                del self.buffer[:self.position]
+                self.position = self.item_start = 0
+                self.found = True
+            self.depth += 1
+        elif token in (b'}', b']'):
+            self.depth -= 1
+            if self.depth == 1 and self.item_start is not None:                 # Results list ends
+                self._add_item(self.position - 1, items)
+                del self.buffer[:self.position - 1]                             # Keep the rest of the body
+                self.position = 1
+                self.item_start = None
+        elif self.depth == 2 and self.item_start is not None:                   # Comma between results items
+            self._add_item(self.position - 1, items)
+            self.item_start = self.position
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        '''Parse received bytes of the body.
+
+        Args:
+            chunk (bytes): Next bytes of the body.
+
+        Raises:
+            ValueError: Invalid JSON item.
+
+        Returns:
+            List[Any]: Results items completed with these bytes.
+        '''
+        self.buffer += chunk
+        items: List[Any] = []
+        while self.position < len(self.buffer):
+            if self.in_string:
+                if not self._scan_string():
+                    break
+                continue
+            match = _TOKENS.search(self.buffer, self.position)
+            if not match:                                                       # No tokens until the next chunk
+                self.position = len(self.buffer)
+                break
+            self.position = match.end()
+            self._process_token(match.group(), items)
+        if self.item_start:                                                     # Discard decoded items
+            del self.buffer[:self.item_start]
+            self.position -= self.item_start
+            self.item_start = 0
+        return items
+
+    def close(self) -> Any:
+        '''Finish parsing once the whole body has been received.
+
+        Raises:
+            ValueError: Invalid or incomplete JSON body.
+
+        Returns:
+            Any: Decoded body, with an empty results list if it has been parsed by items.
+        '''
+        if self.in_string or self.depth != 0:
+            raise ValueError('Incomplete JSON body')
+        return codec.loads(bytes(self.head + self.buffer))
+
+
+def is_pending(response: Response) -> bool:
+    '''Check if the body of a response hasn't been received yet, because it was requested with stream enabled.
+
+    Args:
+        response (Response): HTTP response.
+
+    Returns:
+        bool: Indicates if the body is pending.
+    '''
+    return response._content is False
+
+
+def _get_data(body: Any) -> Optional[Union[List[Any], Dict[str, Any]]]:
+    '''Get data from decoded body of Rekono API response.
+
+    Args:
+        body (Any): Decoded body.
+
+    Returns:
+        Optional[Union[List[Any], Dict[str, Any]]]: Results if they exist, the whole body or None if there is no data.
+    '''
+    data = body.get('results', body) if isinstance(body, dict) else body        # Get results field if it exists
+    return data if isinstance(data, (list, dict)) else None
+
+
+def _iter_streamed_items(response: Response, parser: ResultsParser, chunk_size: int) -> Iterator[List[Any]]:
+    '''Receive body of a streamed response, decoding the results items as they are complete.
+
+    Compressed bodies are decompressed chunk by chunk, so the parser receives the decoded bytes as they arrive.
+
+    Args:
+        response (Response): HTTP response requested with stream enabled.
+        parser (ResultsParser): Parser of the body.
+        chunk_size (int): Number of bytes to read at a time.
+
+    Raises:
+        RequestError: Connection error while receiving the body.
+
+    Yields:
+        Iterator[List[Any]]: Results items completed with each received chunk.
+    '''
+    decoded_bytes = 0                                                           # Body bytes after decompression
+    try:
+        for chunk in response.iter_content(chunk_size):
+            decoded_bytes += len(chunk)
+            items = parser.feed(chunk)
+            if items:
+                yield items
+    except requests.exceptions.RequestException as error:
+        raise RequestError(error) from error
+    finally:
+        record_streamed(response, decoded_bytes)
+        response.close()                                                        # Release connection
+
+
+def iter_response_data(
+    response: Response,
+    chunk_size: int = 64 * 1024
+) -> Iterator[Union[List[Any], Dict[str, Any]]]:
+    '''Get data from Rekono API response while its body is received, decoding one item of the results at a time.
+
+    Once the body is received, it's replaced by the body without the results items, so that other fields like the
+    total count of paginated responses are still available. Responses whose body has been already received are
+    decoded at once.
+
+    Args:
+        response (Response): Rekono API response, requested with stream enabled.
+        chunk_size (int, optional): Number of bytes to read at a time. Defaults to 64 KiB.
+
+    Raises:
+        RequestError: Connection error while receiving the body.
+        RekonoException: Invalid JSON body after some items have been returned.
+
+    Yields:
+        Iterator[Union[List[Any], Dict[str, Any]]]: Batches of results items, or the body if it hasn't results.
+    '''
+    data: Optional[Union[List[Any], Dict[str, Any]]] = None
+    if not is_pending(response):                                                # Body has been already received
+        try:
+            data = _get_data(codec.loads(response.content or b''))
+        except ValueError:                                                      # Response without JSON body
+            pass
+        if data is not None:
+            yield data
+        return
+    parser = ResultsParser()
+    returned = False                                                            # Some items have been returned
+    try:
+        for items in _iter_streamed_items(response, parser, chunk_size):
+            returned = True
+            yield items
+        body = parser.close()
+    except ValueError:
+        if returned:
+            raise RekonoException('Invalid JSON body in Rekono API response', response)
+        response._content = bytes(parser.head + parser.buffer)                  # Keep invalid body as received
+        return                                                                  # Same as responses without data
+    response._content = codec.dumps(body).encode()                              # Body without results items
+    data = _get_data(body)
+    if not parser.found and data is not None:
+        yield data
@@ -0,0 +1,81 @@
+'''CLI commands to manage the local agent that keeps HTTP connections to Rekono open.'''
+
+import subprocess
+import sys
+import time
+
+import click
+
+from rekono.client.agent import (AgentServer, get_socket_path, is_running,
+                                 is_supported, send_command)
+
+startup_timeout = 5                                                             # Seconds to wait for agent startup
+
+
+@click.group('agent', help='Manage local agent that keeps connections to Rekono open')
+def agent():
+    '''Manage local agent that keeps connections to Rekono open.
+
+    When the agent is running, Rekono CLI commands send their requests through it, so scripts that run many commands
+    don't pay the TCP and TLS handshakes for each one.
+    '''
+    if not is_supported():
+        raise click.ClickException('Agent requires Unix domain sockets, that aren\'t available in this platform')
+
+
+@agent.command('start', help='Start agent in background')
+@click.option('--pool-size', 'pool_size', type=click.IntRange(1), required=False, default=10,
+              help='Maximum number of connections to keep with each host')
+@click.option('--idle-timeout', 'idle_timeout', type=click.IntRange(1), required=False, default=3600,
+              help='Seconds without requests before stopping the agent')
+@click.option('--foreground', 'foreground', is_flag=True, required=False, default=False,
+              help='Run agent in foreground')
+def start(pool_size: int, idle_timeout: int, foreground: bool):
+    '''Start agent in background.
+
+    Args:
+        pool_size (int): Maximum number of connections to keep with each host.
+        idle_timeout (int): Seconds without requests before stopping the agent.
+        foreground (bool): Run agent in foreground.
+    '''
+    path = get_socket_path()
+    if is_running(path):
+        click.echo('Agent is already running')
+        return
+    if foreground:
+        AgentServer(path, pool_maxsize=pool_size, idle_timeout=idle_timeout).run()
+        return
+    subprocess.Popen(                                                           # Detached from this process
+        [
+            sys.executable, '-m', 'rekono.main', 'agent', 'start', '--foreground',
+            '--pool-size', str(pool_size), '--idle-timeout', str(idle_timeout)
+        ],
+        stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True
+    )
+    limit = time.monotonic() + startup_timeout
+    while time.monotonic() < limit:
+        response = send_command('status', path)
+        if response:
+            click.echo(f'Agent started (PID {response["pid"]})')
+            return
+        time.sleep(0.1)
+    raise click.ClickException('Agent hasn\'t started')
+
+
+@agent.command('stop', help='Stop agent')
+def stop():
+    '''Stop agent.'''
+    response = send_command('stop')
+    click.echo(f'Agent stopped (PID {response["pid"]})' if response else 'Agent isn\'t running')
+
+
+@agent.command('status', help='Show agent status')
+def status():
+    '''Show agent status.'''
+    response = send_command('status')
+    if not response:
+        click.echo('Agent isn\'t running')
+        return
+    click.echo(f'Agent is running (PID {response["pid"]})')
+    for url in response['urls']:
+        click.echo(f'Connected to {url}')
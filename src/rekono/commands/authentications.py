@@ -4,6 +4,7 @@ import click
 
 from rekono.client.enums import AuthenticationType
 from rekono.framework.commands.entity import EntityCommand
+from rekono.framework.options import filter_option
 
 
 class AuthenticationsCommand(EntityCommand):
@@ -26,6 +27,9 @@ class AuthenticationsCommand(EntityCommand):
             help='Authentication type'
         )
     ]
+    filter_options = [                                                          # Specific filter options for get
+        filter_option('--target-port', 'target_port', 'Target port ID')
+    ]
 
 
 @click.group('authentications', cls=AuthenticationsCommand, help='Manage target authentications')
@@ -3,15 +3,18 @@
 import click
 
 from rekono.framework.commands.entity import EntityCommand
+from rekono.framework.options import filter_option
 
 
 class ConfigurationsCommand(EntityCommand):
     '''CLI command to manage Configuration entities.'''
 
     commands = ['get']                                                          # CLI commands
+    catalog_ttl = 24 * 60 * 60                                                  # Seconds to cache listings
     help_messages = {                                                           # Help messages for each command
         'get': 'Get all configurations or one if ID is provided',
     }
+    filter_options = [filter_option('--tool', 'tool', 'Tool ID')]               # Specific filter options for get
 
 
 @click.group('configurations', cls=ConfigurationsCommand, help='Get configurations')
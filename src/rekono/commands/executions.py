@@ -2,7 +2,9 @@
 
 import click
 
+from rekono.client.enums import Status
 from rekono.framework.commands.entity import EntityCommand
+from rekono.framework.options import date_range_options, filter_option
 
 
 class ExecutionsCommand(EntityCommand):
@@ -12,6 +14,14 @@ class ExecutionsCommand(EntityCommand):
     help_messages = {                                                           # Help messages for each command
         'get': 'Get all executions or one if ID is provided',
     }
+    filter_options = [                                                          # Specific filter options for get
+        filter_option('--project', 'task__target__project', 'Project ID'),
+        filter_option('--target', 'task__target', 'Target ID'),
+        filter_option('--task', 'task', 'Task ID'),
+        filter_option('--tool', 'tool', 'Tool ID'),
+        filter_option('--status', 'status', 'Execution status', click.Choice([s.value for s in Status])),
+        *date_range_options('start')
+    ]
 
 
 @click.group('executions', cls=ExecutionsCommand, help='Get executions')
@@ -2,7 +2,10 @@
 
 import click
 
+from rekono.client.enums import Severity
 from rekono.framework.commands.entity import EntityCommand
+from rekono.framework.options import (date_range_options, enabled_option,
+                                      filter_option)
 
 
 class FindingsCommand(EntityCommand):
@@ -18,6 +21,22 @@ class FindingsCommand(EntityCommand):
         'enable': 'Enable finding',
         'disable': 'Disable finding',
     }
+    filter_options = [                                                          # Specific filter options for get
+        filter_option('--project', 'project', 'Project ID'),
+        filter_option('--target', 'target', 'Target ID'),
+        filter_option('--task', 'task', 'Task ID'),
+        filter_option('--tool', 'tool', 'Tool ID'),
+        enabled_option,
+        *date_range_options('last_seen')
+    ]
+
+
+class VulnerabilitiesCommand(FindingsCommand):
+    '''CLI command to manage Vulnerability entities.'''
+
+    filter_options = FindingsCommand.filter_options + [                         # Specific filter options for get
+        filter_option('--severity', 'severity', 'Severity', click.Choice([s.value for s in Severity]))
+    ]
 
 
 @click.group('credentials', cls=FindingsCommand, help='Manage credentials')
@@ -50,7 +69,7 @@ def technologies():
     '''Manage technologies.'''
 
 
-@click.group('vulnerabilities', cls=FindingsCommand, help='Manage vulnerabilities')
+@click.group('vulnerabilities', cls=VulnerabilitiesCommand, help='Manage vulnerabilities')
 def vulnerabilities():
     '''Manage vulnerabilities.'''
 
@@ -9,6 +9,7 @@ from rekono.framework.options import tags_option
 class ProcessesCommand(EntityCommand):
     '''CLI command to manage Process entities.'''
 
+    catalog_ttl = 60 * 60                                                       # Seconds to cache listings
     help_messages = {                                                           # Help messages for each command
         'get': 'Get all processes or one if ID is provided',
         'create': 'Create process',
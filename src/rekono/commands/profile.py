@@ -1,10 +1,10 @@
 '''CLI command to manage user profile.'''
 
-import json
 from typing import List
 
 import click
 
+from rekono.client.codec import codec
 from rekono.framework.commands.entity import EntityCommand
 from rekono.framework.options import json_option
 
@@ -82,7 +82,7 @@ class ProfileCommand(EntityCommand):
         '''
         ctx.invoke(
             ProfileCommand.post, endpoint='/api/profile/telegram-token/',
-            url=url, headers=headers, no_verify=no_verify, body=json.dumps({'otp': token}),
+            url=url, headers=headers, no_verify=no_verify, body=codec.dumps({'otp': token}),
             show_headers=show_headers, only_show_status_code=only_show_status_code, quiet=quiet, json_output=None
         )
 
@@ -1,10 +1,10 @@
 '''CLI command to manage Project entities.'''
 
-import json
 from typing import List
 
 import click
 
+from rekono.client.codec import codec
 from rekono.framework.arguments import id_mandatory_argument
 from rekono.framework.commands.entity import EntityCommand
 from rekono.framework.options import tags_option
@@ -67,7 +67,7 @@ class ProjectsCommand(EntityCommand):
         '''
         ctx.invoke(
             ProjectsCommand.post, endpoint=f'/api/projects/{id}/members/',
-            url=url, headers=headers, no_verify=no_verify, body=json.dumps({'user': user}),
+            url=url, headers=headers, no_verify=no_verify, body=codec.dumps({'user': user}),
             show_headers=show_headers, only_show_status_code=only_show_status_code, quiet=quiet
         )
 
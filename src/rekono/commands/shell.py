@@ -0,0 +1,134 @@
+'''CLI command to run Rekono CLI commands in an interactive shell.'''
+
+import shlex
+from typing import List, Optional
+
+import click
+
+from rekono.framework.commands.command import RekonoCliCommand
+
+try:
+    import readline                                                             # Not available on all platforms
+except ImportError:                                                             # pragma: no cover
+    readline = None                                                             # type: ignore
+
+exit_commands = ['exit', 'quit']                                                # Commands to close the shell
+
+
+def complete(group: click.MultiCommand, line: str, text: str) -> List[str]:
+    '''Get completions for the word that is being written in the shell.
+
+    Args:
+        group (click.MultiCommand): Main Rekono CLI group.
+        line (str): Whole line written until now.
+        text (str): Word that is being written.
+
+    Returns:
+        List[str]: Completion candidates.
+    '''
+    try:
+        arguments = shlex.split(line[:len(line) - len(text)])                   # Previous words
+    except ValueError:
+        return []
+    command: click.Command = group
+    ctx = click.Context(group)
+    for argument in arguments:
+        if not isinstance(command, click.MultiCommand):
+            break
+        subcommand = command.get_command(ctx, argument)
+        if subcommand is None:
+            return []
+        command = subcommand
+    if isinstance(command, click.MultiCommand):                                 # Complete command names
+        candidates = command.list_commands(ctx) + (exit_commands if command is group else [])
+    else:                                                                       # Complete option names
+        candidates = [
+            option for param in command.params for option in [*param.opts, *param.secondary_opts]
+            if option.startswith('--')
+        ]
+    return [f'{candidate} ' for candidate in candidates if candidate.startswith(text)]
+
+
+def _configure_completion(group: click.MultiCommand) -> None:
+    '''Configure tab completion of the shell, if readline is available.
+
+    Args:
+        group (click.MultiCommand): Main Rekono CLI group.
+    '''
+    if readline is None:
+        return
+    candidates: List[str] = []
+
+    def completer(text: str, state: int) -> Optional[str]:
+        if state == 0:                                                          # First call for this word
+            candidates[:] = complete(group, readline.get_line_buffer()[:readline.get_endidx()], text)
+        return candidates[state] if state < len(candidates) else None
+
+    readline.set_completer_delims(' \t\n')
+    readline.set_completer(completer)
+    readline.parse_and_bind('tab: complete')
+
+
+def _run(group: click.MultiCommand, arguments: List[str]) -> None:
+    '''Run Rekono CLI command without exiting the shell.
+
+    Args:
+        group (click.MultiCommand): Main Rekono CLI group.
+        arguments (List[str]): Command arguments.
+    '''
+    try:
+        group.main(arguments, prog_name='rekono', standalone_mode=False)
+    except click.exceptions.Abort:
+        click.echo(click.style('Aborted!', fg='red'), err=True, color=True)
+    except click.ClickException as error:
+        error.show()
+    except SystemExit:                                                          # Command has finished with error
+        pass
+
+
+def _read_arguments() -> Optional[List[str]]:
+    '''Read command arguments from the shell.
+
+    Returns:
+        Optional[List[str]]: Command arguments, or None if the input has finished.
+    '''
+    try:
+        line = input('rekono> ')
+    except KeyboardInterrupt:                                                   # Discard current line
+        click.echo()
+        return []
+    except EOFError:                                                            # End of input
+        click.echo()
+        return None
+    try:
+        return shlex.split(line)
+    except ValueError as error:
+        click.echo(click.style(f'Invalid command: {error}', fg='red'), err=True, color=True)
+        return []
+
+
+@click.command('shell', help='Run commands in an interactive shell that reuses the same session')
+def shell():
+    '''Run commands in an interactive shell that reuses the same session.
+
+    Commands have the same syntax than in Rekono CLI, and Rekono clients are reused between them, so the API token is
+    only requested once and HTTP connections stay open.
+    '''
+    from rekono.main import rekono                                              # Main group imports this command
+    _configure_completion(rekono)
+    RekonoCliCommand.clients = {}                                               # Reuse clients between commands
+    RekonoCliCommand.tokens = {}                                                # Reuse tokens between commands
+    try:
+        while True:
+            arguments = _read_arguments()
+            if arguments is None or (arguments and arguments[0] in exit_commands):
+                break
+            if not arguments:
+                continue
+            if arguments[0] == 'shell':
+                click.echo(click.style('Shell is already running', fg='red'), err=True, color=True)
+                continue
+            _run(rekono, ['--help'] if arguments[0] == 'help' else arguments)
+    finally:
+        RekonoCliCommand.clients = None
+        RekonoCliCommand.tokens = None
@@ -3,11 +3,14 @@
 import click
 
 from rekono.framework.commands.entity import EntityCommand
+from rekono.framework.options import filter_option
 
 
 class StepsCommand(EntityCommand):
     '''CLI command to manage Step entities.'''
 
+    catalog_ttl = 60 * 60                                                       # Seconds to cache listings
+    related_catalogs = ['processes']                                            # Processes embed their steps
     help_messages = {                                                           # Help messages for each command
         'get': 'Get all steps or one if ID is provided',
         'create': 'Create step',
@@ -20,6 +23,10 @@ class StepsCommand(EntityCommand):
         click.option('-c', '--configuration', 'configuration_id', required=True, type=int, help='Configuration ID'),
         click.option('--priority', 'priority', required=False, default=1, type=int, help='Step priority within process')
     ]
+    filter_options = [                                                          # Specific filter options for get
+        filter_option('--process', 'process', 'Process ID'),
+        filter_option('--tool', 'tool', 'Tool ID')
+    ]
 
 
 @click.group('steps', cls=StepsCommand, help='Manage steps')
@@ -3,6 +3,7 @@
 import click
 
 from rekono.framework.commands.entity import EntityCommand
+from rekono.framework.options import filter_option
 
 
 class TargetPortsCommand(EntityCommand):
@@ -18,6 +19,10 @@ class TargetPortsCommand(EntityCommand):
         click.option('-t', '--target', 'target', required=True, type=int, help='Target ID'),
         click.option('-p', '--port', 'port', required=True, type=int, help='Port number')
     ]
+    filter_options = [                                                          # Specific filter options for get
+        filter_option('--project', 'target__project', 'Project ID'),
+        filter_option('--target', 'target', 'Target ID')
+    ]
 
 
 @click.group('target-ports', cls=TargetPortsCommand, help='Manage target ports')
@@ -3,6 +3,7 @@
 import click
 
 from rekono.framework.commands.entity import EntityCommand
+from rekono.framework.options import filter_option
 
 
 class TargetsCommand(EntityCommand):
@@ -23,6 +24,7 @@ class TargetsCommand(EntityCommand):
             help='Engagement ID in Defect-Dojo'
         )
     ]
+    filter_options = [filter_option('--project', 'project', 'Project ID')]      # Specific filter options for get
 
 
 @click.group('targets', cls=TargetsCommand, help='Manage targets')
@@ -1,13 +1,14 @@
 '''CLI command to manage Task entities.'''
 
-import json
 from typing import Any, List
 
 import click
 
-from rekono.client.enums import IntensityRank, TimeUnit
+from rekono.client.codec import codec
+from rekono.client.enums import IntensityRank, Status, TimeUnit
 from rekono.framework.commands.entity import EntityCommand
-from rekono.framework.options import json_option
+from rekono.framework.options import (date_range_options, filter_option,
+                                      json_option)
 
 
 class TasksCommand(EntityCommand):
@@ -64,6 +65,14 @@ class TasksCommand(EntityCommand):
         ),
         click.option('-w', '--wordlist', 'wordlists', multiple=True, required=False, type=int, help='Wordlist ID')
     ]
+    filter_options = [                                                          # Specific filter options for get
+        filter_option('--project', 'target__project', 'Project ID'),
+        filter_option('--target', 'target', 'Target ID'),
+        filter_option('--process', 'process', 'Process ID'),
+        filter_option('--tool', 'tool', 'Tool ID'),
+        filter_option('--status', 'status', 'Task status', click.Choice([s.value for s in Status])),
+        *date_range_options('start')
+    ]
 
     @staticmethod
     @click.command
@@ -100,7 +109,7 @@ class TasksCommand(EntityCommand):
         kwargs['scheduled_at'] = kwargs['scheduled_at'].astimezone().isoformat() if kwargs.get('scheduled_at') else None
         ctx.invoke(
             TasksCommand.post, endpoint='/api/tasks/',
-            url=url, headers=headers, no_verify=no_verify, body=json.dumps(kwargs),
+            url=url, headers=headers, no_verify=no_verify, body=codec.dumps(kwargs),
             show_headers=show_headers, only_show_status_code=only_show_status_code,
             quiet=quiet, json_output=json_output
         )
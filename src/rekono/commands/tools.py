@@ -9,6 +9,7 @@ class ToolsCommand(EntityCommand):
     '''CLI command to manage Tool entities.'''
 
     commands = ['get']                                                          # CLI commands
+    catalog_ttl = 24 * 60 * 60                                                  # Seconds to cache listings
     help_messages = {                                                           # Help messages for each command
         'get': 'Get all tools or one if ID is provided',
     }
@@ -1,10 +1,10 @@
 '''CLI command to manage User entities.'''
 
-import json
 from typing import List
 
 import click
 
+from rekono.client.codec import codec
 from rekono.client.enums import UserRole
 from rekono.framework.arguments import id_mandatory_argument
 from rekono.framework.commands.entity import EntityCommand
@@ -69,7 +69,7 @@ class UsersCommand(EntityCommand):
         '''
         ctx.invoke(
             UsersCommand.put, endpoint=f'/api/users/{id}/role/',
-            url=url, headers=headers, no_verify=no_verify, body=json.dumps({'role': role}),
+            url=url, headers=headers, no_verify=no_verify, body=codec.dumps({'role': role}),
             show_headers=show_headers, only_show_status_code=only_show_status_code, quiet=quiet, json_output=json_output
         )
 
@@ -107,7 +107,7 @@ class UsersCommand(EntityCommand):
         '''
         ctx.invoke(
             UsersCommand.post, endpoint='/api/users/invite/',
-            url=url, headers=headers, no_verify=no_verify, body=json.dumps({'email': email, 'role': role}),
+            url=url, headers=headers, no_verify=no_verify, body=codec.dumps({'email': email, 'role': role}),
             show_headers=show_headers, only_show_status_code=only_show_status_code, quiet=quiet, json_output=json_output
         )
 
@@ -1,18 +1,22 @@
 '''CLI command to manage Wordlist entities.'''
 
-import json
-from typing import Any, List
+from typing import Any, Callable, Dict, List
 
 import click
+from requests.models import Response
 
+from rekono.client.cache import UploadIndex, get_file_hash
+from rekono.client.codec import codec
 from rekono.client.enums import WordlistType
 from rekono.framework.commands.entity import EntityCommand
-from rekono.framework.options import json_option
+from rekono.framework.options import filter_option, json_option
+from rekono.framework.progress import UploadProgress
 
 
 class WordlistsCommand(EntityCommand):
     '''CLI command to manage Wordlist entities.'''
 
+    endpoint = '/api/wordlists/'                                                # Wordlists endpoint
     help_messages = {                                                           # Help messages for each command
         'get': 'Get all wordlists or one if ID is provided',
         'create': 'Create wordlist',
@@ -28,11 +32,19 @@ class WordlistsCommand(EntityCommand):
             help='Wordlist name'
         )
     ]
+    filter_options = [                                                          # Specific filter options for get
+        filter_option('--type', 'type', 'Wordlist type', click.Choice([t.value for t in WordlistType]))
+    ]
 
     @staticmethod
     @click.command
     @click.pass_context
     @click.option('-f', '--file', 'filepath', required=True, type=click.Path(exists=True), help='Wordlists file')
+    @click.option(
+        '--skip-unchanged', 'skip_unchanged',
+        is_flag=True, default=False,
+        help='Don\'t upload the file again if it has been already uploaded with the same content'
+    )
     @json_option
     def post_entity(
         ctx: click.Context,
@@ -43,6 +55,7 @@ class WordlistsCommand(EntityCommand):
         only_show_status_code: bool,
         quiet: bool,
         json_output: str,
+        skip_unchanged: bool,
         **kwargs: Any
     ) -> None:
         '''POST request to create specific entity via Rekono API.
@@ -57,15 +70,63 @@ class WordlistsCommand(EntityCommand):
             only_show_status_code (bool): Just display HTTP response status code.
             quiet (bool): Don't display anything from response.
             json_output (str): Filepath to the JSON file where content should be saved.
+            skip_unchanged (bool): Compare the file content hash with the last upload of the same wordlist.
             kwargs (Any): Variable fields that will be sent as body
         '''
         filepath = kwargs.pop('filepath')
-        ctx.invoke(
-            WordlistsCommand.post, endpoint='/api/wordlists/',
-            url=url, headers=headers, no_verify=no_verify, body=json.dumps(kwargs),
-            show_headers=show_headers, only_show_status_code=only_show_status_code,
-            quiet=quiet, json_output=json_output, filepath=filepath
+        options = {
+            'url': url, 'headers': headers, 'no_verify': no_verify, 'show_headers': show_headers,
+            'only_show_status_code': only_show_status_code, 'quiet': quiet, 'json_output': json_output
+        }
+        if skip_unchanged:
+            WordlistsCommand._upload_changed(filepath, kwargs, options)
+        else:
+            ctx.invoke(
+                WordlistsCommand.post, endpoint=WordlistsCommand.endpoint,
+                body=codec.dumps(kwargs), filepath=filepath, **options
+            )
+
+    @staticmethod
+    def _upload_changed(filepath: str, fields: Dict[str, Any], options: Dict[str, Any]) -> None:
+        '''Upload wordlist file only if its content has changed since its last upload to the same Rekono instance.
+
+        Content hashes of the uploaded files are saved in a local index with the wordlist fields. Wordlists whose file
+        and fields haven't changed aren't uploaded again if they still exist, changed ones are updated and the rest are
+        created.
+
+        Args:
+            filepath (str): Filepath to upload as wordlist file.
+            fields (Dict[str, Any]): Wordlist fields that will be sent as body.
+            options (Dict[str, Any]): Connection and output options.
+        '''
+        endpoint = WordlistsCommand.endpoint
+        file_hash = get_file_hash(filepath)
+        index = UploadIndex()
+        client = WordlistsCommand._rekono_factory(options['url'], options['no_verify'], options['headers'])
+        entry = index.get(client.url, endpoint, fields['name'])
+        current = client.get(f'{endpoint}{entry["id"]}/') if entry else None
+        if entry and isinstance(current, Response) and current.status_code == 200:    # Wordlist still exists
+            if entry['hash'] == file_hash and entry.get('fields') == fields:    # Same upload than the last one
+                if not options['quiet']:
+                    click.echo(f'Wordlist {fields["name"]} hasn\'t changed since its last upload', err=True)
+                WordlistsCommand._output_responses(
+                    [current], options['show_headers'], options['only_show_status_code'],
+                    options['quiet'], options['json_output']
+                )
+                return
+            upload: Callable[..., Response] = client.put                        # Update wordlist with new content
+            endpoint = f'{endpoint}{entry["id"]}/'
+        else:
+            upload = client.post
+        progress = UploadProgress() if not options['quiet'] and UploadProgress.is_enabled() else None
+        response = upload(endpoint, codec.dumps(fields), filepath, progress)
+        WordlistsCommand._output_responses(
+            [response], options['show_headers'], options['only_show_status_code'],
+            options['quiet'], options['json_output']
         )
+        data = WordlistsCommand._get_data_from_response(response) if response.status_code in [200, 201] else None
+        if isinstance(data, dict) and 'id' in data:                             # Save hash of the uploaded content
+            index.save(client.url, WordlistsCommand.endpoint, fields['name'], data['id'], file_hash, fields)
 
 
 @click.group('wordlists', cls=WordlistsCommand, help='Manage wordlists')
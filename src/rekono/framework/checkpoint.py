@@ -0,0 +1,106 @@
+'''Checkpoints of paginated exports, to resume them where they stopped.'''
+
+import json
+import os
+import tempfile
+from typing import Any, Dict, Optional
+
+import click
+
+
+class ExportCheckpoint:
+    '''Checkpoint of a paginated export, saved after each page written in the output file.
+
+    It records the export request, so that it's only resumed with the same endpoint, parameters and page size, and
+    the number of items and bytes written, so that partially written pages are discarded from the output file.
+    '''
+
+    version = 1                                                                 # Checkpoint format version
+
+    def __init__(
+        self,
+        path: str,
+        endpoint: str,
+        parameters: Dict[str, Any],
+        page_size: int,
+        output: str,
+        output_format: str,
+        compact: bool = False
+    ) -> None:
+        '''Export checkpoint constructor.
+
+        Args:
+            path (str): Checkpoint filepath.
+            endpoint (str): Exported endpoint.
+            parameters (Dict[str, Any]): Query parameters, including filters and ordering.
+            page_size (int): Page size.
+            output (str): Filepath where items are written.
+            output_format (str): Format of the output file.
+            compact (bool, optional): Output is written without indentation. Defaults to False.
+        '''
+        self.path = path
+        self.export: Dict[str, Any] = {
+            'version': self.version,
+            'endpoint': endpoint,
+            'parameters': parameters,
+            'page_size': page_size,
+            'output': os.path.abspath(output),
+            'output_format': output_format,
+            'compact': compact
+        }
+        self.items = 0                                                          # Items written in completed pages
+        self.bytes = 0                                                          # Output size after completed pages
+        self.count: Optional[int] = None                                        # Total items reported by the API
+
+    def load(self) -> bool:
+        '''Load checkpoint from its file, if it exists.
+
+        Raises:
+            click.ClickException: Checkpoint is invalid or belongs to a different export.
+
+        Returns:
+            bool: Indicates if the export has to be resumed.
+        '''
+        if not os.path.isfile(self.path):
+            return False
+        try:
+            with open(self.path, 'r', encoding='utf-8') as file:
+                content = json.load(file)
+            items, size = int(content['items']), int(content['bytes'])
+            count = int(content['count']) if content.get('count') is not None else None
+        except (OSError, ValueError, KeyError, TypeError):
+            raise click.ClickException(f'Checkpoint {self.path} is invalid')
+        if {key: content.get(key) for key in self.export} != self.export:
+            raise click.ClickException(f'Checkpoint {self.path} belongs to a different export')
+        if not os.path.isfile(self.export['output']) or os.path.getsize(self.export['output']) < size:
+            raise click.ClickException(f'Output file {self.export["output"]} doesn\'t match the checkpoint')
+        self.items, self.bytes, self.count = items, size, count
+        return True
+
+    def save(self, items: int, size: int, count: Optional[int] = None) -> None:
+        '''Save checkpoint after writing a page, replacing its file atomically.
+
+        Args:
+            items (int): Number of items written in the output file.
+            size (int): Size of the output file.
+            count (Optional[int], optional): Total number of items to export, if known. Defaults to None.
+        '''
+        self.items, self.bytes, self.count = items, size, count
+        directory = os.path.dirname(os.path.abspath(self.path))
+        descriptor, temporal_path = tempfile.mkstemp(dir=directory)
+        with os.fdopen(descriptor, 'w', encoding='utf-8') as file:
+            json.dump({**self.export, 'items': items, 'bytes': size, 'count': count}, file)
+        os.replace(temporal_path, self.path)
+
+    def is_finished(self) -> bool:
+        '''Check if all items were written before the export stopped, so that no more pages have to be requested.
+
+        Returns:
+            bool: Indicates if the total number of items is known and all of them have been written.
+        '''
+        return self.count is not None and self.items >= self.count
+
+    def remove(self) -> None:
+        '''Remove checkpoint once the export has finished.'''
+        if os.path.isfile(self.path):
+            os.remove(self.path)
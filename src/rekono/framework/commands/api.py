@@ -1,16 +1,38 @@
 '''Base Rekono CLI command to make API requests.'''
 
-from typing import List
+import os
+from typing import (Any, Dict, Iterable, Iterator, List, Optional, Union,
+                    cast)
 
 import click
+from requests.models import Response
 
+from rekono.client.api import Rekono
+from rekono.client.async_api import AsyncRekono
+from rekono.client.codec import codec
+from rekono.client.pagination import PageSize
+from rekono.client.stream import iter_response_data
 from rekono.framework.arguments import endpoint_argument
+from rekono.framework.checkpoint import ExportCheckpoint
 from rekono.framework.commands.command import RekonoCliCommand
-from rekono.framework.options import (all_pages_option, body_option,
-                                      file_option, headers_option, json_option,
-                                      no_verify_option, parameters_option,
-                                      quiet_option, show_headers_option,
-                                      show_status_code_option, url_option)
+from rekono.framework.options import (all_pages_option, asyncio_option,
+                                      backoff_factor_option, body_option,
+                                      cache_option, compact_option,
+                                      compression_option, concurrency_option,
+                                      connect_timeout_option, count_option,
+                                      deadline_option, file_option,
+                                      headers_option, json_option,
+                                      limit_option, metrics_option,
+                                      no_verify_option, offset_option,
+                                      output_format_option, page_size_option,
+                                      parameters_option, quiet_option,
+                                      read_timeout_option, resume_option,
+                                      retries_option, shards_option,
+                                      show_headers_option,
+                                      show_status_code_option, stream_option,
+                                      url_option)
+from rekono.framework.output import is_compressed, writers
+from rekono.framework.progress import UploadProgress
 
 
 class ApiCommand(RekonoCliCommand):
@@ -29,7 +51,10 @@ class ApiCommand(RekonoCliCommand):
         'put': 'PUT request to Rekono API',
         'delete': 'DELETE request to Rekono API'
     }
-    api_options = [url_option, headers_option, no_verify_option]                # API options for all commands
+    api_options = [                                                             # API options for all commands
+        url_option, headers_option, no_verify_option, connect_timeout_option, read_timeout_option, deadline_option,
+        retries_option, backoff_factor_option, compression_option, metrics_option
+    ]
     display_options = [show_headers_option, show_status_code_option, quiet_option]  # Display options for all commands
 
     @staticmethod
@@ -37,7 +62,19 @@ class ApiCommand(RekonoCliCommand):
     @endpoint_argument
     @parameters_option
     @all_pages_option
+    @concurrency_option
+    @page_size_option
+    @limit_option
+    @offset_option
+    @resume_option
+    @shards_option
+    @stream_option
+    @asyncio_option
+    @cache_option
+    @count_option
     @json_option
+    @output_format_option
+    @compact_option
     def get(
         endpoint: str,
         url: str,
@@ -45,10 +82,21 @@ class ApiCommand(RekonoCliCommand):
         no_verify: bool,
         parameters: List[str],
         pagination: bool,
+        concurrency: int,
+        page_size: Optional[PageSize],
+        limit: Optional[int],
+        offset: int,
+        resume: Optional[str],
+        shards: Union[int, List[Dict[str, str]], None],
+        stream: bool,
+        cache: Optional[bool],
+        count: bool,
         show_headers: bool,
         only_show_status_code: bool,
         quiet: bool,
-        json_output: str
+        json_output: str,
+        output_format: str,
+        compact: bool
     ):
         '''GET request to Rekono API.
 
@@ -59,20 +107,172 @@ class ApiCommand(RekonoCliCommand):
             parameters (List[str]): HTTP query parameters to send in key=value format.
             no_verify (bool): Disable TLS validation.
             pagination (bool): Enable iteration over all API pages.
+            concurrency (int): Number of API pages to retrieve at the same time.
+            page_size (Optional[PageSize]): Page size to use, fixed or adaptive.
+            limit (Optional[int]): Maximum number of items to retrieve. It enables pagination.
+            offset (int): Number of items to skip. It enables pagination.
+            resume (Optional[str]): Checkpoint file to resume the export of all pages to the JSON file.
+            shards (Union[int, List[Dict[str, str]], None]): Number of ID ranges or query parameters of each shard.
+            stream (bool): Decode items while API pages are received.
+            cache (Optional[bool]): Use on-disk HTTP cache. It's disabled by default.
+            count (bool): Only display the number of items, retrieved with a single request.
             show_headers (bool): Display HTTP response headers.
             only_show_status_code (bool): Just display HTTP response status code.
             quiet (bool): Don't display anything from response.
             json_output (str): Filepath to the JSON file where content should be saved.
+            output_format (str): Format to display and save response data.
+            compact (bool): Display and save JSON without indentation nor escaped characters.
         '''
-        client = ApiCommand._rekono_factory(url, no_verify, headers)
-        response_or_responses = client.get(
-            ApiCommand._get_endpoint(endpoint),
-            parameters=ApiCommand._parse_key_value_params(parameters),
-            pagination=pagination
+        endpoint = ApiCommand._get_endpoint(endpoint)
+        query_parameters = ApiCommand._parse_key_value_params(parameters)
+        ranged = limit is not None or offset > 0                                # Only a range of items is needed
+        use_asyncio = ApiCommand._use_asyncio(pagination and not (ranged or resume or shards or stream or count))
+        if count:                                                               # Only number of items is needed
+            client = ApiCommand._rekono_factory(url, no_verify, headers, cache=bool(cache))
+            ApiCommand._output_count(client.count(endpoint, query_parameters))
+            return
+        if shards and (ranged or resume):
+            raise click.UsageError('Sharded exports can\'t be limited, skip items nor be resumed')
+        if resume:                                                              # Resumable export to JSON file
+            if not json_output or ranged or is_compressed(json_output):
+                raise click.UsageError(
+                    'Resumable exports require an uncompressed --json file and can\'t be limited nor skip items'
+                )
+            client = ApiCommand._rekono_factory(url, no_verify, headers, cache=bool(cache))
+            ApiCommand._export(
+                client, endpoint, query_parameters, page_size, json_output, output_format, resume, stream, compact
+            )
+            return
+        responses: Iterable[Response]
+        if shards:                                                              # Shards retrieved at the same time
+            workers = max(concurrency, shards if isinstance(shards, int) else len(shards), 10)
+            client = ApiCommand._rekono_factory(url, no_verify, headers, workers, bool(cache))
+            responses = ApiCommand._get_shards(client, endpoint, query_parameters, shards, concurrency, page_size)
+        elif use_asyncio:                                                       # Pages retrieved with asyncio
+            async_client = ApiCommand._async_rekono_factory(url, no_verify, headers, concurrency, bool(cache))
+            responses = async_client.iter_pages_blocking(endpoint, query_parameters, concurrency, page_size)
+        elif pagination or ranged:                                              # Retrieve pages as they are displayed
+            client = ApiCommand._rekono_factory(url, no_verify, headers, max(concurrency, 10), bool(cache))
+            responses = client.iter_pages(endpoint, query_parameters, concurrency, page_size, limit, offset, stream)
+        else:
+            client = ApiCommand._rekono_factory(url, no_verify, headers, cache=bool(cache))
+            responses = [cast(Response, client.get(endpoint, parameters=query_parameters, stream=stream))]
+        ApiCommand._output_responses(
+            responses, show_headers, only_show_status_code, quiet, json_output, output_format, compact
         )
-        responses = response_or_responses if isinstance(response_or_responses, list) else [response_or_responses]
-        ApiCommand._display_responses(responses, show_headers, only_show_status_code, quiet)
-        ApiCommand._save_output(responses, json_output)
+
+    @classmethod
+    def _use_asyncio(cls, supported: bool) -> bool:
+        '''Check if pages have to be retrieved with the asynchronous client, because the user enabled it.
+
+        Args:
+            supported (bool): Indicates if the request can be done with the asynchronous client.
+
+        Raises:
+            click.UsageError: Asynchronous client is enabled, but it can't be used.
+
+        Returns:
+            bool: Indicates if the asynchronous client has to be used.
+        '''
+        ctx = click.get_current_context(silent=True)
+        if not ctx or not ctx.meta.get(cls.asyncio_meta):
+            return False
+        if not supported:
+            raise click.UsageError('--asyncio only retrieves whole listings, without ranges, shards, resume nor stream')
+        if not AsyncRekono.is_available():
+            raise click.UsageError('--asyncio requires aiohttp: pip3 install rekono-cli[async]')
+        return True
+
+    @staticmethod
+    def _get_shards(
+        client: Rekono,
+        endpoint: str,
+        parameters: Dict[str, Any],
+        shards: Union[int, List[Dict[str, str]]],
+        concurrency: int,
+        page_size: Optional[PageSize]
+    ) -> Iterator[Response]:
+        '''GET requests to retrieve independent shards of a listing at the same time.
+
+        Args:
+            client (Rekono): Rekono API client.
+            endpoint (str): Endpoint to call.
+            parameters (Dict[str, Any]): Query parameters to send.
+            shards (Union[int, List[Dict[str, str]]]): Number of ID ranges or query parameters of each shard.
+            concurrency (int): Number of shards to retrieve at the same time, or 1 to retrieve all of them.
+            page_size (Optional[PageSize]): Page size to use. Adaptive page sizes start from their initial size.
+
+        Returns:
+            Iterator[Response]: HTTP responses of all shards, merged as they are retrieved.
+        '''
+        if isinstance(shards, int):                                             # Split listing by entity IDs
+            shards = cast(List[Dict[str, str]], client.get_id_shards(endpoint, parameters, shards))
+        return client.iter_shards(
+            endpoint, cast(List[Dict[str, Any]], shards), parameters, concurrency if concurrency > 1 else None,
+            page_size
+        )
+
+    @staticmethod
+    def _export(
+        client: Rekono,
+        endpoint: str,
+        parameters: Dict[str, Any],
+        page_size: Optional[PageSize],
+        filepath: str,
+        output_format: str,
+        checkpoint_path: str,
+        stream: bool = False,
+        compact: bool = False
+    ) -> None:
+        '''Export all API pages to a file, saving a checkpoint after each page to resume the export where it stopped.
+
+        Items are sorted by ID unless other ordering is requested, so that pages are stable between executions. The
+        page size is fixed, because the next page is calculated from the number of items already written.
+
+        Args:
+            client (Rekono): Rekono API client.
+            endpoint (str): Endpoint to call.
+            parameters (Dict[str, Any]): Query parameters to send.
+            page_size (Optional[PageSize]): Page size to use. Adaptive page sizes start from their initial size.
+            filepath (str): Filepath where items are written.
+            output_format (str): Format of the output file.
+            checkpoint_path (str): Checkpoint filepath.
+            stream (bool, optional): Decode items while API pages are received. Defaults to False.
+            compact (bool, optional): Write JSON without indentation nor escaped characters. Defaults to False.
+        '''
+        if 'o' not in parameters and 'ordering' not in parameters:              # Stable ordering between executions
+            parameters = {**parameters, 'o': 'id'}
+        size = page_size.size if page_size else client.page_size
+        checkpoint = ExportCheckpoint(checkpoint_path, endpoint, parameters, size, filepath, output_format, compact)
+        resumed = checkpoint.load()
+        if resumed:
+            os.truncate(filepath, checkpoint.bytes)                             # Discard partially written page
+            click.echo(f'Resuming export after {checkpoint.items} items', err=True)
+        with open(filepath, 'a' if resumed else 'w', encoding='utf-8') as file:
+            writer = writers[output_format](file.write, compact=compact)
+            writer.resume(checkpoint.items)
+            pages: Iterable[Response] = [] if checkpoint.is_finished() else client.iter_pages(   # Pages left
+                endpoint, parameters, page_size=size, offset=checkpoint.items, stream=stream
+            )
+            for response in pages:
+                if response.status_code != 200:                                # Errors aren't written as items
+                    raise click.ClickException(
+                        f'Export stopped after {checkpoint.items} items: HTTP {response.status_code} response'
+                    )
+                items = 0                                                       # Items written from this page
+                for data in iter_response_data(response):
+                    writer.write(data)
+                    items += len(data) if isinstance(data, list) else 1
+                file.flush()
+                body = codec.loads(response.content or b'')                     # Total count, without results items
+                count = body.get('count') if isinstance(body, dict) else None
+                checkpoint.save(checkpoint.items + items, os.fstat(file.fileno()).st_size, count)
+            if not checkpoint.is_finished() and checkpoint.count is not None:   # Pages ended before the last item
+                raise click.ClickException(
+                    f'Export stopped after {checkpoint.items} of {checkpoint.count} items: resume it with --resume'
+                )
+            writer.close()
+        checkpoint.remove()
 
     @staticmethod
     @click.command
@@ -107,14 +307,15 @@ class ApiCommand(RekonoCliCommand):
             json_output (str): Filepath to the JSON file where content should be saved.
         '''
         client = ApiCommand._rekono_factory(url, no_verify, headers)
-        response = client.post(ApiCommand._get_endpoint(endpoint), ApiCommand._get_body(body), filepath)
-        ApiCommand._display_responses([response], show_headers, only_show_status_code, quiet)
-        ApiCommand._save_output([response], json_output)
+        progress = UploadProgress() if filepath and not quiet and UploadProgress.is_enabled() else None
+        response = client.post(ApiCommand._get_endpoint(endpoint), ApiCommand._get_body(body), filepath, progress)
+        ApiCommand._output_responses([response], show_headers, only_show_status_code, quiet, json_output)
 
     @staticmethod
     @click.command
     @endpoint_argument
     @body_option
+    @file_option
     @json_option
     def put(
         endpoint: str,
@@ -122,6 +323,7 @@ class ApiCommand(RekonoCliCommand):
         headers: List[str],
         no_verify: bool,
         body: str,
+        filepath: Optional[str],
         show_headers: bool,
         only_show_status_code: bool,
         quiet: bool,
@@ -135,15 +337,16 @@ class ApiCommand(RekonoCliCommand):
             headers (List[str]): HTTP headers to send in key=value format.
             no_verify (bool): Disable TLS validation.
             body (str): HTTP body to send in JSON format.
+            filepath (Optional[str]): File to upload.
             show_headers (bool): Display HTTP response headers.
             only_show_status_code (bool): Just display HTTP response status code.
             quiet (bool): Don't display anything from response.
             json_output (str): Filepath to the JSON file where content should be saved.
         '''
         client = ApiCommand._rekono_factory(url, no_verify, headers)
-        response = client.put(ApiCommand._get_endpoint(endpoint), ApiCommand._get_body(body))
-        ApiCommand._display_responses([response], show_headers, only_show_status_code, quiet)
-        ApiCommand._save_output([response], json_output)
+        progress = UploadProgress() if filepath and not quiet and UploadProgress.is_enabled() else None
+        response = client.put(ApiCommand._get_endpoint(endpoint), ApiCommand._get_body(body), filepath, progress)
+        ApiCommand._output_responses([response], show_headers, only_show_status_code, quiet, json_output)
 
     @staticmethod
     @click.command
@@ -170,4 +373,4 @@ class ApiCommand(RekonoCliCommand):
         '''
         client = ApiCommand._rekono_factory(url, no_verify, headers)
         response = client.delete(ApiCommand._get_endpoint(endpoint))
-        ApiCommand._display_responses([response], show_headers, only_show_status_code, quiet)
+        ApiCommand._output_responses([response], show_headers, only_show_status_code, quiet)
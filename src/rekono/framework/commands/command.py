@@ -1,16 +1,27 @@
 '''Base features for Rekono CLI command.'''
 
-import json
+import copy
 import os
 import sys
-from typing import Any, Callable, Dict, List, Optional, Union, cast
+from contextlib import ExitStack
+from typing import (Any, Callable, Dict, Iterable, List, Optional, Tuple,
+                    Type, Union, cast)
 from urllib.parse import urlparse
 
 import click
-import requests
 from requests.models import Response
 
+from rekono.client.agent import get_socket_path, is_running
 from rekono.client.api import Rekono
+from rekono.client.async_api import AsyncRekono
+from rekono.client.cache import HttpCache
+from rekono.client.codec import codec
+from rekono.client.metrics import TransferMetrics
+from rekono.client.stream import is_pending, iter_response_data
+from rekono.framework.output import OutputFormat, open_output, writers
+
+
+command_tables: Dict[Type['RekonoCliCommand'], Dict[str, click.Command]] = {}  # Built commands by class
 
 
 class RekonoCliCommand(click.MultiCommand):
@@ -19,6 +30,18 @@ class RekonoCliCommand(click.MultiCommand):
     # Environment variables
     api_token_env = 'REKONO_TOKEN'                                              # Environment variable to set API token
     backend_url_env = 'REKONO_URL'                                              # Environment variable to set backend
+    connect_timeout_env = 'REKONO_CONNECT_TIMEOUT'                              # Environment variable to set timeout
+    read_timeout_env = 'REKONO_READ_TIMEOUT'                                    # Environment variable to set timeout
+    deadline_env = 'REKONO_DEADLINE'                                            # Environment variable to set deadline
+    retries_env = 'REKONO_RETRIES'                                              # Environment variable to set retries
+    backoff_factor_env = 'REKONO_BACKOFF_FACTOR'                                # Environment variable to set backoff
+    compression_env = 'REKONO_COMPRESSION'                                      # Environment variable to set encoding
+    cache_env = 'REKONO_CACHE'                                                  # Environment variable to use cache
+    request_policy_meta = 'rekono.request_policy'                               # Context key for request policy
+    metrics_meta = 'rekono.metrics'                                             # Context key to display metrics
+    asyncio_meta = 'rekono.asyncio'                                             # Context key to use asyncio client
+    clients: Optional[Dict[Tuple[Any, ...], Rekono]] = None                     # Clients reused by interactive shell
+    tokens: Optional[Dict[str, str]] = None                                     # API tokens reused by shell, by URL
     # Initialization of variables
     commands: List[str] = []                                                    # List of supported commands
     commands_mapping: Dict[str, str] = {}                                       # Mapping between commands and methods
@@ -49,18 +72,51 @@ class RekonoCliCommand(click.MultiCommand):
         Returns:
             Optional[click.Command]: Click command.
         '''
-        related_command_method = self.commands_mapping.get(cmd_name, self.default_mapping)      # Get mapped method
-        if cmd_name in self.commands and related_command_method and hasattr(self, related_command_method):
-            command: click.Command = getattr(self, related_command_method)      # Get command method
-            command.help = self.help_messages.get(cmd_name)                     # Set help message
-            if related_command_method in ['post_entity', 'put_entity']:         # POST or PUT entity request
-                self._apply_command_options(command, self.entity_options)       # Set entity options
-            self._apply_command_options(command, self.api_options)              # Set base API options
-            self._apply_command_options(command, self.display_options)          # Set base display options
-            return command
-        return None
-
-    def _apply_command_options(self, command: Callable, options: List[Callable]) -> Callable:
+        return self._get_command_table().get(cmd_name)
+
+    @classmethod
+    def _get_command_table(cls) -> Dict[str, click.Command]:
+        '''Get CLI commands of this class, building them only the first time.
+
+        Returns:
+            Dict[str, click.Command]: Configured click commands by name.
+        '''
+        table = command_tables.get(cls)
+        if table is None:                                                       # First resolution for this class
+            table = {}
+            for cmd_name in cls.commands:
+                command = cls._build_command(cmd_name)
+                if command:
+                    table[cmd_name] = command
+            command_tables[cls] = table
+        return table
+
+    @classmethod
+    def _build_command(cls, cmd_name: str) -> Optional[click.Command]:
+        '''Build CLI command with all its options.
+
+        Base command methods are shared between classes, so options are applied to a copy of them.
+
+        Args:
+            cmd_name (str): Command name.
+
+        Returns:
+            Optional[click.Command]: Click command.
+        '''
+        related_command_method = cls.commands_mapping.get(cmd_name, cls.default_mapping)      # Get mapped method
+        if not related_command_method or not hasattr(cls, related_command_method):
+            return None
+        command: click.Command = copy.copy(getattr(cls, related_command_method))   # Copy command method
+        command.params = list(command.params)                                   # Don't modify base command options
+        command.help = cls.help_messages.get(cmd_name)                          # Set help message
+        if related_command_method in ['post_entity', 'put_entity']:             # POST or PUT entity request
+            cls._apply_command_options(command, cls.entity_options)             # Set entity options
+        cls._apply_command_options(command, cls.api_options)                    # Set base API options
+        cls._apply_command_options(command, cls.display_options)                # Set base display options
+        return command
+
+    @staticmethod
+    def _apply_command_options(command: Callable, options: List[Callable]) -> Callable:
         '''Apply multiple options to specific command.
 
         Args:
@@ -120,8 +176,8 @@ class RekonoCliCommand(click.MultiCommand):
         '''
         if body:
             try:
-                json.loads(body)                                                # Try to parse body value
-            except json.decoder.JSONDecodeError:                                # Invalid body value
+                codec.loads(body)                                               # Try to parse body value
+            except ValueError:                                                  # Invalid body value
                 click.echo(click.style('Invalid JSON format for body value', fg='red'), err=True, color=True)
                 sys.exit(1)
         return body
@@ -139,98 +195,270 @@ class RekonoCliCommand(click.MultiCommand):
         return urlparse(endpoint).path
 
     @classmethod
-    def _rekono_factory(cls, url: str, no_verify: bool = False, headers: List[str] = []) -> Rekono:
+    def _get_token(cls, url: str) -> str:
+        '''Get API token for Rekono authentication.
+
+        In the interactive shell, the token of each URL is only requested once, so it's reused by all clients.
+
+        Args:
+            url (str): Rekono base URL.
+
+        Returns:
+            str: API token from environment or provided by user.
+        '''
+        if cls.tokens is not None and url in cls.tokens:                        # Token provided in previous command
+            return cls.tokens[url]
+        token = os.getenv(cls.api_token_env)                                    # Get API token from environment
+        if not token:                                                           # API token is not provided
+            token = click.prompt('API token', type=str, hide_input=True)        # Ask for API token
+        if cls.tokens is not None:
+            cls.tokens[url] = cast(str, token)
+        return cast(str, token)
+
+    @classmethod
+    def _get_request_policy(cls) -> Dict[str, Any]:
+        '''Get timeouts, deadline and retries configured for the current command.
+
+        Returns:
+            Dict[str, Any]: Arguments for the Rekono client constructors.
+        '''
+        ctx = click.get_current_context(silent=True)
+        return dict(ctx.meta.get(cls.request_policy_meta, {})) if ctx else {}
+
+    @classmethod
+    def _watch_metrics(cls, metrics: TransferMetrics) -> None:
+        '''Display transfer metrics of a client via standard error once the current command finishes, if requested.
+
+        Args:
+            metrics (TransferMetrics): Transfer metrics of the client.
+        '''
+        ctx = click.get_current_context(silent=True)
+        if ctx and ctx.meta.get(cls.metrics_meta):
+            ctx.call_on_close(lambda: cls._output_metrics(metrics))
+
+    @staticmethod
+    def _output_metrics(metrics: TransferMetrics) -> None:
+        '''Display transfer metrics via standard error.
+
+        Args:
+            metrics (TransferMetrics): Transfer metrics of a client.
+        '''
+        values = metrics.to_dict()
+        click.echo(
+            f'Received {values["received_bytes"]} bytes ({values["decoded_bytes"]} decoded, ratio '
+            f'{values["compression_ratio"]}) in {values["responses"]} responses, '
+            f'{values["compressed_responses"]} compressed',
+            err=True
+        )
+
+    @classmethod
+    def _rekono_factory(
+        cls,
+        url: str,
+        no_verify: bool = False,
+        headers: List[str] = [],
+        max_connections: int = 10,
+        cache: bool = False
+    ) -> Rekono:
         '''Create Rekono client entity.
 
+        In the interactive shell, clients are reused between commands, so their HTTP connections stay open. Otherwise,
+        requests are sent through the Rekono CLI agent if it's running, so connections are reused between processes.
+
         Args:
             url (str): Base Rekono URL.
             no_verify (bool, optional): Disable TLS validation. Defaults to False.
             headers (List[str], optional): Extra HTTP request headers. Defaults to [].
+            max_connections (int, optional): Maximum number of connections to keep alive. Defaults to 10.
+            cache (bool, optional): Make conditional GET requests using the on-disk HTTP cache. Defaults to False.
 
         Returns:
             Rekono: Rekono API client.
         '''
-        token = os.getenv(cls.api_token_env)                                    # Get API token from environment
-        if not token:                                                           # API token is not provided
-            token = click.prompt('API token', type=str, hide_input=True)        # Ask for API token
-        return Rekono(                                                          # Create Rekono API client
+        policy = cls._get_request_policy()
+        deadline = policy.pop('deadline', None)                                 # Deadline is specific for each command
+        key = (url, no_verify, tuple(headers), max_connections, cache, tuple(sorted(policy.items())))
+        if cls.clients is not None and key in cls.clients:                      # Reuse client from previous command
+            client = cls.clients[key]
+            client.set_deadline(deadline)
+            client.metrics = TransferMetrics()                                  # Metrics are specific for each command
+            cls._watch_metrics(client.metrics)
+            return client
+        token = cls._get_token(url)
+        agent = get_socket_path() if cls.clients is None and is_running() else None
+        client = Rekono(                                                        # Create Rekono API client
+            cls._get_url(url),                                                  # Get valid Rekono URL
+            token=token,
+            headers=cls._parse_key_value_params(headers),                       # Get HTTP headers
+            verify=not no_verify,
+            pool_maxsize=max_connections,
+            cache=HttpCache() if cache else None,
+            deadline=deadline,
+            agent=agent,                                                        # Send requests through agent
+            **policy                                                            # Timeouts and retries
+        )
+        if cls.clients is not None:
+            cls.clients[key] = client
+        cls._watch_metrics(client.metrics)
+        return client
+
+    @classmethod
+    def _async_rekono_factory(
+        cls,
+        url: str,
+        no_verify: bool = False,
+        headers: List[str] = [],
+        max_connections: int = 10,
+        cache: bool = False
+    ) -> AsyncRekono:
+        '''Create Rekono asynchronous client entity, used by commands that perform concurrent operations.
+
+        Args:
+            url (str): Base Rekono URL.
+            no_verify (bool, optional): Disable TLS validation. Defaults to False.
+            headers (List[str], optional): Extra HTTP request headers. Defaults to [].
+            max_connections (int, optional): Maximum number of simultaneous connections. Defaults to 10.
+            cache (bool, optional): Make conditional GET requests using the on-disk HTTP cache. Defaults to False.
+
+        Returns:
+            AsyncRekono: Rekono asynchronous API client.
+        '''
+        token = cls._get_token(url)
+        client = AsyncRekono(                                                   # Create Rekono asynchronous client
             cls._get_url(url),                                                  # Get valid Rekono URL
-            token=cast(str, token),
+            token=token,
             headers=cls._parse_key_value_params(headers),                       # Get HTTP headers
-            verify=not no_verify
+            verify=not no_verify,
+            max_connections=max_connections,
+            cache=HttpCache() if cache else None,
+            **cls._get_request_policy()                                         # Timeouts, deadline and retries
         )
+        cls._watch_metrics(client.metrics)
+        return client
 
     @staticmethod
-    def _get_data_from_responses(responses: List[Response]) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
-        '''Get data from Rekono API responses.
+    def _get_data_from_response(response: Response) -> Optional[Union[List[Dict[str, Any]], Dict[str, Any]]]:
+        '''Get data from Rekono API response.
 
         Args:
-            responses (List[Response]): List of Rekono API responses.
+            response (Response): Rekono API response.
 
         Returns:
-            Union[List[Dict[str, Any]], Dict[str, Any]]: Data returned by Rekono.
+            Optional[Union[List[Dict[str, Any]], Dict[str, Any]]]: Data returned by Rekono or None if there is no data.
         '''
-        content = []
-        for response in responses:                                              # For each response
-            try:
-                body = response.json()                                          # Parse JSON body from response
-            except requests.exceptions.JSONDecodeError:
-                continue
-            if isinstance(body, dict):                                          # Response body is a dictionary
-                body = body.get('results', body)                                # Get results field if it exists
-            if isinstance(body, list):                                          # Content is a list
-                content.extend(body)                                            # Save content
-            elif isinstance(body, dict):                                        # Content is a dictionary
-                if len(responses) == 1:                                         # Only one response
-                    return body                                                 # Return response content
-                content.append(body)                                            # Save content
-        return content
+        try:
+            body = codec.loads(response.content or b'')                         # Parse JSON body from response bytes
+        except ValueError:
+            return None
+        if isinstance(body, dict):                                              # Response body is a dictionary
+            body = body.get('results', body)                                    # Get results field if it exists
+        return body if isinstance(body, (list, dict)) else None
+
+    @staticmethod
+    def _echo(text: str) -> None:
+        '''Display text via standard output without new line.
+
+        Args:
+            text (str): Text to display.
+        '''
+        click.echo(text, nl=False)
 
     @classmethod
-    def _display_responses(
+    def _display_response(
         cls,
-        responses: List[Response],
+        response: Response,
+        data: Optional[Union[List[Dict[str, Any]], Dict[str, Any]]],
         show_headers: bool,
         only_show_status_code: bool,
-        quiet: bool
+        output_format: str,
+        compact: bool = False
     ) -> None:
-        '''Display Rekono API responses via standard output.
+        '''Display status code or headers and content of one Rekono API response via standard output.
 
         Args:
-            responses (List[Response]): Rekono API responses.
+            response (Response): Rekono API response.
+            data (Optional[Union[List[Dict[str, Any]], Dict[str, Any]]]): Data returned in the response.
+            show_headers (bool): Display HTTP response headers.
+            only_show_status_code (bool): Only display status code from HTTP response.
+            output_format (str): Format to display response data.
+            compact (bool, optional): Display JSON without indentation nor escaped characters. Defaults to False.
+        '''
+        if only_show_status_code:                                               # Just display status code
+            click.echo(response.status_code)
+        elif show_headers:                                                      # Show response headers
+            click.echo()
+            # Display HTTP request and response summary
+            click.echo(f'{response.request.method} {response.request.path_url} {response.status_code}')
+            for header, value in response.headers.items():
+                click.echo(f'{header}: {value}')                                # Display HTTP response headers
+            click.echo()
+            writer = writers[output_format](cls._echo, compact=compact)         # Display content via standard output
+            if data is not None:
+                writer.write(data)
+            writer.close()
+            if writer.new_line_at_end:
+                click.echo()
+
+    @classmethod
+    def _output_responses(
+        cls,
+        responses: Iterable[Response],
+        show_headers: bool,
+        only_show_status_code: bool,
+        quiet: bool,
+        filepath: Optional[str] = None,
+        output_format: str = OutputFormat.JSON.value,
+        compact: bool = False
+    ) -> None:
+        '''Display Rekono API responses via standard output and save their content in JSON file.
+
+        Responses are processed one by one, so each one is released once its content has been written. Responses
+        requested with stream enabled are decoded item by item while their bodies are received. JSON files with .gz,
+        .xz or .zst extension are compressed while they are written.
+
+        Args:
+            responses (Iterable[Response]): Rekono API responses.
             show_headers (bool): Display HTTP response headers.
             only_show_status_code (bool): Only display status code from HTTP response.
             quiet (bool): Don't display anything from response.
+            filepath (Optional[str], optional): Filepath to the JSON file where content should be saved.
+            output_format (str, optional): Format to display and save response data. Defaults to json.
+            compact (bool, optional): Display and save JSON without indentation nor escaped characters. Defaults to
+                False.
         '''
-        if quiet:                                                               # No content should be displayed
-            return
-        if only_show_status_code or show_headers:                               # Headers or status should be displayed
+        display_content = not quiet and not only_show_status_code and not show_headers   # Standard display options
+        with ExitStack() as stack:
+            outputs: List[Callable[[str], Any]] = []
+            if filepath:                                                        # JSON filepath is provided
+                outputs.append(stack.enter_context(open_output(filepath)).write)   # Open JSON file
+            if display_content:
+                outputs.append(cls._echo)
+            writer = writers[output_format](*outputs, compact=compact)          # Same content for all the outputs
             for response in responses:                                          # For each response
-                if only_show_status_code:                                       # Just display status code
-                    click.echo(response.status_code)
-                elif show_headers:                                              # Show response headers
-                    click.echo()
-                    # Display HTTP request and response summary
-                    click.echo(f'{response.request.method} {response.request.path_url} {response.status_code}')
-                    for header, value in response.headers.items():
-                        click.echo(f'{header}: {value}')                        # Display HTTP response headers
-                    click.echo()
-                    data = cls._get_data_from_responses([response])             # Get content from response
-                    click.echo(json.dumps(data, ensure_ascii=True, indent=4))   # Display content via standard output
-        else:                                                                   # Standard display options
-            data = cls._get_data_from_responses(responses)                      # Get content from responses
-            click.echo(json.dumps(data, ensure_ascii=True, indent=4))           # Display content via standard output
+                streamed = bool(outputs) and not show_headers and is_pending(response)   # Decode while received
+                # Get content from response once, only if it's going to be written
+                data = cls._get_data_from_response(response) if (outputs or show_headers) and not streamed else None
+                if not quiet:
+                    cls._display_response(
+                        response, data, show_headers, only_show_status_code, output_format, compact
+                    )
+                for content in iter_response_data(response) if streamed else [data]:
+                    if content is not None and outputs:
+                        writer.write(content)                                   # Write content in all outputs
+            writer.close()
+        if display_content and writer.new_line_at_end:
+            click.echo()
 
-    @classmethod
-    def _save_output(cls, responses: List[Response], filepath: Optional[str]) -> None:
-        '''Save responses content in JSON file.
+    @staticmethod
+    def _output_count(count: Optional[int]) -> None:
+        '''Display number of items via standard output.
 
         Args:
-            responses (List[Response]): Rekono API responses.
-            filepath (Optional[str]): Filepath to the JSON file where content should be saved.
+            count (Optional[int]): Number of items, or None if the endpoint doesn't support pagination.
+
+        Raises:
+            click.ClickException: Endpoint doesn't support pagination.
         '''
-        if not filepath:                                                        # JSON filepath isn't provided
-            return
-        data = cls._get_data_from_responses(responses)                          # Get data from responses
-        with open(filepath, 'w', encoding='utf-8') as file:                     # Open JSON file
-            json.dump(data, file, ensure_ascii=True, indent=4)                  # Write content in JSON file
+        if count is None:
+            raise click.ClickException('Endpoint doesn\'t return the number of items')
+        click.echo(count)
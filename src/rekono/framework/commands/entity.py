@@ -1,14 +1,26 @@
 '''Base Rekono CLI command to make specific entity operations using API.'''
 
-import json
-from typing import Any, List, Optional, cast
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Union, cast
 
 import click
+from requests.models import Response
 
+from rekono.client.api import Rekono
+from rekono.client.cache import CatalogCache
+from rekono.client.codec import codec
+from rekono.client.pagination import PageSize
 from rekono.framework.arguments import (id_mandatory_argument,
                                         id_optional_argument)
 from rekono.framework.commands.api import ApiCommand
-from rekono.framework.options import json_option
+from rekono.framework.options import (asyncio_option, cache_option,
+                                      compact_option, concurrency_option,
+                                      count_option, json_option, limit_option,
+                                      offset_option, ordering_option,
+                                      output_format_option, page_size_option,
+                                      refresh_option, resume_option,
+                                      search_option, shards_option,
+                                      stream_option)
 
 
 class EntityCommand(ApiCommand):
@@ -22,28 +34,152 @@ class EntityCommand(ApiCommand):
         'delete': 'delete_entity',
     }
     default_mapping = 'extra_post_entity'                                       # Default method if mapping not found
+    catalog_ttl: Optional[int] = None                                           # Seconds to cache listings, if static
+    related_catalogs: List[str] = []                                            # Catalogs that embed these entities
+    filter_options: List[Callable] = []                                         # Specific filter options for get
+
+    @classmethod
+    def _build_command(cls, cmd_name: str) -> Optional[click.Command]:
+        '''Build CLI command with all its options.
+
+        Args:
+            cmd_name (str): Command name.
+
+        Returns:
+            Optional[click.Command]: Click command.
+        '''
+        command = super()._build_command(cmd_name)
+        if command and cls.commands_mapping.get(cmd_name) == 'get_entity':
+            cls._apply_command_options(command, [search_option, ordering_option] + cls.filter_options)
+            if cls.catalog_ttl:
+                cls._apply_command_options(command, [refresh_option])           # Set catalog options
+        return command
+
+    @staticmethod
+    def _get_filter_parameters(filters: Dict[str, Any]) -> List[str]:
+        '''Get query parameters from the filter options provided by the user.
+
+        Args:
+            filters (Dict[str, Any]): Values of filter options by query parameter name.
+
+        Returns:
+            List[str]: Query parameters in key=value format.
+        '''
+        parameters = []
+        for key, value in filters.items():
+            if value is None:                                                   # Filter not provided
+                continue
+            if isinstance(value, bool):
+                value = str(value).lower()
+            elif isinstance(value, datetime):
+                value = value.astimezone().isoformat()                          # Local time if timezone isn't set
+            parameters.append(f'{key}={value}')
+        return parameters
+
+    @staticmethod
+    def _get_catalog(
+        client: Rekono,
+        endpoint: str,
+        ttl: int,
+        refresh: bool,
+        concurrency: int,
+        page_size: Optional[PageSize]
+    ) -> List[Response]:
+        '''Get all entities of a catalog from cache, or from Rekono API if they aren't cached or have expired.
+
+        Args:
+            client (Rekono): Rekono API client.
+            endpoint (str): Catalog endpoint.
+            ttl (int): Time to live of the cached catalog in seconds.
+            refresh (bool): Retrieve catalog from Rekono API although it's cached.
+            concurrency (int): Number of API pages to retrieve at the same time.
+            page_size (Optional[PageSize]): Page size to use, fixed or adaptive.
+
+        Returns:
+            List[Response]: HTTP responses with the catalog pages.
+        '''
+        catalog = CatalogCache()
+        responses = None if refresh else catalog.load(client.url, endpoint, client.headers, ttl)
+        if responses is None:                                                   # Catalog isn't cached or has expired
+            responses = cast(List[Response], client.get(
+                endpoint, pagination=True, concurrency=concurrency, page_size=page_size
+            ))
+            catalog.save(client.url, endpoint, client.headers, responses)
+        return responses
+
+    @staticmethod
+    def _invalidate_catalog(ctx: click.Context) -> None:
+        '''Discard cached catalog after modifying its entities, and the catalogs that embed them.
+
+        Args:
+            ctx (click.Context): Click context.
+        '''
+        group = cast(click.Context, ctx.parent)
+        command = cast(EntityCommand, group.command)
+        catalog = CatalogCache()
+        if command.catalog_ttl:
+            catalog.invalidate(f'/api/{group.info_name}/')
+        for related in command.related_catalogs:
+            catalog.invalidate(f'/api/{related}/')
 
     @staticmethod
     @click.command
     @click.pass_context
     @id_optional_argument
+    @concurrency_option
+    @page_size_option
+    @limit_option
+    @offset_option
+    @resume_option
+    @shards_option
+    @stream_option
+    @asyncio_option
+    @cache_option
+    @count_option
     @json_option
+    @output_format_option
+    @compact_option
     def get_entity(
         ctx: click.Context,
         id: Optional[int],
+        concurrency: int,
+        page_size: Optional[PageSize],
+        limit: Optional[int],
+        offset: int,
+        resume: Optional[str],
+        shards: Union[int, List[Dict[str, str]], None],
+        stream: bool,
+        cache: Optional[bool],
+        count: bool,
         url: str,
         headers: List[str],
         no_verify: bool,
         show_headers: bool,
         only_show_status_code: bool,
         quiet: bool,
-        json_output: str
+        json_output: str,
+        output_format: str,
+        compact: bool,
+        refresh: bool = False,
+        **filters: Any
     ):
         '''GET request to retrieve specific entities via Rekono API.
 
+        Listings are filtered and sorted by Rekono, so only the needed entities are retrieved. Listings of static
+        catalogs are returned from cache until their time to live expires, unless they are filtered.
+
         Args:
             ctx (click.Context): Click context.
             id (Optional[int]): Entity Id to retrieve.
+            concurrency (int): Number of API pages to retrieve at the same time.
+            page_size (Optional[PageSize]): Page size to use, fixed or adaptive.
+            limit (Optional[int]): Maximum number of entities to retrieve.
+            offset (int): Number of entities to skip.
+            resume (Optional[str]): Checkpoint file to resume the export of all entities to the JSON file.
+            shards (Union[int, List[Dict[str, str]], None]): Number of ID ranges or query parameters of each shard.
+            stream (bool): Decode entities while API pages are received.
+            cache (Optional[bool]): Use on-disk HTTP cache if enabled, or neither it nor cached catalogs if disabled.
+            count (bool): Only display the number of entities, retrieved with a single request.
             url (str): Rekono base URL.
             headers (List[str]): HTTP headers to send in key=value format.
             no_verify (bool): Disable TLS validation.
@@ -51,23 +187,58 @@ class EntityCommand(ApiCommand):
             only_show_status_code (bool): Just display HTTP response status code.
             quiet (bool): Don't display anything from response.
             json_output (str): Filepath to the JSON file where content should be saved.
+            output_format (str): Format to display and save response data.
+            compact (bool): Display and save JSON without indentation nor escaped characters.
+            refresh (bool, optional): Retrieve catalog from Rekono API although it's cached. Defaults to False.
+            filters (Any): Values of filter and ordering options by query parameter name.
         '''
+        group = cast(click.Context, ctx.parent)
+        catalog_ttl = cast(EntityCommand, group.command).catalog_ttl
+        query_parameters = EntityCommand._get_filter_parameters(filters)
+        if id and count:
+            raise click.UsageError('Number of entities can\'t be retrieved for one ID')
+        partial = bool(query_parameters) or count or limit is not None or offset > 0   # Only some entities needed
+        if not id and catalog_ttl and not (cache is False or partial or resume or shards):   # Listing of static catalog
+            client = EntityCommand._rekono_factory(url, no_verify, headers, max(concurrency, 10))
+            responses = EntityCommand._get_catalog(
+                client, f'/api/{group.info_name}/', catalog_ttl, refresh, concurrency, page_size
+            )
+            EntityCommand._output_responses(
+                responses, show_headers, only_show_status_code, quiet, json_output, output_format, compact
+            )
+            return
         parameters = {
             'endpoint': f'/api/{cast(click.Context, ctx.parent).info_name}/',
             'url': url,
             'headers': headers,
             'no_verify': no_verify,
-            'parameters': [],
+            'parameters': query_parameters,
             'pagination': True,
+            'concurrency': concurrency,
+            'page_size': page_size,
+            'limit': limit,
+            'offset': offset,
+            'resume': resume,
+            'shards': shards,
+            'stream': stream,
+            'cache': cache,
+            'count': count,
             'show_headers': show_headers,
             'only_show_status_code': only_show_status_code,
             'quiet': quiet,
-            'json_output': json_output
+            'json_output': json_output,
+            'output_format': output_format,
+            'compact': compact
         }
         if id:
             parameters.update({
                 'endpoint': f'/api/{cast(click.Context, ctx.parent).info_name}/{id}/',
-                'pagination': False
+                'parameters': [],
+                'pagination': False,
+                'limit': None,
+                'offset': 0,
+                'resume': None,
+                'shards': None
             })
         ctx.invoke(EntityCommand.get, **parameters)
 
@@ -101,10 +272,11 @@ class EntityCommand(ApiCommand):
         '''
         ctx.invoke(
             EntityCommand.post, endpoint=f'/api/{cast(click.Context, ctx.parent).info_name}/',
-            url=url, headers=headers, no_verify=no_verify, body=json.dumps(kwargs),
+            url=url, headers=headers, no_verify=no_verify, body=codec.dumps(kwargs),
             show_headers=show_headers, only_show_status_code=only_show_status_code, quiet=quiet,
             json_output=json_output
         )
+        EntityCommand._invalidate_catalog(ctx)
 
     @staticmethod
     @click.command
@@ -139,10 +311,11 @@ class EntityCommand(ApiCommand):
         '''
         ctx.invoke(
             EntityCommand.put, endpoint=f'/api/{cast(click.Context, ctx.parent).info_name}/{id}/',
-            url=url, headers=headers, no_verify=no_verify, body=json.dumps(kwargs),
+            url=url, headers=headers, no_verify=no_verify, body=codec.dumps(kwargs),
             show_headers=show_headers, only_show_status_code=only_show_status_code, quiet=quiet,
             json_output=json_output
         )
+        EntityCommand._invalidate_catalog(ctx)
 
     @staticmethod
     @click.command
@@ -175,6 +348,7 @@ class EntityCommand(ApiCommand):
             url=url, headers=headers, no_verify=no_verify,
             show_headers=show_headers, only_show_status_code=only_show_status_code, quiet=quiet
         )
+        EntityCommand._invalidate_catalog(ctx)
 
     @staticmethod
     @click.command
@@ -208,3 +382,4 @@ class EntityCommand(ApiCommand):
             show_headers=show_headers, only_show_status_code=only_show_status_code, quiet=quiet,
             json_output=None
         )
+        EntityCommand._invalidate_catalog(ctx)
@@ -0,0 +1,69 @@
+'''Click group that loads its commands on demand.'''
+
+import importlib
+from typing import Any, Dict, List, Optional, Tuple
+
+import click
+
+
+class LazyGroup(click.Group):
+    '''Click group that imports the module of each command only when it's needed.
+
+    Commands are configured by name with their import path ("module:attribute") and their help message, so that the
+    group help can be displayed without importing any command.
+    '''
+
+    def __init__(self, *args: Any, lazy_commands: Optional[Dict[str, Tuple[str, str]]] = None, **kwargs: Any) -> None:
+        '''Lazy group constructor.
+
+        Args:
+            lazy_commands (Optional[Dict[str, Tuple[str, str]]], optional): Import path and help message of each
+                command by name. Defaults to None.
+        '''
+        super().__init__(*args, **kwargs)
+        self.lazy_commands = lazy_commands or {}
+
+    def list_commands(self, ctx: click.Context) -> List[str]:
+        '''Return list of CLI commands.
+
+        Args:
+            ctx (click.Context): Click context.
+
+        Returns:
+            List[str]: List of CLI commands.
+        '''
+        return sorted(set(super().list_commands(ctx)) | set(self.lazy_commands.keys()))
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> Optional[click.Command]:
+        '''Get CLI command by name, importing it if it hasn't been loaded yet.
+
+        Args:
+            ctx (click.Context): Click context.
+            cmd_name (str): Command name.
+
+        Returns:
+            Optional[click.Command]: Click command.
+        '''
+        if cmd_name in self.lazy_commands and cmd_name not in self.commands:
+            module, attribute = self.lazy_commands[cmd_name][0].split(':')
+            self.add_command(getattr(importlib.import_module(module), attribute), cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+    def format_commands(self, ctx: click.Context, formatter: click.HelpFormatter) -> None:
+        '''Display commands and their help messages without importing them.
+
+        Args:
+            ctx (click.Context): Click context.
+            formatter (click.HelpFormatter): Help formatter.
+        '''
+        names = self.list_commands(ctx)
+        limit = formatter.width - 6 - max([len(name) for name in names] or [0])   # Same limit as click
+        rows = []
+        for name in names:
+            if name in self.commands:                                           # Command already loaded
+                rows.append((name, self.commands[name].get_short_help_str(limit)))
+            else:
+                rows.append((name, self.lazy_commands[name][1]))
+        if rows:
+            with formatter.section('Commands'):
+                formatter.write_dl(rows)
@@ -1,8 +1,121 @@
 '''Definition of base CLI options used by multiple commands.'''
 
+import re
+from typing import Any, Callable, Dict, List, Optional, Union
+
 import click
 
+from rekono.client.pagination import PageSize
 from rekono.framework.commands.command import RekonoCliCommand
+from rekono.framework.output import OutputFormat
+
+
+class PageSizeType(click.ParamType):
+    '''Page size value: number of items per page or "auto" to adapt it, optionally within bounds as "auto:MIN-MAX".'''
+
+    name = 'page_size'
+    max_size = 1000                                                             # Max page size allowed by Rekono API
+
+    def convert(self, value: Any, param: Optional[click.Parameter], ctx: Optional[click.Context]) -> PageSize:
+        '''Convert option value into page size.
+
+        Args:
+            value (Any): Option value.
+            param (Optional[click.Parameter]): Click parameter.
+            ctx (Optional[click.Context]): Click context.
+
+        Returns:
+            PageSize: Page size to use in paginated requests.
+        '''
+        if isinstance(value, PageSize):
+            return value
+        adaptive = re.fullmatch(r'auto(?::(\d+)-(\d+))?', str(value))           # Adaptive page size
+        if adaptive and adaptive.group(1):                                      # Adaptive page size with bounds
+            min_size, max_size = int(adaptive.group(1)), int(adaptive.group(2))
+            if 0 < min_size <= max_size <= self.max_size:
+                return PageSize(adaptive=True, min_size=min_size, max_size=max_size)
+        elif adaptive:
+            return PageSize(adaptive=True)
+        elif str(value).isdigit() and 0 < int(value) <= self.max_size:          # Fixed page size
+            return PageSize(int(value))
+        self.fail(f'{value} is not a page size between 1 and {self.max_size}, "auto" or "auto:MIN-MAX"', param, ctx)
+
+
+class ShardsType(click.ParamType):
+    '''Shards of a listing: number of entity ID ranges or query parameter values as "PARAMETER=VALUE1,VALUE2".'''
+
+    name = 'shards'
+
+    def convert(
+        self,
+        value: Any,
+        param: Optional[click.Parameter],
+        ctx: Optional[click.Context]
+    ) -> Union[int, List[Dict[str, str]]]:
+        '''Convert option value into shards.
+
+        Args:
+            value (Any): Option value.
+            param (Optional[click.Parameter]): Click parameter.
+            ctx (Optional[click.Context]): Click context.
+
+        Returns:
+            Union[int, List[Dict[str, str]]]: Number of ID ranges or query parameters of each shard.
+        '''
+        if isinstance(value, (int, list)):
+            return value
+        if str(value).isdigit() and int(value) > 0:                             # Number of ID ranges
+            return int(value)
+        partition = re.fullmatch(r'([\w.]+)=([^,]+(?:,[^,]+)*)', str(value))    # Filter values
+        if partition:
+            return [{partition.group(1): item} for item in partition.group(2).split(',')]
+        self.fail(f'{value} is not a number of shards or "PARAMETER=VALUE1,VALUE2"', param, ctx)
+
+
+def _store_request_policy(ctx: click.Context, param: click.Parameter, value: Any) -> Any:
+    '''Store option value in the context, so that Rekono clients are created with it.
+
+    Args:
+        ctx (click.Context): Click context.
+        param (click.Parameter): Click parameter.
+        value (Any): Option value.
+
+    Returns:
+        Any: Option value.
+    '''
+    ctx.meta.setdefault(RekonoCliCommand.request_policy_meta, {})[param.name] = value
+    return value
+
+
+def _store_metrics(ctx: click.Context, param: click.Parameter, value: Any) -> Any:
+    '''Store in the context if transfer metrics have to be displayed once the command finishes.
+
+    Args:
+        ctx (click.Context): Click context.
+        param (click.Parameter): Click parameter.
+        value (Any): Option value.
+
+    Returns:
+        Any: Option value.
+    '''
+    ctx.meta[RekonoCliCommand.metrics_meta] = value
+    return value
+
+
+def _store_asyncio(ctx: click.Context, param: click.Parameter, value: Any) -> Any:
+    '''Store in the context if concurrent pages have to be retrieved with the asynchronous client.
+
+    Args:
+        ctx (click.Context): Click context.
+        param (click.Parameter): Click parameter.
+        value (Any): Option value.
+
+    Returns:
+        Any: Option value.
+    '''
+    ctx.meta[RekonoCliCommand.asyncio_meta] = value
+    return value
+
 
 url_option = click.option(                                                      # URL option
     '-u', '--url', 'url',
@@ -25,6 +138,61 @@ no_verify_option = click.option(
     help='Disable TLS verification'
 )
 
+connect_timeout_option = click.option(                                          # Connection timeout option
+    '--connect-timeout', 'connect_timeout',
+    type=click.FloatRange(min=0, min_open=True), required=False, default=10,
+    envvar=RekonoCliCommand.connect_timeout_env, show_envvar=True,
+    expose_value=False, callback=_store_request_policy,
+    help='Seconds to wait for the connection with Rekono'
+)
+
+read_timeout_option = click.option(                                             # Read timeout option
+    '--read-timeout', 'read_timeout',
+    type=click.FloatRange(min=0, min_open=True), required=False, default=60,
+    envvar=RekonoCliCommand.read_timeout_env, show_envvar=True,
+    expose_value=False, callback=_store_request_policy,
+    help='Seconds to wait for data from Rekono'
+)
+
+deadline_option = click.option(                                                 # Deadline option
+    '--deadline', 'deadline',
+    type=click.FloatRange(min=0, min_open=True), required=False, default=None,
+    envvar=RekonoCliCommand.deadline_env, show_envvar=True,
+    expose_value=False, callback=_store_request_policy,
+    help='Seconds for all the requests of the command, including retries'
+)
+
+retries_option = click.option(                                                  # Retries option
+    '--retries', 'retries',
+    type=click.IntRange(min=0), required=False, default=5,
+    envvar=RekonoCliCommand.retries_env, show_envvar=True,
+    expose_value=False, callback=_store_request_policy,
+    help='Maximum number of retries of each failed request'
+)
+
+backoff_factor_option = click.option(                                           # Backoff factor option
+    '--backoff-factor', 'backoff_factor',
+    type=click.FloatRange(min=0), required=False, default=0.1,
+    envvar=RekonoCliCommand.backoff_factor_env, show_envvar=True,
+    expose_value=False, callback=_store_request_policy,
+    help='Backoff factor between retries, with random jitter. Retry-After header is honored'
+)
+
+compression_option = click.option(                                              # Compression option
+    '--compression/--no-compression', 'compression',
+    required=False, default=True,
+    envvar=RekonoCliCommand.compression_env, show_envvar=True,
+    expose_value=False, callback=_store_request_policy,
+    help='Request compressed responses, decoded while they are received'
+)
+
+metrics_option = click.option(                                                  # Transfer metrics option
+    '--metrics', 'metrics',
+    is_flag=True, default=False,
+    expose_value=False, callback=_store_metrics,
+    help='Show bytes received from Rekono before and after decompression'
+)
+
 parameters_option = click.option(                                               # Request parameters option
     '-p', '--parameter', 'parameters',
     multiple=True, type=str,
@@ -51,6 +219,74 @@ all_pages_option = click.option(
     help='Perform pagination over all pages'
 )
 
+concurrency_option = click.option(                                              # Option to fetch pages concurrently
+    '--concurrency', 'concurrency',
+    type=click.IntRange(min=1), required=False, default=1,
+    help='Number of API pages to retrieve at the same time'
+)
+
+page_size_option = click.option(                                                # Page size option
+    '--page-size', 'page_size',
+    type=PageSizeType(), required=False, default=None,
+    help='Number of items per API page or "auto" to adapt it to response time and size ("auto:MIN-MAX" sets bounds)'
+)
+
+limit_option = click.option(                                                    # Option to limit number of items
+    '--limit', 'limit',
+    type=click.IntRange(min=1), required=False, default=None,
+    help='Maximum number of items to retrieve. Pagination stops when they have been retrieved'
+)
+
+offset_option = click.option(                                                   # Option to skip items
+    '--offset', 'offset',
+    type=click.IntRange(min=0), required=False, default=0,
+    help='Number of items to skip before retrieving them'
+)
+
+resume_option = click.option(                                                   # Resumable export option
+    '--resume', 'resume',
+    type=click.Path(dir_okay=False), required=False, default=None,
+    help='Checkpoint file to resume the export to the JSON file where it stopped. It\'s removed when export finishes'
+)
+
+shards_option = click.option(                                                   # Sharded export option
+    '--shards', 'shards',
+    type=ShardsType(), required=False, default=None,
+    help='Split listing into shards retrieved at the same time: number of ID ranges or "PARAMETER=VALUE1,VALUE2"'
+)
+
+stream_option = click.option(                                                   # Option to decode items while received
+    '--stream', 'stream',
+    is_flag=True, default=False,
+    help='Decode items while API pages are received, so memory usage doesn\'t depend on page size. Cache isn\'t used'
+)
+
+asyncio_option = click.option(                                                  # Option to use asynchronous client
+    '--asyncio', 'asyncio',
+    is_flag=True, default=False,
+    expose_value=False, callback=_store_asyncio,
+    help='Retrieve all pages with the asyncio client, without agent nor shell connections. It requires aiohttp'
+)
+
+cache_option = click.option(                                                    # Option to use HTTP cache
+    '--cache/--no-cache', 'cache',
+    required=False, default=None,
+    envvar=RekonoCliCommand.cache_env, show_envvar=True,
+    help='Make conditional requests using the on-disk HTTP cache. --no-cache also bypasses cached catalogs'
+)
+
+refresh_option = click.option(                                                  # Option to refresh cached catalog
+    '--refresh', 'refresh',
+    is_flag=True, default=False,
+    help='Retrieve data from Rekono API instead of the cached catalog'
+)
+
+count_option = click.option(                                                    # Option to only retrieve item count
+    '--count', 'count',
+    is_flag=True, default=False,
+    help='Only show the number of items, retrieved with a single request'
+)
+
 show_headers_option = click.option(                                             # Option to show response headers
     '-s', '--show-headers', 'show_headers',
     is_flag=True, default=False,
@@ -75,9 +311,72 @@ json_option = click.option(
     help='Save response data in JSON file'
 )
 
+output_format_option = click.option(                                            # Output format option
+    '--output-format', 'output_format',
+    type=click.Choice([f.value for f in OutputFormat]),
+    required=False, default=OutputFormat.JSON.value,
+    help='Format to display and save response data. "ndjson" writes one JSON object per line as soon as received'
+)
+
+compact_option = click.option(                                                  # Compact output option
+    '--compact', 'compact',
+    is_flag=True, default=False,
+    help='Display and save JSON without indentation nor escaped non ASCII characters'
+)
+
 tags_option = click.option(                                                     # Tags option used by multiple commands
     '-t', '--tag', 'tags',
     multiple=True, type=str,
     required=False, default=[],
     help='Related tags'
 )
+
+search_option = click.option(                                                   # Free-text search option
+    '--search', 'search',
+    type=str, required=False, default=None,
+    help='Only retrieve entities that contain this text'
+)
+
+ordering_option = click.option(                                                 # Ordering option
+    '--ordering', 'o',
+    type=str, required=False, default=None,
+    help='Field to sort entities by. Prefix it with "-" to sort in descending order'
+)
+
+
+def filter_option(flag: str, parameter: str, help: str, type: Any = int) -> Callable:
+    '''Create option to filter entity listings by one field, sent as query parameter.
+
+    Args:
+        flag (str): Option flag.
+        parameter (str): Query parameter name.
+        help (str): Help message.
+        type (Any, optional): Option type. Defaults to int.
+
+    Returns:
+        Callable: Click option.
+    '''
+    return click.option(flag, parameter, type=type, required=False, default=None, help=help)
+
+
+def date_range_options(field: str) -> List[Callable]:
+    '''Create options to filter entity listings by a date range.
+
+    Args:
+        field (str): Date field name.
+
+    Returns:
+        List[Callable]: Click options for the start and the end of the range.
+    '''
+    date_type = click.DateTime(formats=['%Y-%m-%d', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d %H:%M:%S'])
+    return [
+        filter_option('--since', f'{field}__gte', f'Only retrieve entities with {field} after this date', date_type),
+        filter_option('--until', f'{field}__lte', f'Only retrieve entities with {field} before this date', date_type)
+    ]
+
+
+enabled_option = click.option(                                                  # Option to filter by enabled state
+    '--enabled/--disabled', 'is_active',
+    required=False, default=None,
+    help='Only retrieve enabled or disabled entities'
+)
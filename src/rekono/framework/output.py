@@ -0,0 +1,207 @@
+'''Output writers to display and save data returned by Rekono API.'''
+
+import gzip
+import importlib
+import lzma
+from enum import Enum
+from typing import IO, Any, Callable, Dict, List, Optional, Type, Union
+
+import click
+
+from rekono.client.codec import codec
+
+try:
+    zstandard: Any = importlib.import_module('zstandard')                       # Optional Zstandard compression
+except ImportError:
+    zstandard = None
+
+
+class OutputFormat(Enum):
+    '''Supported formats to display and save data returned by Rekono API.'''
+
+    JSON = 'json'
+    NDJSON = 'ndjson'
+
+
+class OutputWriter:
+    '''Base writer to display and save data returned by Rekono API.
+
+    Each item is serialized only once and the resulting text is written in all the outputs.
+    '''
+
+    new_line_at_end = False                                                     # Add new line after the content
+
+    def __init__(self, *outputs: Callable[[str], Any], compact: bool = False) -> None:
+        '''Writer constructor.
+
+        Args:
+            outputs (Callable[[str], Any]): Functions to write text in each output.
+            compact (bool, optional): Write content without indentation nor escaped characters. Defaults to False.
+        '''
+        self.outputs = outputs
+        self.compact = compact
+
+    def _write(self, text: str) -> None:
+        '''Write text in all the outputs.
+
+        Args:
+            text (str): Text to write.
+        '''
+        for output in self.outputs:
+            output(text)
+
+    def write(self, data: Union[List[Any], Dict[str, Any]]) -> None:
+        '''Write data returned by one Rekono API response.
+
+        Args:
+            data (Union[List[Any], Dict[str, Any]]): Response data.
+        '''
+        raise NotImplementedError()
+
+    def resume(self, items: int) -> None:
+        '''Continue content that already includes some items, like resumed exports.
+
+        Args:
+            items (int): Number of items already written.
+        '''
+
+    def close(self) -> None:
+        '''Finish output content.'''
+
+
+class JsonWriter(OutputWriter):
+    '''Write Rekono API data as one JSON document, item by item, so that the whole content isn't kept in memory.'''
+
+    new_line_at_end = True                                                      # Add new line after the content
+    indent = 4                                                                  # Indentation of the JSON document
+
+    def __init__(self, *outputs: Callable[[str], Any], compact: bool = False) -> None:
+        '''JSON writer constructor.
+
+        Args:
+            outputs (Callable[[str], Any]): Functions to write text in each output.
+            compact (bool, optional): Write content without indentation nor escaped characters. Defaults to False.
+        '''
+        super().__init__(*outputs, compact=compact)
+        self.items = 0                                                          # Number of items written in the list
+        self.pending: Optional[Dict[str, Any]] = None                           # Dictionary that could be the content
+
+    def _write_item(self, item: Any) -> None:
+        '''Write item as element of the JSON list.
+
+        Args:
+            item (Any): Item to write.
+        '''
+        if self.compact:                                                        # One line without spaces
+            self._write(('[' if self.items == 0 else ',') + codec.dumps(item))
+        else:
+            prefix = '\n' + ' ' * self.indent                                   # Lines are indented inside the list
+            content = codec.dumps_pretty(item, self.indent).replace('\n', prefix)
+            self._write(('[' if self.items == 0 else ',') + prefix + content)
+        self.items += 1
+
+    def write(self, data: Union[List[Any], Dict[str, Any]]) -> None:
+        '''Write data returned by one Rekono API response.
+
+        Args:
+            data (Union[List[Any], Dict[str, Any]]): Response data.
+        '''
+        if isinstance(data, dict) and self.items == 0 and self.pending is None:
+            self.pending = data                                                 # It's the content if no more data
+            return
+        if self.pending is not None:                                            # More data after one dictionary
+            self._write_item(self.pending)                                      # Dictionary is one element of list
+            self.pending = None
+        for item in data if isinstance(data, list) else [data]:
+            self._write_item(item)
+
+    def resume(self, items: int) -> None:
+        '''Continue JSON list that already includes some items, like resumed exports.
+
+        Args:
+            items (int): Number of items already written.
+        '''
+        self.items = items
+
+    def close(self) -> None:
+        '''Finish JSON document.'''
+        if self.pending is not None:                                            # Only one dictionary has been written
+            self._write(codec.dumps(self.pending) if self.compact else codec.dumps_pretty(self.pending, self.indent))
+            self.pending = None
+        elif self.items > 0:
+            self._write(']' if self.compact else '\n]')                         # Close JSON list
+        else:
+            self._write('[]')
+
+
+class NdjsonWriter(OutputWriter):
+    '''Write Rekono API data as JSON Lines, one compact JSON object per line as soon as each item is received.'''
+
+    def write(self, data: Union[List[Any], Dict[str, Any]]) -> None:
+        '''Write data returned by one Rekono API response.
+
+        Args:
+            data (Union[List[Any], Dict[str, Any]]): Response data.
+        '''
+        for item in data if isinstance(data, list) else [data]:
+            self._write(codec.dumps(item) + '\n')
+
+
+writers: Dict[str, Type[OutputWriter]] = {                                      # Writer for each output format
+    OutputFormat.JSON.value: JsonWriter,
+    OutputFormat.NDJSON.value: NdjsonWriter
+}
+
+
+def _open_zstandard(filepath: str) -> IO[str]:
+    '''Open file to write text compressed with Zstandard.
+
+    Args:
+        filepath (str): Filepath.
+
+    Raises:
+        click.ClickException: Zstandard isn't installed.
+
+    Returns:
+        IO[str]: Text stream that compresses the content while it's written.
+    '''
+    if zstandard is None:
+        raise click.ClickException('Install the zstd extra (pip3 install rekono-cli[zstd]) to write .zst files')
+    return zstandard.open(filepath, 'wt', encoding='utf-8')
+
+
+compressors: Dict[str, Callable[[str], IO[str]]] = {                            # Compression for each file extension
+    '.gz': lambda filepath: gzip.open(filepath, 'wt', encoding='utf-8'),
+    '.xz': lambda filepath: lzma.open(filepath, 'wt', encoding='utf-8'),
+    '.zst': _open_zstandard
+}
+
+
+def is_compressed(filepath: str) -> bool:
+    '''Check if an output file is compressed, based on its extension.
+
+    Args:
+        filepath (str): Output filepath.
+
+    Returns:
+        bool: Indicates if the content is compressed while it's written.
+    '''
+    return any(filepath.lower().endswith(extension) for extension in compressors)
+
+
+def open_output(filepath: str) -> IO[str]:
+    '''Open output file to write text, compressing it while it's written if its extension is .gz, .xz or .zst.
+
+    Args:
+        filepath (str): Output filepath.
+
+    Raises:
+        click.ClickException: Compression isn't available.
+
+    Returns:
+        IO[str]: Text stream to write the output content.
+    '''
+    for extension, compressor in compressors.items():
+        if filepath.lower().endswith(extension):
+            return compressor(filepath)
+    return open(filepath, 'w', encoding='utf-8')
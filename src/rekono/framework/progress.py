@@ -0,0 +1,48 @@
+'''Progress of long operations, displayed via standard error.'''
+
+import time
+from typing import Optional
+
+import click
+
+
+class UploadProgress:
+    '''Display progress and throughput of file uploads via standard error, on a single line updated periodically.'''
+
+    interval = 0.2                                                              # Minimum seconds between updates
+    unit = 1024 * 1024                                                          # Sizes are displayed in MiB
+
+    def __init__(self) -> None:
+        '''Upload progress constructor.'''
+        self.started: Optional[float] = None                                    # Monotonic time of the first bytes
+        self.updated = 0.0                                                      # Monotonic time of the last update
+
+    @staticmethod
+    def is_enabled() -> bool:
+        '''Check if progress can be displayed, because standard error is a terminal.
+
+        Returns:
+            bool: Indicates if progress should be displayed.
+        '''
+        return click.get_text_stream('stderr').isatty()
+
+    def __call__(self, sent: int, total: int) -> None:
+        '''Update progress after sending some bytes.
+
+        Args:
+            sent (int): Number of bytes sent.
+            total (int): Total upload size.
+        '''
+        now = time.monotonic()
+        if self.started is None:
+            self.started = now
+        if sent < total and now - self.updated < self.interval:                 # Avoid flooding the terminal
+            return
+        self.updated = now
+        elapsed = now - self.started
+        throughput = sent / elapsed if elapsed > 0 else 0
+        click.echo(
+            f'\rUploaded {sent / self.unit:.1f} of {total / self.unit:.1f} MiB ({sent * 100 // max(total, 1)}%) '
+            f'at {throughput / self.unit:.1f} MiB/s',
+            err=True, nl=sent >= total
+        )
@@ -3,57 +3,42 @@
 import click
 
 from rekono import VERSION
-from rekono.commands.api import api
-from rekono.commands.authentications import authentications
-from rekono.commands.configurations import configurations
-from rekono.commands.executions import executions
-from rekono.commands.findings import (credentials, exploits, hosts, osint,
-                                      paths, ports, technologies,
-                                      vulnerabilities)
-from rekono.commands.processes import processes
-from rekono.commands.profile import profile
-from rekono.commands.projects import projects
-from rekono.commands.settings import settings
-from rekono.commands.steps import steps
-from rekono.commands.target_ports import target_ports
-from rekono.commands.targets import targets
-from rekono.commands.tasks import tasks
-from rekono.commands.tools import tools
-from rekono.commands.users import users
-from rekono.commands.wordlists import wordlists
-
-
-@click.group()
+from rekono.framework.lazy import LazyGroup
+
+commands = {                                                                    # Import path and help of commands
+    'agent': ('rekono.commands.agent:agent', 'Manage local agent that keeps connections to Rekono open'),
+    'api': ('rekono.commands.api:api', 'Make custom Rekono API requests'),
+    'authentications': ('rekono.commands.authentications:authentications', 'Manage target authentications'),
+    'configurations': ('rekono.commands.configurations:configurations', 'Get configurations'),
+    'credentials': ('rekono.commands.findings:credentials', 'Manage credentials'),
+    'executions': ('rekono.commands.executions:executions', 'Get executions'),
+    'exploits': ('rekono.commands.findings:exploits', 'Manage exploits'),
+    'hosts': ('rekono.commands.findings:hosts', 'Manage hosts'),
+    'osint': ('rekono.commands.findings:osint', 'Manage OSINT findings'),
+    'paths': ('rekono.commands.findings:paths', 'Manage paths'),
+    'ports': ('rekono.commands.findings:ports', 'Manage ports'),
+    'processes': ('rekono.commands.processes:processes', 'Manage processes'),
+    'profile': ('rekono.commands.profile:profile', 'Manage user profile'),
+    'projects': ('rekono.commands.projects:projects', 'Manage projects'),
+    'settings': ('rekono.commands.settings:settings', 'Get system settings'),
+    'shell': ('rekono.commands.shell:shell', 'Run commands in an interactive shell that reuses the same session'),
+    'steps': ('rekono.commands.steps:steps', 'Manage steps'),
+    'target-ports': ('rekono.commands.target_ports:target_ports', 'Manage target ports'),
+    'targets': ('rekono.commands.targets:targets', 'Manage targets'),
+    'tasks': ('rekono.commands.tasks:tasks', 'Manage tasks'),
+    'technologies': ('rekono.commands.findings:technologies', 'Manage technologies'),
+    'tools': ('rekono.commands.tools:tools', 'Get tools'),
+    'users': ('rekono.commands.users:users', 'Manage users'),
+    'vulnerabilities': ('rekono.commands.findings:vulnerabilities', 'Manage vulnerabilities'),
+    'wordlists': ('rekono.commands.wordlists:wordlists', 'Manage wordlists')
+}
+
+
+@click.group(cls=LazyGroup, lazy_commands=commands)                             # Commands are imported when needed
 @click.version_option(version=VERSION, message='%(version)s')
 def rekono():
     '''Rekono CLI.'''
 
 
-# Add CLI commands
-rekono.add_command(api)
-rekono.add_command(authentications)
-rekono.add_command(configurations)
-rekono.add_command(credentials)
-rekono.add_command(executions)
-rekono.add_command(exploits)
-rekono.add_command(hosts)
-rekono.add_command(osint)
-rekono.add_command(paths)
-rekono.add_command(ports)
-rekono.add_command(processes)
-rekono.add_command(profile)
-rekono.add_command(projects)
-rekono.add_command(settings)
-rekono.add_command(steps)
-rekono.add_command(target_ports)
-rekono.add_command(targets)
-rekono.add_command(tasks)
-rekono.add_command(technologies)
-rekono.add_command(tools)
-rekono.add_command(users)
-rekono.add_command(vulnerabilities)
-rekono.add_command(wordlists)
-
-
 if __name__ == '__main__':
     rekono()
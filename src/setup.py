@@ -32,6 +32,11 @@ setup(
     keywords=['automation', 'pentesting', 'security', 'cli', 'rekono'],
     include_package_data=True,
     install_requires=install_requires,
+    extras_require={
+        'async': ['aiohttp>=3.8.0'],                                            # Asynchronous Rekono client
+        'orjson': ['orjson>=3.6.0'],                                            # Faster JSON backend
+        'zstd': ['zstandard>=0.15.0']                                           # Zstandard output files
+    },
     python_requires='>=3.7',
     entry_points='''
         [console_scripts]
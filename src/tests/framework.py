@@ -1,15 +1,18 @@
 '''Framework for unit testing of Rekono CLI.'''
 
+import inspect
 import json
 import os
+import tempfile
 from typing import Any, Dict, List, Optional, Union
 from unittest import TestCase, mock
 
 import click
 from click.testing import CliRunner
 
+from rekono.client.api import Rekono
 from rekono.main import rekono
-from tests.mock import RekonoMock
+from tests.mock import AsyncRekonoMock, RekonoMock
 
 
 class RekonoCommandTest(TestCase):
@@ -47,7 +50,8 @@ class RekonoCommandTest(TestCase):
                 input_value += f'{RekonoMock.url}\n'                            # Add URL as input value
                 # Add invalid URL message to output
                 prefix += f'{click.style("URL is invalid", fg="red")}\nURL: {RekonoMock.url}\n'
-        result = runner.invoke(rekono, arguments, input=input_value)            # Invoke CLI command
+        with tempfile.TemporaryDirectory() as cache_directory:                 # Don't use user cache for testing
+            result = runner.invoke(rekono, arguments, input=input_value, env={'REKONO_CACHE_DIR': cache_directory})
         terminal_output = prefix + (f'{output}\n' if output else '')            # Expected output
         self.assertEqual(exit_code, result.exit_code)                           # Check exit code
         self.assertEqual(terminal_output, result.output)                        # Check terminal output
@@ -56,6 +60,30 @@ class RekonoCommandTest(TestCase):
                 self.assertEqual(output, file.read())                           # Check file content
             os.remove(self.testing_filepath)                                    # Remove temporal testing file
 
+    def _get_client_call(self, arguments: List[str], method: str, env: Dict[str, str] = {}) -> Dict[str, Any]:
+        '''Get arguments received by one method of Rekono API client when a Rekono CLI command is executed.
+
+        Args:
+            arguments (List[str]): Command arguments.
+            method (str): Name of the Rekono API client method.
+            env (Dict[str, str], optional): Extra environment variables. Defaults to {}.
+
+        Returns:
+            Dict[str, Any]: Arguments of the last call to the method by name, including default values.
+        '''
+        with mock.patch.object(RekonoMock, method, autospec=True, side_effect=getattr(RekonoMock, method)) as call:
+            with mock.patch('rekono.framework.commands.command.Rekono', RekonoMock):
+                with tempfile.TemporaryDirectory() as cache_directory:         # Don't use user cache for testing
+                    env = {'REKONO_CACHE_DIR': cache_directory, **env}
+                    result = CliRunner().invoke(rekono, arguments, input='test\n', env=env)
+        self.assertEqual(0, result.exit_code, result.output)
+        # Bind call to the signature of the real client, so that arguments can be checked by name
+        bound = inspect.signature(getattr(Rekono, method)).bind(*call.call_args[0], **call.call_args[1])
+        bound.apply_defaults()
+        return dict(bound.arguments)
+
+    @mock.patch('rekono.framework.commands.api.AsyncRekono', AsyncRekonoMock)
+    @mock.patch('rekono.framework.commands.command.AsyncRekono', AsyncRekonoMock)
     @mock.patch('rekono.framework.commands.command.Rekono', RekonoMock)
     def test_rekono_cli(self) -> None:
         '''Execute configured unit tests.'''
@@ -80,6 +108,18 @@ class RekonoCommandTest(TestCase):
         '''
         return json.dumps(content, ensure_ascii=True, indent=4)
 
+    @classmethod
+    def _ndjson_body(cls, content: List[Dict[str, Any]]) -> str:
+        '''Create JSON Lines body from content.
+
+        Args:
+            content (List[Dict[str, Any]]): Items to include in JSON Lines body.
+
+        Returns:
+            str: JSON Lines body.
+        '''
+        return '\n'.join([json.dumps(item, ensure_ascii=False, separators=(',', ':')) for item in content])
+
     @classmethod
     def _expected_output_with_headers(
         cls,
@@ -1,11 +1,13 @@
 '''Rekono API client mock.'''
 
 import json
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterator, List, Optional, Union
 
 from requests.models import Request, Response
 from requests.structures import CaseInsensitiveDict
 
+from rekono.client.metrics import TransferMetrics
+
 
 class RekonoMock:
     '''Rekono API client mock.'''
@@ -22,6 +24,7 @@ class RekonoMock:
 
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         '''Mock constructor for Rekono API client.'''
+        self.metrics = TransferMetrics()
 
     def _response_factory(
         self,
@@ -44,8 +47,12 @@ class RekonoMock:
         response.status_code = status_code                                      # Set response status code
         response.headers = CaseInsensitiveDict(self.headers)                    # Set response headers
         response._content = json.dumps(content, ensure_ascii=True, indent=4).encode() if content else None  # Set body
+        self.metrics.record(response)                                           # Count response as received
         return response
 
+    def set_deadline(self, *args: Any, **kwargs: Any) -> None:
+        '''Mock deadline configuration.'''
+
     def get(self, *args: Any, **kwargs: Any) -> Union[Response, List[Response]]:
         '''Mock GET request to Rekono API.
 
@@ -76,6 +83,38 @@ class RekonoMock:
             self._response_factory('GET', 200, self.data)
         ]
 
+    def iter_pages(self, *args: Any, **kwargs: Any) -> Iterator[Response]:
+        '''Mock GET requests to iterate over all API pages.
+
+        Returns:
+            Iterator[Response]: HTTP responses.
+        '''
+        return iter(self.get_paginated_entities(*args, **kwargs))
+
+    def get_id_shards(self, *args: Any, **kwargs: Any) -> List[Dict[str, Any]]:
+        '''Mock requests to split a listing into ID ranges.
+
+        Returns:
+            List[Dict[str, Any]]: Query parameters of each shard.
+        '''
+        return [{'id__gte': 1, 'id__lte': 10}, {'id__gte': 11, 'id__lte': 20}]
+
+    def iter_shards(self, *args: Any, **kwargs: Any) -> Iterator[Response]:
+        '''Mock GET requests to retrieve shards of a listing at the same time.
+
+        Returns:
+            Iterator[Response]: HTTP responses.
+        '''
+        return iter(self.get_paginated_entities(*args, **kwargs))
+
+    def count(self, *args: Any, **kwargs: Any) -> Optional[int]:
+        '''Mock request to get number of items.
+
+        Returns:
+            Optional[int]: Number of items.
+        '''
+        return 3
+
     def post(self, *args: Any, **kwargs: Any) -> Response:
         '''Mock POST request to Rekono API.
 
@@ -107,3 +146,24 @@ class RekonoMock:
             Response: HTTP response.
         '''
         return self._response_factory('DELETE', 204)
+
+
+class AsyncRekonoMock(RekonoMock):
+    '''Rekono asynchronous API client mock.'''
+
+    @staticmethod
+    def is_available() -> bool:
+        '''Mock check of asynchronous client availability.
+
+        Returns:
+            bool: Asynchronous client is always available.
+        '''
+        return True
+
+    def iter_pages_blocking(self, *args: Any, **kwargs: Any) -> Iterator[Response]:
+        '''Mock iteration over all API pages from synchronous code.
+
+        Returns:
+            Iterator[Response]: HTTP responses.
+        '''
+        return self.iter_pages(*args, **kwargs)
@@ -0,0 +1,169 @@
+'''Test Rekono CLI agent.'''
+
+import json
+import os
+import socket
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional, cast
+from unittest import TestCase
+
+from click.testing import CliRunner
+from requests.models import Response
+
+from rekono.client.agent import AgentServer, is_running, send_command
+from rekono.client.api import Rekono
+from rekono.client.exceptions import DeadlineError, RequestError
+from rekono.main import rekono
+
+
+class RekonoHandler(BaseHTTPRequestHandler):
+    '''Rekono API mock that records the client connections.'''
+
+    protocol_version = 'HTTP/1.1'                                               # Keep connections alive
+    connections: List[int] = []                                                 # Client ports of each request
+    failures = 0                                                                # Requests to fail with 503
+    cookies: List[Optional[str]] = []                                           # Cookies sent in each request
+
+    def _respond(self, status: int, body: bytes) -> None:
+        '''Send HTTP response.
+
+        Args:
+            status (int): HTTP status code.
+            body (bytes): Response body.
+        '''
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Set-Cookie', f'sessionid={self.headers["Authorization"]}; Path=/')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        '''Handle GET request.'''
+        RekonoHandler.connections.append(self.client_address[1])
+        RekonoHandler.cookies.append(self.headers['Cookie'])
+        if RekonoHandler.failures > 0:
+            RekonoHandler.failures -= 1
+            self._respond(503, b'{}')
+            return
+        self._respond(200, json.dumps({'id': 1, 'token': self.headers['Authorization']}).encode())
+
+    def do_POST(self) -> None:
+        '''Handle POST request.'''
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        self._respond(201, body)
+
+    def log_message(self, *args: object) -> None:
+        '''Don't log requests.'''
+
+
+class AgentTest(TestCase):
+    '''Test Rekono CLI agent.'''
+
+    def setUp(self) -> None:
+        '''Start Rekono API mock and agent.'''
+        RekonoHandler.connections = []
+        RekonoHandler.failures = 0
+        RekonoHandler.cookies = []
+        self.rekono = ThreadingHTTPServer(('127.0.0.1', 0), RekonoHandler)
+        self.url = f'http://127.0.0.1:{self.rekono.server_address[1]}'
+        self.directory = tempfile.TemporaryDirectory()
+        self.socket = os.path.join(self.directory.name, 'agent.sock')
+        self.agent = AgentServer(self.socket)
+        self.threads = [
+            threading.Thread(target=self.rekono.serve_forever, daemon=True),
+            threading.Thread(target=self.agent.run, daemon=True)
+        ]
+        for thread in self.threads:
+            thread.start()
+
+    def tearDown(self) -> None:
+        '''Stop Rekono API mock and agent.'''
+        send_command('stop', self.socket)
+        self.rekono.shutdown()
+        self.rekono.server_close()
+        for thread in self.threads:
+            thread.join(5)
+        self.directory.cleanup()
+
+    def test_requests(self) -> None:
+        '''Test requests from different clients are sent through the same connection.'''
+        for token in ['first', 'second']:                                       # Like two CLI processes
+            client = Rekono(self.url, token, agent=self.socket)
+            self.assertEqual({'id': 1, 'token': f'Token {token}'}, cast(Response, client.get('/api/tools/1/')).json())
+        self.assertEqual(201, client.post('/api/targets/', body='{"target": "10.10.10.10"}').status_code)
+        self.assertEqual(1, len(set(RekonoHandler.connections)))
+
+    def test_cookies(self) -> None:
+        '''Test cookies set for one client aren't saved by the agent nor sent for other clients.'''
+        for token in ['first', 'second']:                                       # Like two CLI processes
+            client = Rekono(self.url, token, agent=self.socket)
+            self.assertEqual(200, cast(Response, client.get('/api/tools/1/')).status_code)
+        self.assertEqual([None, None], RekonoHandler.cookies)
+        self.assertEqual(0, len(self.agent.session.cookies))
+
+    def test_upload(self) -> None:
+        '''Test file uploads are streamed directly to Rekono, instead of being loaded in memory for the agent.'''
+        progress: List[int] = []
+        with tempfile.NamedTemporaryFile(dir=self.directory.name, delete=False) as file:
+            file.write(os.urandom(256 * 1024))
+        client = Rekono(self.url, 'test', agent=self.socket)
+        response = client.post('/api/wordlists/', filepath=file.name, progress=lambda sent, _: progress.append(sent))
+        self.assertEqual(201, response.status_code)
+        with open(file.name, 'rb') as content:
+            self.assertIn(content.read(), response.content)
+        self.assertGreater(len(progress), 1)                                    # Sent in chunks
+        self.assertEqual(set(), self.agent.urls)                                # Not forwarded by the agent
+
+    def test_retries(self) -> None:
+        '''Test agent applies retry policy of the client.'''
+        RekonoHandler.failures = 2
+        client = Rekono(self.url, 'test', agent=self.socket, backoff_factor=0, backoff_jitter=0)
+        self.assertEqual(200, cast(Response, client.get('/api/tools/1/')).status_code)
+        self.assertEqual(3, len(RekonoHandler.connections))
+        RekonoHandler.failures = 3
+        client = Rekono(self.url, 'test', agent=self.socket, retries=2, backoff_factor=0, backoff_jitter=0)
+        self.assertRaises(RequestError, client.get, '/api/tools/1/')
+
+    def test_request_error(self) -> None:
+        '''Test errors sending requests are reported to the client.'''
+        self.rekono.shutdown()
+        self.rekono.server_close()
+        client = Rekono(self.url, 'test', agent=self.socket, retries=0)
+        self.assertRaises(RequestError, client.get, '/api/tools/1/')
+
+    def test_agent_timeout(self) -> None:
+        '''Test requests fail when the agent doesn't respond, instead of waiting for it forever.'''
+        path = os.path.join(self.directory.name, 'hung.sock')
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as hung:         # Accepts but never responds
+            hung.bind(path)
+            hung.listen()
+            start = time.monotonic()
+            client = Rekono(self.url, 'test', agent=path, connect_timeout=0.1, read_timeout=0.1, retries=0)
+            self.assertRaises(RequestError, client.get, '/api/tools/1/')
+            client = Rekono(self.url, 'test', agent=path, deadline=0.2)
+            self.assertRaises(DeadlineError, client.get, '/api/tools/1/')
+            self.assertLess(time.monotonic() - start, 5)
+
+    def test_status(self) -> None:
+        '''Test status and stop of the agent.'''
+        Rekono(self.url, 'test', agent=self.socket).get('/api/tools/1/')
+        self.assertEqual(os.getpid(), (send_command('status', self.socket) or {})['pid'])
+        self.assertEqual([self.url], (send_command('status', self.socket) or {})['urls'])
+        send_command('stop', self.socket)
+        self.threads[1].join(5)
+        self.assertFalse(is_running(self.socket))
+        self.assertFalse(os.path.exists(self.socket))
+
+    def test_status_command(self) -> None:
+        '''Test "agent status" CLI command.'''
+        result = CliRunner().invoke(rekono, ['agent', 'status'], env={'REKONO_AGENT_SOCKET': self.socket})
+        self.assertEqual(0, result.exit_code)
+        self.assertEqual(f'Agent is running (PID {os.getpid()})\n', result.output)
+        send_command('stop', self.socket)
+        self.threads[1].join(5)
+        result = CliRunner().invoke(rekono, ['agent', 'status'], env={'REKONO_AGENT_SOCKET': self.socket})
+        self.assertEqual('Agent isn\'t running\n', result.output)
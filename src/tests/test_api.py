@@ -1,9 +1,13 @@
 '''Test "api" CLI command.'''
 
 import json
+import tempfile
 from unittest import mock
 
 import click
+from click.testing import CliRunner
+
+from rekono.main import rekono
 
 from tests.framework import RekonoCommandTest
 from tests.mock import RekonoMock
@@ -21,6 +25,62 @@ class ApiTest(RekonoCommandTest):
             'arguments': ['api', 'get', '--all-pages', '--no-verify', 'entities'],
             'output': RekonoCommandTest._json_body([RekonoMock.data, RekonoMock.data, RekonoMock.data])
         },
+        {
+            'arguments': ['api', 'get', '--all-pages', '--concurrency', '4', 'entities'],
+            'output': RekonoCommandTest._json_body([RekonoMock.data, RekonoMock.data, RekonoMock.data])
+        },
+        {
+            'arguments': ['api', 'get', '--all-pages', '--asyncio', '--concurrency', '4', 'entities'],
+            'output': RekonoCommandTest._json_body([RekonoMock.data, RekonoMock.data, RekonoMock.data])
+        },
+        {
+            'arguments': ['api', 'get', '--all-pages', '--asyncio', '--stream', 'entities'],
+            'output': (
+                'Usage: rekono api get [OPTIONS] ENDPOINT\n'
+                'Try \'rekono api get --help\' for help.\n\n'
+                'Error: --asyncio only retrieves whole listings, without ranges, shards, resume nor stream'
+            ),
+            'exit_code': 2,
+            'input_values': False
+        },
+        {
+            'arguments': ['api', 'get', '--all-pages', '--output-format', 'ndjson', 'entities'],
+            'output': RekonoCommandTest._ndjson_body([RekonoMock.data, RekonoMock.data, RekonoMock.data])
+        },
+        {
+            'arguments': ['api', 'get', '--output-format', 'ndjson', 'entities/1'],
+            'output': RekonoCommandTest._ndjson_body([RekonoMock.data])
+        },
+        {
+            'arguments': ['api', 'get', '--metrics', 'entities/1'],
+            'output': (
+                f'{RekonoCommandTest._json_body(RekonoMock.data)}\n'
+                f'Received {len(RekonoCommandTest._json_body(RekonoMock.data))} bytes '
+                f'({len(RekonoCommandTest._json_body(RekonoMock.data))} decoded, ratio 1.0) '
+                'in 1 responses, 0 compressed'
+            )
+        },
+        {
+            'arguments': ['api', 'get', '--shards', '4', '--limit', '10', 'entities'],
+            'output': (
+                'Usage: rekono api get [OPTIONS] ENDPOINT\n'
+                'Try \'rekono api get --help\' for help.\n\n'
+                'Error: Sharded exports can\'t be limited, skip items nor be resumed'
+            ),
+            'exit_code': 2,
+            'input_values': False
+        },
+        {
+            'arguments': ['api', 'get', '--all-pages', '--page-size', '5000', 'entities'],
+            'output': (
+                'Usage: rekono api get [OPTIONS] ENDPOINT\n'
+                'Try \'rekono api get --help\' for help.\n\n'
+                'Error: Invalid value for \'--page-size\': 5000 is not a page size between 1 and 1000, "auto" or '
+                '"auto:MIN-MAX"'
+            ),
+            'exit_code': 2,
+            'input_values': False
+        },
         {
             'arguments': ['api', 'get', '-u', 'invalidurl', 'entities/1'],
             'output': RekonoCommandTest._json_body(RekonoMock.data),
@@ -41,6 +101,10 @@ class ApiTest(RekonoCommandTest):
             'arguments': ['api', 'get', '--json', RekonoCommandTest.testing_filepath, 'entities/1'],
             'output': RekonoCommandTest._json_body(RekonoMock.data)
         },
+        {
+            'arguments': ['api', 'get', '--all-pages', '--json', RekonoCommandTest.testing_filepath, 'entities'],
+            'output': RekonoCommandTest._json_body([RekonoMock.data, RekonoMock.data, RekonoMock.data])
+        },
         {
             'arguments': [
                 'api', 'post', '-b', json.dumps(RekonoMock.data), '-h', 'key1=value1', '--no-verify', 'entities'
@@ -82,3 +146,70 @@ class ApiTest(RekonoCommandTest):
             ['api', 'get', '-h', 'key1=value1', '-h', 'key2=value2', '--no-verify', 'entities'],
             self._json_body([RekonoMock.data, RekonoMock.data, RekonoMock.data])
         )
+
+    @mock.patch('rekono.framework.commands.command.Rekono', RekonoMock)
+    def test_http_cache_opt_in(self) -> None:
+        '''Test on-disk HTTP cache is only used when it's enabled.'''
+        for arguments, env, calls in [
+            ([], {}, 0),
+            (['--cache'], {}, 1),
+            ([], {'REKONO_CACHE': 'true'}, 1),
+            (['--no-cache'], {'REKONO_CACHE': 'true'}, 0)
+        ]:
+            with mock.patch('rekono.framework.commands.command.HttpCache') as cache:
+                with tempfile.TemporaryDirectory() as cache_directory:         # Don't use user cache for testing
+                    result = CliRunner().invoke(
+                        rekono, ['api', 'get', '--all-pages', *arguments, 'entities'],
+                        input='test\n', env={'REKONO_CACHE_DIR': cache_directory, **env}
+                    )
+            self.assertEqual(0, result.exit_code)
+            self.assertEqual(calls, cache.call_count)
+
+    def test_page_size(self) -> None:
+        '''Test page sizes passed to Rekono API client to retrieve all pages.'''
+        arguments = ['api', 'get', '--all-pages', '--page-size', '500', 'entities']
+        page_size = self._get_client_call(arguments, 'iter_pages')['page_size']
+        self.assertEqual((500, False), (page_size.size, page_size.adaptive))
+        arguments = ['api', 'get', '--all-pages', '--page-size', 'auto:50-1000', 'entities']
+        page_size = self._get_client_call(arguments, 'iter_pages')['page_size']
+        self.assertEqual((True, 50, 1000), (page_size.adaptive, page_size.min_size, page_size.max_size))
+
+    def test_request_policy(self) -> None:
+        '''Test timeouts, deadline and retries passed to Rekono API client.'''
+        arguments = ['api', 'get', '--connect-timeout', '5', '--deadline', '30', '--retries', '2', 'entities/1']
+        client = self._get_client_call(arguments, '__init__')
+        self.assertEqual(
+            (5, 60, 30, 2), (client['connect_timeout'], client['read_timeout'], client['deadline'], client['retries'])
+        )
+
+    def test_count(self) -> None:
+        '''Test endpoint and query parameters used to get number of entities.'''
+        count = self._get_client_call(['api', 'get', '--count', '-p', 'severity=High', 'vulnerabilities'], 'count')
+        self.assertEqual(('vulnerabilities', {'severity': 'High'}), (count['endpoint'], count['parameters']))
+
+    def test_range(self) -> None:
+        '''Test limit and offset passed to Rekono API client to retrieve a range of items.'''
+        pages = self._get_client_call(['api', 'get', '--limit', '3', '--offset', '10', 'entities'], 'iter_pages')
+        self.assertEqual((3, 10), (pages['limit'], pages['offset']))
+
+    def test_shards(self) -> None:
+        '''Test shards passed to Rekono API client to retrieve a listing.'''
+        id_shards = self._get_client_call(['api', 'get', '--shards', '4', 'entities'], 'get_id_shards')
+        self.assertEqual(('entities', 4), (id_shards['endpoint'], id_shards['shards']))
+        shards = self._get_client_call(['api', 'get', '--shards', '4', 'entities'], 'iter_shards')
+        self.assertEqual((RekonoMock.get_id_shards(RekonoMock()), None), (shards['shards'], shards['concurrency']))
+        arguments = ['api', 'get', '--shards', 'project=1,2', '--concurrency', '2', 'entities']
+        shards = self._get_client_call(arguments, 'iter_shards')
+        self.assertEqual(([{'project': '1'}, {'project': '2'}], 2), (shards['shards'], shards['concurrency']))
+
+    def test_stream(self) -> None:
+        '''Test pages are requested with stream enabled only when it's required.'''
+        for arguments, stream in [([], False), (['--stream'], True)]:
+            pages = self._get_client_call(['api', 'get', '--all-pages', *arguments, 'entities'], 'iter_pages')
+            self.assertEqual(stream, pages['stream'])
+
+    def test_compression(self) -> None:
+        '''Test compressed responses are only requested when compression is enabled.'''
+        for arguments, compression in [([], True), (['--no-compression'], False)]:
+            client = self._get_client_call(['api', 'get', *arguments, 'entities/1'], '__init__')
+            self.assertEqual(compression, client['compression'])
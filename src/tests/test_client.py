@@ -0,0 +1,697 @@
+'''Test Rekono API client.'''
+
+import asyncio
+import gzip
+import hashlib
+import io
+import json
+import os
+import tempfile
+from typing import Any, Dict, List, Tuple, cast
+from unittest import TestCase, skipUnless
+
+import requests
+from requests.models import Request, Response
+from requests.structures import CaseInsensitiveDict
+from urllib3.response import HTTPResponse
+from urllib3.util import make_headers
+from urllib3.util.request import rewind_body
+
+from rekono.client.api import Rekono
+from rekono.client.async_api import AsyncRekono
+from rekono.client.cache import (CatalogCache, HttpCache, UploadIndex,
+                                 get_file_hash)
+from rekono.client.codec import JsonCodec, OrjsonCodec, get_codec
+from rekono.client.exceptions import DeadlineError, RequestError
+from rekono.client.multipart import MultipartEncoder
+from rekono.client.pagination import PageSize
+from rekono.client.retry import RekonoRetry
+from rekono.client.stream import ResultsParser
+
+
+class PaginatedDataTest(TestCase):
+    '''Base test with paginated testing data.'''
+
+    url = 'https://rekono.test'                                                 # Rekono base URL for testing
+    count = 250                                                                 # Total number of testing items
+    requested_pages: List[int] = []                                             # Page numbers requested to the API
+
+    def _paginated_response(self, url: str, params: Dict[str, Any], **kwargs: Any) -> Response:
+        '''Mock paginated GET request to Rekono API.
+
+        Args:
+            url (str): Requested URL.
+            params (Dict[str, Any]): Query parameters, including pagination ones.
+
+        Returns:
+            Response: HTTP response with the requested page.
+        '''
+        page, size = params['page'], params['size']
+        self.requested_pages.append(page)
+        response = Response()
+        response.request = Request(method='GET', url=url).prepare()
+        response.status_code = 200
+        body = json.dumps({
+            'count': self.count,
+            'results': [{'id': i} for i in range((page - 1) * size, min(page * size, self.count))]
+        }).encode()
+        if page > 1 and (page - 1) * size >= self.count:                        # Page after the last one
+            response.status_code = 404
+            body = json.dumps({'detail': 'Invalid page.'}).encode()
+        if kwargs.get('stream'):                                                # Body is received when consumed
+            response.raw = io.BytesIO(body)
+        else:
+            response._content = body
+        return response
+
+    def _items(self, responses: List[Response]) -> List[int]:
+        '''Get item Ids from paginated responses.
+
+        Args:
+            responses (List[Response]): Paginated HTTP responses.
+
+        Returns:
+            List[int]: Item Ids in the order they were returned.
+        '''
+        return [item['id'] for response in responses for item in response.json()['results']]
+
+
+class RekonoClientTest(PaginatedDataTest):
+    '''Test Rekono API client.'''
+
+    def setUp(self) -> None:
+        '''Create Rekono API client whose HTTP session returns paginated testing data.'''
+        self.client = Rekono(self.url, 'test')
+        self.requested_pages = []
+        self.client.session.get = self._paginated_response                      # type: ignore
+
+    def test_pagination(self) -> None:
+        '''Test sequential pagination over all API pages.'''
+        responses = self.client.get('/api/entities/', pagination=True)
+        self.assertEqual(list(range(self.count)), self._items(responses))       # type: ignore
+        self.assertEqual([1, 2, 3], self.requested_pages)
+
+    def test_offset_past_end(self) -> None:
+        '''Test ranges that start after the last item don't return the error of the invalid page.'''
+        for offset, limit, stream in [(self.count, None, False), (500, 5, False), (300, None, True)]:
+            items = self.client.iter_items('/api/entities/', offset=offset, limit=limit, stream=stream)
+            self.assertEqual([], list(items))
+        items = self.client.iter_items('/api/entities/', offset=self.count - 5, limit=10, page_size=5)
+        self.assertEqual(list(range(self.count - 5, self.count)), [item['id'] for item in items])
+
+    def test_error_page_in_range(self) -> None:
+        '''Test failed requests in the middle of a range are returned instead of ending the range silently.'''
+        def failed_second_page(url: str, params: Dict[str, Any], **kwargs: Any) -> Response:
+            response = self._paginated_response(url, params, **kwargs)
+            if params['page'] == 2:
+                response.status_code = 400
+            return response
+
+        self.client.session.get = failed_second_page                            # type: ignore
+        for stream in [False, True]:
+            responses = list(self.client.iter_pages('/api/entities/', limit=200, stream=stream))
+            self.assertEqual([200, 400], [response.status_code for response in responses])
+        responses = list(self.client.iter_pages('/api/entities/', offset=100, limit=100))
+        self.assertEqual([400], [response.status_code for response in responses])
+
+    def test_limit(self) -> None:
+        '''Test pagination stops after the limit, shrinking the last page.'''
+        responses = self.client.get('/api/entities/', limit=50)
+        self.assertEqual(list(range(50)), self._items(responses))               # type: ignore
+        self.assertEqual([1], self.requested_pages)
+
+    def test_offset_and_limit(self) -> None:
+        '''Test only the pages that contain the range of items are retrieved.'''
+        responses = self.client.get('/api/entities/', offset=7, limit=50)
+        self.assertEqual(list(range(7, 57)), self._items(responses))            # type: ignore
+        self.assertEqual([1], self.requested_pages)
+        self.requested_pages.clear()
+        responses = self.client.get('/api/entities/', offset=150, limit=500)
+        self.assertEqual(list(range(150, 250)), self._items(responses))         # type: ignore
+        self.assertEqual([2, 5], self.requested_pages)                          # Second page is shrunk to 50 items
+
+    def test_streamed_items(self) -> None:
+        '''Test items are decoded while pages are received, and the total count is still available.'''
+        items = [item['id'] for item in self.client.iter_items('/api/entities/', stream=True)]
+        self.assertEqual(list(range(self.count)), items)
+        self.assertEqual([1, 2, 3], self.requested_pages)
+        self.requested_pages.clear()
+        items = [item['id'] for item in self.client.iter_items('/api/entities/', offset=100, stream=True)]
+        self.assertEqual(list(range(100, self.count)), items)
+        self.assertEqual([2, 5], self.requested_pages)                          # Last page is shrunk to 50 items
+
+    def _compressed_response(self, url: str, params: Dict[str, Any], **kwargs: Any) -> Response:
+        '''Mock paginated GET request to Rekono API whose body is compressed with gzip.
+
+        Args:
+            url (str): Requested URL.
+            params (Dict[str, Any]): Query parameters, including pagination ones.
+
+        Returns:
+            Response: HTTP response with the requested page, whose body is decompressed when it's received.
+        '''
+        response = self._paginated_response(url, params)
+        body = gzip.compress(cast(bytes, response._content))
+        response._content = False                                               # type: ignore
+        response.headers = CaseInsensitiveDict({'Content-Encoding': 'gzip', 'Content-Length': str(len(body))})
+        response.raw = HTTPResponse(
+            body=io.BytesIO(body), headers=response.headers, status=200, preload_content=False, decode_content=True
+        )
+        if not kwargs.get('stream'):
+            response.content                                                    # Body is received with response
+        return response
+
+    def test_compressed_responses(self) -> None:
+        '''Test compressed bodies are decoded while received and counted before and after decompression.'''
+        self.client.session.get = self._compressed_response                     # type: ignore
+        items = [item['id'] for item in self.client.iter_items('/api/entities/', stream=True)]
+        self.assertEqual(list(range(self.count)), items)
+        self.assertEqual(list(range(self.count)), self._items(self.client.get('/api/entities/', pagination=True)))  # type: ignore  # noqa: E501
+        metrics = self.client.metrics.to_dict()
+        self.assertEqual(6, metrics['responses'])
+        self.assertEqual(6, metrics['compressed_responses'])
+        self.assertLess(metrics['received_bytes'], metrics['decoded_bytes'])
+        self.assertGreater(metrics['compression_ratio'], 1)
+
+    def test_no_compression(self) -> None:
+        '''Test compression can be disabled, unless Accept-Encoding header is set.'''
+        self.assertEqual('identity', Rekono(self.url, 'test', compression=False).headers['Accept-Encoding'])
+        client = Rekono(self.url, 'test', headers={'accept-encoding': 'br'})
+        self.assertEqual({'accept-encoding': 'br', 'Authorization': 'Token test'}, client.headers)
+
+    def test_count(self) -> None:
+        '''Test number of items is retrieved with one request of one item.'''
+        self.assertEqual(self.count, self.client.count('/api/entities/'))
+        self.assertEqual([1], self.requested_pages)
+
+    def _filtered_response(self, url: str, params: Dict[str, Any], **kwargs: Any) -> Response:
+        '''Mock paginated GET request to Rekono API that supports ID filters and ordering.
+
+        Args:
+            url (str): Requested URL.
+            params (Dict[str, Any]): Query parameters, including pagination ones.
+
+        Returns:
+            Response: HTTP response with the requested page.
+        '''
+        ids = [i for i in range(self.count) if params.get('id__gte', 0) <= i <= params.get('id__lte', self.count)]
+        ids = list(reversed(ids)) if params.get('o') == '-id' else ids
+        page, size = params['page'], params['size']
+        self.requested_pages.append(page)
+        response = Response()
+        response.request = Request(method='GET', url=url).prepare()
+        response.status_code = 200
+        response._content = json.dumps({
+            'count': len(ids),
+            'results': [{'id': i} for i in ids[(page - 1) * size:page * size]]
+        }).encode()
+        return response
+
+    def test_id_shards(self) -> None:
+        '''Test listing is split into ID ranges that are retrieved at the same time without repeating items.'''
+        self.client.session.get = self._filtered_response                       # type: ignore
+        shards = self.client.get_id_shards('/api/entities/', shards=4)
+        self.assertEqual({'id__gte': 0, 'id__lte': 62}, shards[0])
+        self.assertEqual({'id__gte': 189, 'id__lte': 249}, shards[-1])
+        self.requested_pages.clear()
+        responses = list(self.client.iter_shards('/api/entities/', shards, page_size=50))
+        self.assertEqual(list(range(self.count)), sorted(self._items(responses)))
+        self.assertEqual([1, 1, 1, 1, 2, 2, 2, 2], sorted(self.requested_pages))   # Only shallow pages
+
+    def test_id_shards_not_supported(self) -> None:
+        '''Test listing isn't split if Rekono ignores ID filters.'''
+        self.client.session.get = lambda url, params, **kwargs: self._filtered_response(   # type: ignore
+            url, {k: v for k, v in params.items() if not k.startswith('id__')}, **kwargs
+        )
+        self.assertEqual([{}], self.client.get_id_shards('/api/entities/', shards=4))
+
+    def test_shard_error(self) -> None:
+        '''Test errors retrieving a shard are raised to the consumer.'''
+        def fail(url: str, params: Dict[str, Any], **kwargs: Any) -> Response:
+            if params.get('project') == 2:
+                raise requests.exceptions.ConnectionError('Connection reset by peer')
+            return self._paginated_response(url, params, **kwargs)
+        self.client.session.get = fail                                          # type: ignore
+        with self.assertRaises(RequestError):
+            list(self.client.iter_shards('/api/entities/', [{'project': 1}, {'project': 2}]))
+
+    def test_concurrent_pagination(self) -> None:
+        '''Test concurrent pagination over all API pages keeps the page order.'''
+        responses = self.client.get('/api/entities/', pagination=True, concurrency=3)
+        self.assertEqual(list(range(self.count)), self._items(responses))       # type: ignore
+        self.assertEqual([1, 2, 3], sorted(self.requested_pages))
+
+    def test_adaptive_page_size(self) -> None:
+        '''Test page size grows with fast responses without skipping or repeating items.'''
+        self.count = 1000
+        responses = self.client.get('/api/entities/', pagination=True, page_size=PageSize(adaptive=True))
+        self.assertEqual(list(range(self.count)), self._items(responses))       # type: ignore
+        self.assertEqual(5, len(self.requested_pages))                          # Page sizes 100, 100, 200, 400, 800
+
+    def test_adaptive_page_size_decrease(self) -> None:
+        '''Test page size decreases with slow responses without skipping or repeating items.'''
+        page_size = PageSize(adaptive=True, target_time=0)
+        responses = self.client.get('/api/entities/', pagination=True, page_size=page_size)
+        self.assertEqual(list(range(self.count)), self._items(responses))       # type: ignore
+        self.assertEqual(25, page_size.size)                                    # Minimum size reachable by halving
+
+    def test_request_headers(self) -> None:
+        '''Test request headers are built for each request without changing the shared client headers.'''
+        sent_headers: List[Dict[str, str]] = []
+        self.client.session.post = lambda url, headers, **kwargs: sent_headers.append(headers) or Response()    # type: ignore  # noqa: E501
+        self.client.post('/api/entities/', filepath=__file__)
+        self.client.post('/api/entities/', body='{}')
+        self.assertTrue(sent_headers[0]['Content-Type'].startswith('multipart/form-data; boundary='))
+        self.assertEqual('application/json', sent_headers[1]['Content-Type'])
+        self.assertEqual(
+            {'Authorization': 'Token test', 'Accept-Encoding': make_headers(accept_encoding=True)['accept-encoding']},
+            self.client.headers
+        )
+
+    def test_connection_pool_size(self) -> None:
+        '''Test HTTP connection pool can be sized for multiple threads.'''
+        client = Rekono(self.url, 'test', pool_maxsize=20)
+        self.assertEqual(20, client.session.get_adapter(self.url)._pool_maxsize)    # type: ignore
+
+    def test_request_timeout(self) -> None:
+        '''Test connect and read timeouts are sent in all requests, limited by the deadline.'''
+        timeouts: List[Any] = []
+        client = Rekono(self.url, 'test', connect_timeout=5, read_timeout=30, deadline=20)
+        client.session.get = lambda url, timeout, **kwargs: timeouts.append(timeout) or Response()    # type: ignore  # noqa: E501
+        client.get('/api/entities/')
+        self.assertEqual(5, timeouts[0][0])
+        self.assertTrue(19 < timeouts[0][1] <= 20)
+
+    def test_request_error(self) -> None:
+        '''Test request errors after all retries are reported.'''
+        def fail(*args: Any, **kwargs: Any) -> Response:
+            raise requests.exceptions.ConnectionError('Connection refused')
+        self.client.session.get = fail                                          # type: ignore
+        self.assertRaises(RequestError, self.client.get, '/api/entities/')
+
+    def test_partial_upload_not_retried(self) -> None:
+        '''Test uploads that fail after sending some bytes aren't retried with the rest of the body.'''
+        def fail(url: str, data: MultipartEncoder, **kwargs: Any) -> Response:
+            data.read(100)
+            rewind_body(cast(Any, data), 0)                                     # Rewind made by urllib3 before retries
+            return Response()
+        self.client.session.post = fail                                         # type: ignore
+        with self.assertRaises(RequestError) as context:
+            self.client.post('/api/entities/', filepath=__file__)
+        self.assertIn('Upload can\'t be retried after sending 100 of', context.exception.message)
+
+    def test_deadline(self) -> None:
+        '''Test requests aren't made after the deadline.'''
+        client = Rekono(self.url, 'test', deadline=0)
+        client.session.get = self._paginated_response                           # type: ignore
+        self.assertRaises(DeadlineError, client.get, '/api/entities/')
+
+    def test_retry_policy(self) -> None:
+        '''Test retry policy adds jitter to backoff and doesn't wait after the deadline.'''
+        retry = RekonoRetry(total=3, backoff_factor=0, jitter=0.5).new()
+        self.assertTrue(0 <= retry.get_backoff_time() <= 0.5)
+        retry.deadline = 0
+        response = Response()
+        response.status = 503                                                   # type: ignore
+        response.headers['Retry-After'] = '60'
+        self.assertRaises(DeadlineError, retry.sleep, response)
+
+    def test_iter_items(self) -> None:
+        '''Test iteration over items retrieves pages as they are consumed.'''
+        items = self.client.iter_items('/api/entities/')
+        self.assertEqual({'id': 0}, next(items))
+        self.assertEqual([1], self.requested_pages)                             # Only first page has been requested
+        self.assertEqual(list(range(1, self.count)), [item['id'] for item in items])
+        self.assertEqual([1, 2, 3], self.requested_pages)
+
+
+class CodecTest(TestCase):
+    '''Test JSON codecs.'''
+
+    data = {                                                                    # Data with special cases for codecs
+        'id': 1, 'name': 'Ñandú ☃ 😀', 'output': 'line 1\nline 2\t"quoted"\x7f\\', 'big': 2 ** 70,
+        'nested': {'list': [1, 2.5, None, True, {}], 'empty': []}, 'tags': []
+    }
+
+    @skipUnless(OrjsonCodec.is_available(), 'orjson isn\'t installed')
+    def test_same_output(self) -> None:
+        '''Test all codecs encode the same documents.'''
+        for data in [self.data, [self.data, 1], {1: 'integer key'}, 'text']:
+            self.assertEqual(JsonCodec().dumps(data), OrjsonCodec().dumps(data))
+            for indent in [2, 4]:
+                self.assertEqual(JsonCodec().dumps_pretty(data, indent), OrjsonCodec().dumps_pretty(data, indent))
+
+    @skipUnless(OrjsonCodec.is_available(), 'orjson isn\'t installed')
+    def test_same_escaping(self) -> None:
+        '''Test all codecs escape DEL and non BMP characters in the same way, without falling back to json.'''
+        data = {'output': 'DEL \x7f, non BMP \U0001f600 \U00010348, BMP \u00f1 \uffff'}
+        self.assertEqual(JsonCodec().dumps(data), OrjsonCodec().dumps(data))
+        self.assertEqual(JsonCodec().dumps_pretty(data), OrjsonCodec().dumps_pretty(data))
+        self.assertIn('\\u007f', OrjsonCodec().dumps_pretty(data))
+        self.assertIn('\\ud83d\\ude00', OrjsonCodec().dumps_pretty(data))
+
+    def test_loads(self) -> None:
+        '''Test codecs decode bytes and text.'''
+        for codec in [get_codec('json'), get_codec()]:
+            encoded = codec.dumps(self.data)
+            self.assertEqual(self.data, codec.loads(encoded))
+            self.assertEqual(self.data, codec.loads(encoded.encode()))
+            self.assertRaises(ValueError, codec.loads, b'{"invalid"')
+
+    def test_get_codec(self) -> None:
+        '''Test requested codec is used only if it's installed.'''
+        self.assertIsInstance(get_codec('json'), JsonCodec)
+        fastest = OrjsonCodec if OrjsonCodec.is_available() else JsonCodec
+        self.assertIs(fastest, type(get_codec()))
+        self.assertIs(fastest, type(get_codec('unknown')))
+
+
+class MultipartEncoderTest(TestCase):
+    '''Test streaming multipart encoding of file uploads.'''
+
+    fields = {'name': 'Wordlist ñ', 'type': 'Password', 'tags': ['a', 'b'], 'empty': None}   # Testing form fields
+
+    def test_same_body_as_requests(self) -> None:
+        '''Test body is the same multipart form encoded by requests, read in bounded chunks.'''
+        progress: List[Tuple[int, int]] = []
+        form = MultipartEncoder(__file__, self.fields, chunk_size=1000, progress=lambda *args: progress.append(args))
+        with form:
+            chunks = list(form)
+        with open(__file__, 'rb') as file:
+            request = Request('POST', 'https://rekono.test', data=self.fields, files={'file': file}).prepare()
+        boundary = cast(str, request.headers['Content-Type']).split('boundary=')[1]
+        self.assertEqual(cast(bytes, request.body).replace(boundary.encode(), form.boundary.encode()), b''.join(chunks))
+        self.assertTrue(all(len(chunk) <= 1000 for chunk in chunks))
+        self.assertEqual((len(form), len(form)), progress[-1])
+        self.assertEqual(len(chunks), len(progress))
+
+    def test_rewind(self) -> None:
+        '''Test body can only be rewound before sending any bytes.'''
+        with MultipartEncoder(__file__) as form:
+            self.assertEqual(0, form.seek(0))                                   # Retry before sending the body
+            form.read(10)
+            self.assertRaises(OSError, form.seek, 0)
+            self.assertEqual(len(form) - 10, len(form.read()))
+            self.assertEqual(b'', form.read(10))
+
+
+class ResultsParserTest(TestCase):
+    '''Test incremental parser of Rekono API responses.'''
+
+    def _parse(self, body: bytes, chunk_size: int = 1) -> Tuple[List[Any], Any]:
+        '''Parse body in chunks.
+
+        Args:
+            body (bytes): Response body.
+            chunk_size (int, optional): Number of bytes of each chunk. Defaults to 1.
+
+        Returns:
+            Tuple[List[Any], Any]: Results items and body without them.
+        '''
+        parser = ResultsParser()
+        items = [item for i in range(0, len(body), chunk_size) for item in parser.feed(body[i:i + chunk_size])]
+        return items, parser.close()
+
+    def test_results(self) -> None:
+        '''Test results items are decoded, although their strings include JSON tokens and escaped characters.'''
+        results = [{'id': 1, 'output': 'a "quoted" [list], {object}\\'}, {'id': 2, 'results': [1, 2]}, 3, 'ñ']
+        body = {'count': 4, 'previous': 'results', 'results': results, 'next': None}
+        for chunk_size in [1, 7, 1024]:
+            self.assertEqual((results, {**body, 'results': []}), self._parse(json.dumps(body).encode(), chunk_size))
+        self.assertEqual(([], {'count': 0, 'results': []}), self._parse(b'{"count": 0, "results": [ ]}'))
+
+    def test_items_released(self) -> None:
+        '''Test decoded items are discarded from the buffer.'''
+        parser = ResultsParser()
+        self.assertEqual([{'id': 1}], parser.feed(b'{"count": 2, "results": [{"id": 1}, {"id"'))
+        self.assertEqual(b' {"id"', bytes(parser.buffer))
+
+    def test_body_without_results(self) -> None:
+        '''Test bodies without results list are decoded at the end.'''
+        for body in [[{'id': 1}], {'id': 1, 'results': None}, ['results', [1]]]:
+            self.assertEqual(([], body), self._parse(json.dumps(body).encode()))
+
+    def test_incomplete_body(self) -> None:
+        '''Test incomplete bodies are invalid.'''
+        parser = ResultsParser()
+        parser.feed(b'{"results": [{"id": 1}, {"id": "')
+        self.assertRaises(ValueError, parser.close)
+
+
+class HttpCacheTest(TestCase):
+    '''Test conditional GET requests using the on-disk HTTP cache.'''
+
+    url = 'https://rekono.test'                                                 # Rekono base URL for testing
+    etag = '"v1"'                                                               # Current version of testing data
+
+    def setUp(self) -> None:
+        '''Create Rekono API client with HTTP cache in a temporal directory.'''
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = HttpCache(self.directory.name)
+        self.client = Rekono(self.url, 'test', cache=self.cache)
+        self.sent_headers: List[Dict[str, str]] = []
+        self.client.session.get = self._conditional_response                    # type: ignore
+
+    def tearDown(self) -> None:
+        '''Remove HTTP cache directory.'''
+        self.directory.cleanup()
+
+    def _conditional_response(self, url: str, headers: Dict[str, str], **kwargs: Any) -> Response:
+        '''Mock GET request to Rekono API that supports ETag validation.
+
+        Args:
+            url (str): Requested URL.
+            headers (Dict[str, str]): Request headers.
+
+        Returns:
+            Response: Not modified response if the ETag matches, or full response if not.
+        '''
+        self.sent_headers.append(headers)
+        response = Response()
+        response.request = Request(method='GET', url=url).prepare()
+        response.headers['ETag'] = self.etag
+        if headers.get('If-None-Match') == self.etag:
+            response.status_code = 304
+            response._content = b''
+        else:
+            response.status_code = 200
+            response._content = json.dumps({'version': self.etag}).encode()
+        return response
+
+    def test_not_modified_response(self) -> None:
+        '''Test cached body is returned when the server confirms it's not modified.'''
+        self.assertEqual({'version': '"v1"'}, cast(Response, self.client.get('/api/entities/')).json())
+        response = cast(Response, self.client.get('/api/entities/'))
+        self.assertEqual(200, response.status_code)
+        self.assertEqual({'version': '"v1"'}, response.json())
+        self.assertNotIn('If-None-Match', self.sent_headers[0])
+        self.assertEqual('"v1"', self.sent_headers[1]['If-None-Match'])
+
+    def test_modified_response(self) -> None:
+        '''Test cached body is replaced when data changes.'''
+        self.client.get('/api/entities/')
+        self.etag = '"v2"'
+        self.assertEqual({'version': '"v2"'}, cast(Response, self.client.get('/api/entities/')).json())
+        self.assertEqual({'version': '"v2"'}, cast(Response, self.client.get('/api/entities/')).json())
+        self.assertEqual('"v2"', self.sent_headers[2]['If-None-Match'])
+
+    def test_different_token(self) -> None:
+        '''Test cached responses aren't shared between API tokens.'''
+        self.client.get('/api/entities/')
+        client = Rekono(self.url, 'other', cache=self.cache)
+        client.session.get = self._conditional_response                         # type: ignore
+        client.get('/api/entities/')
+        self.assertNotIn('If-None-Match', self.sent_headers[1])
+
+    def test_least_recently_used_eviction(self) -> None:
+        '''Test least recently used responses are removed when the cache exceeds its maximum size.'''
+        self.client.get('/api/first/')
+        first = os.path.join(self.directory.name, os.listdir(self.directory.name)[0])
+        os.utime(first, (0, 0))                                                 # First response is the oldest one
+        self.cache.max_size = os.path.getsize(first)
+        self.client.get('/api/second/')
+        self.assertEqual(1, len(os.listdir(self.directory.name)))
+        self.assertFalse(os.path.isfile(first))
+        self.client.get('/api/second/')
+        self.assertEqual('"v1"', self.sent_headers[2]['If-None-Match'])         # Second response is still cached
+
+
+class CatalogCacheTest(TestCase):
+    '''Test on-disk cache of Rekono catalogs.'''
+
+    url = 'https://rekono.test'                                                 # Rekono base URL for testing
+    headers = {'Authorization': 'Token test'}                                   # Request headers for testing
+
+    def setUp(self) -> None:
+        '''Create catalog cache in a temporal directory.'''
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = CatalogCache(self.directory.name)
+        self.response = Response()
+        self.response.url = self.url + '/api/tools/?page=1&size=100'
+        self.response.status_code = 200
+        self.response._content = json.dumps({'count': 1, 'results': [{'id': 1}]}).encode()
+
+    def tearDown(self) -> None:
+        '''Remove catalog cache directory.'''
+        self.directory.cleanup()
+
+    def test_load(self) -> None:
+        '''Test cached catalog is returned until its time to live expires.'''
+        self.cache.save(self.url, '/api/tools/', self.headers, [self.response])
+        responses = self.cache.load(self.url, '/api/tools/', self.headers, 60)
+        self.assertEqual([self.response.json()], [response.json() for response in responses or []])
+        self.assertIsNone(self.cache.load(self.url, '/api/tools/', {'Authorization': 'Token other'}, 60))
+        self.assertIsNone(self.cache.load(self.url, '/api/tools/', self.headers, -1))
+
+    def test_invalidate(self) -> None:
+        '''Test cached catalog is discarded after modifying its entities.'''
+        self.cache.save(self.url, '/api/processes/', self.headers, [self.response])
+        self.cache.save(self.url, '/api/steps/', self.headers, [self.response])
+        self.cache.invalidate('/api/processes/')
+        self.assertIsNone(self.cache.load(self.url, '/api/processes/', self.headers, 60))
+        self.assertIsNotNone(self.cache.load(self.url, '/api/steps/', self.headers, 60))
+
+    def test_failed_response(self) -> None:
+        '''Test catalog isn't cached if any page can't be retrieved.'''
+        self.response.status_code = 500
+        self.cache.save(self.url, '/api/tools/', self.headers, [self.response])
+        self.assertIsNone(self.cache.load(self.url, '/api/tools/', self.headers, 60))
+
+
+@skipUnless(AsyncRekono.is_available(), 'aiohttp is not installed')
+class AsyncRekonoClientTest(PaginatedDataTest):
+    '''Test Rekono asynchronous API client.'''
+
+    def setUp(self) -> None:
+        '''Create Rekono asynchronous API client whose HTTP requests return paginated testing data.'''
+        self.client = AsyncRekono(self.url, 'test')
+        self.requested_pages = []
+        self.client._send = self._send                                          # type: ignore
+
+    async def _send(self, method: str, url: str, params: Dict[str, Any], **kwargs: Any) -> Response:
+        '''Mock asynchronous HTTP request to Rekono API.
+
+        Args:
+            method (str): HTTP method.
+            url (str): Requested URL.
+            params (Dict[str, Any]): Query parameters, including pagination ones.
+
+        Returns:
+            Response: HTTP response with the requested page.
+        '''
+        await asyncio.sleep(0)
+        return self._paginated_response(url, {key: int(value) for key, value in params.items()})
+
+    def test_pagination(self) -> None:
+        '''Test sequential pagination over all API pages.'''
+        responses = cast(List[Response], asyncio.run(self.client.get('/api/entities/', pagination=True)))
+        self.assertEqual(list(range(self.count)), self._items(responses))
+        self.assertEqual([1, 2, 3], self.requested_pages)
+
+    def test_concurrent_pagination(self) -> None:
+        '''Test concurrent pagination over all API pages keeps the page order.'''
+        responses = cast(List[Response], asyncio.run(self.client.get('/api/entities/', pagination=True, concurrency=3)))
+        self.assertEqual(list(range(self.count)), self._items(responses))
+        self.assertEqual([1, 2, 3], sorted(self.requested_pages))
+
+    def test_iter_items(self) -> None:
+        '''Test asynchronous iteration over items.'''
+        async def collect() -> List[int]:
+            return [item['id'] async for item in self.client.iter_items('/api/entities/')]
+        self.assertEqual(list(range(self.count)), asyncio.run(collect()))
+
+    def test_retries(self) -> None:
+        '''Test failed requests are retried, honoring Retry-After header, until they succeed.'''
+        responses = [Response(), Response()]
+        responses[0].status_code = 503
+        responses[0].headers['Retry-After'] = '0'
+        responses[1].status_code = 200
+
+        async def send(*args: Any, **kwargs: Any) -> Response:
+            return responses.pop(0)
+        self.client._send = send                                                # type: ignore
+        self.assertEqual(200, cast(Response, asyncio.run(self.client.get('/api/entities/'))).status_code)
+
+    def test_request_error(self) -> None:
+        '''Test request errors after all retries are reported.'''
+        client = AsyncRekono(self.url, 'test', retries=1, backoff_factor=0, backoff_jitter=0)
+
+        async def fail(*args: Any, **kwargs: Any) -> Response:
+            raise asyncio.TimeoutError()
+        client._send = fail                                                     # type: ignore
+        self.assertRaises(RequestError, asyncio.run, client.get('/api/entities/'))
+
+    def test_retries_exhausted(self) -> None:
+        '''Test failed responses after all retries are reported as errors, instead of being returned as data.'''
+        client = AsyncRekono(self.url, 'test', retries=2, backoff_factor=0, backoff_jitter=0)
+        requests: List[str] = []
+
+        async def unavailable(method: str, *args: Any, **kwargs: Any) -> Response:
+            requests.append(method)
+            response = Response()
+            response.status_code = 503
+            response._content = b'<html>Service Unavailable</html>'
+            return response
+        client._send = unavailable                                              # type: ignore
+        self.assertRaises(RequestError, asyncio.run, client.get('/api/entities/'))
+        self.assertEqual(['GET', 'GET', 'GET'], requests)
+        self.assertEqual(503, asyncio.run(client.post('/api/entities/', '{}')).status_code)   # Not retried
+
+    def test_put_file(self) -> None:
+        '''Test files are sent as multipart form by PUT requests, like by POST requests.'''
+        requests: List[Tuple[str, Any]] = []
+
+        async def send(method: str, url: str, data: Any, **kwargs: Any) -> Response:
+            requests.append((method, data))
+            response = Response()
+            response.status_code = 200
+            return response
+        self.client._send = send                                                # type: ignore
+        asyncio.run(self.client.put('/api/wordlists/1/', '{"name": "Wordlist"}', os.path.realpath(__file__)))
+        method, form = requests[0]
+        self.assertEqual('PUT', method)
+        self.assertEqual(['name', 'file'], [field[0]['name'] for field in form._fields])
+
+    def test_iter_pages_blocking(self) -> None:
+        '''Test iteration over API pages from synchronous code.'''
+        responses = self.client.iter_pages_blocking('/api/entities/', concurrency=2)
+        self.assertEqual(list(range(self.count)), self._items(list(responses)))
+
+
+class UploadIndexTest(TestCase):
+    '''Test on-disk index of uploaded files by content hash.'''
+
+    url = 'https://rekono.test'                                                 # Rekono base URL for testing
+
+    def setUp(self) -> None:
+        '''Create upload index in a temporal directory.'''
+        self.directory = tempfile.TemporaryDirectory()
+        self.index = UploadIndex(self.directory.name)
+
+    def tearDown(self) -> None:
+        '''Remove upload index directory.'''
+        self.directory.cleanup()
+
+    def test_file_hash(self) -> None:
+        '''Test content hash is the same when the file is read in chunks.'''
+        filepath = os.path.join(self.directory.name, 'wordlist.txt')
+        content = b'\n'.join(f'word{i}'.encode() for i in range(10000))
+        for data in [content, b'']:
+            with open(filepath, 'wb') as file:
+                file.write(data)
+            self.assertEqual(hashlib.sha256(data).hexdigest(), get_file_hash(filepath, chunk_size=1000))
+
+    def test_index(self) -> None:
+        '''Test uploaded files are saved by Rekono instance, endpoint and entity name.'''
+        self.assertIsNone(self.index.get(self.url, '/api/wordlists/', 'Wordlist'))
+        self.index.save(self.url, '/api/wordlists/', 'Wordlist', 1, 'hash')
+        self.index.save(self.url, '/api/wordlists/', 'Other', 2, 'other', {'name': 'Other', 'type': 'Subdomain'})
+        self.assertEqual(
+            {'id': 1, 'hash': 'hash', 'fields': {}}, self.index.get(self.url, '/api/wordlists/', 'Wordlist')
+        )
+        self.assertEqual(
+            {'id': 2, 'hash': 'other', 'fields': {'name': 'Other', 'type': 'Subdomain'}},
+            self.index.get(self.url, '/api/wordlists/', 'Other')
+        )
+        self.assertIsNone(self.index.get('https://other.test', '/api/wordlists/', 'Wordlist'))
+        self.assertIsNone(self.index.get(self.url, '/api/other/', 'Wordlist'))
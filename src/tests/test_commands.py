@@ -0,0 +1,70 @@
+'''Test construction of Rekono CLI commands.'''
+
+import os
+import tempfile
+from typing import List, cast
+from unittest import TestCase, mock
+
+import click
+from click.testing import CliRunner
+
+from rekono.client.cache import CatalogCache
+from rekono.commands.processes import processes
+from rekono.commands.steps import steps
+from rekono.framework.commands.entity import EntityCommand
+from rekono.main import rekono
+from tests.mock import RekonoMock
+
+
+class CommandTableTest(TestCase):
+    '''Test construction of Rekono CLI commands.'''
+
+    def _get_options(self, group: click.MultiCommand, cmd_name: str) -> List[str]:
+        '''Get option names of a command.
+
+        Args:
+            group (click.MultiCommand): Click group.
+            cmd_name (str): Command name.
+
+        Returns:
+            List[str]: Option names.
+        '''
+        command = group.get_command(click.Context(group), cmd_name)
+        return [cast(str, param.name) for param in command.params] if command else []
+
+    def test_commands_are_built_once(self) -> None:
+        '''Test resolution of the same command returns the same object without stacking options.'''
+        options = self._get_options(processes, 'create')
+        ctx = click.Context(processes)
+        self.assertIs(processes.get_command(ctx, 'create'), processes.get_command(ctx, 'create'))
+        self.assertEqual(options, self._get_options(processes, 'create'))
+        self.assertEqual(len(options), len(set(options)))
+
+    def test_base_commands_are_not_modified(self) -> None:
+        '''Test options of one group aren't added to the commands of other groups.'''
+        self.assertNotIn('tool_id', self._get_options(processes, 'create'))
+        self.assertIn('tool_id', self._get_options(steps, 'create'))
+        self.assertNotIn('tool_id', self._get_options(processes, 'update'))
+        self.assertNotIn('url', [param.name for param in EntityCommand.post_entity.params])
+
+
+class CatalogInvalidationTest(TestCase):
+    '''Test cached catalogs are discarded after modifying their entities.'''
+
+    @mock.patch('rekono.framework.commands.command.Rekono', RekonoMock)
+    def test_related_catalogs(self) -> None:
+        '''Test modifying steps also discards the processes catalog, because processes embed their steps.'''
+        response = RekonoMock()._response_factory('GET', 200, {'count': 1, 'results': [RekonoMock.data]})
+        response.url = f'{RekonoMock.url}/api/entities/'
+        with tempfile.TemporaryDirectory() as directory:
+            cache = CatalogCache(os.path.join(directory, 'catalogs'))
+            for endpoint in ['/api/processes/', '/api/steps/', '/api/tools/']:
+                cache.save(RekonoMock.url, endpoint, {}, [response])
+            result = CliRunner().invoke(
+                rekono, ['steps', 'create', '-p', '1', '-t', '1', '-c', '1'],
+                input='test\n', env={'REKONO_CACHE_DIR': directory}
+            )
+            self.assertEqual(0, result.exit_code)
+            self.assertIsNone(cache.load(RekonoMock.url, '/api/steps/', {}, 60))
+            self.assertIsNone(cache.load(RekonoMock.url, '/api/processes/', {}, 60))
+            self.assertIsNotNone(cache.load(RekonoMock.url, '/api/tools/', {}, 60))
@@ -0,0 +1,255 @@
+'''Test resumable exports of Rekono API listings.'''
+
+import gzip
+import io
+import json
+import lzma
+import os
+import tempfile
+from typing import IO, Any, Callable, Dict, List, Set, Tuple
+from unittest import TestCase, mock
+
+from click.testing import CliRunner, Result
+from requests.models import Request, Response
+
+from rekono.client.api import Rekono
+from rekono.client.exceptions import RequestError
+from rekono.framework.checkpoint import ExportCheckpoint
+from rekono.main import rekono
+
+
+class FailingRekono(Rekono):
+    '''Rekono API client whose HTTP session returns paginated testing data and fails once for some pages.'''
+
+    total = 250                                                                 # Total number of testing items
+    failures: Set[int] = set()                                                  # Pages that will fail once
+    invalid: Set[int] = set()                                                   # Pages rejected as invalid once
+    requests: List[Dict[str, Any]] = []                                         # Query parameters of each request
+
+    def __init__(self, url: str, token: str, **kwargs: Any) -> None:
+        '''Create Rekono API client whose HTTP session returns paginated testing data.
+
+        Args:
+            url (str): Base Rekono URL.
+            token (str): API token for Rekono authentication.
+        '''
+        super().__init__(url, token, **kwargs)
+        self.session.get = self._paginated_response                             # type: ignore
+
+    def _paginated_response(self, url: str, params: Dict[str, Any], **kwargs: Any) -> Response:
+        '''Mock paginated GET request to Rekono API.
+
+        Args:
+            url (str): Requested URL.
+            params (Dict[str, Any]): Query parameters, including pagination ones.
+
+        Raises:
+            RequestError: Page has been configured to fail.
+
+        Returns:
+            Response: HTTP response with the requested page.
+        '''
+        page, size = params['page'], params['size']
+        if page in self.failures:
+            self.failures.remove(page)
+            raise RequestError(ConnectionError('Connection reset by peer'))
+        self.requests.append(params)
+        invalid = page in self.invalid
+        self.invalid.discard(page)
+        response = Response()
+        response.request = Request(method='GET', url=url).prepare()
+        response.status_code = 200
+        body = json.dumps({
+            'count': self.total,
+            'results': [{'id': i} for i in range((page - 1) * size, min(page * size, self.total))]
+        }).encode()
+        if invalid or (page > 1 and (page - 1) * size >= self.total):           # Page after the last one
+            response.status_code = 404
+            body = json.dumps({'detail': 'Invalid page.'}).encode()
+        if kwargs.get('stream'):                                                # Body is received when consumed
+            response.raw = io.BytesIO(body)
+        else:
+            response._content = body
+        return response
+
+
+@mock.patch('rekono.framework.commands.command.Rekono', FailingRekono)
+class ExportTest(TestCase):
+    '''Test resumable exports of Rekono API listings.'''
+
+    def setUp(self) -> None:
+        '''Create temporal directory for the export files.'''
+        self.directory = tempfile.TemporaryDirectory()
+        self.output = os.path.join(self.directory.name, 'export.json')
+        self.checkpoint = os.path.join(self.directory.name, 'export.checkpoint')
+        FailingRekono.requests = []
+
+    def tearDown(self) -> None:
+        '''Remove temporal directory.'''
+        self.directory.cleanup()
+
+    def _export(self, *arguments: str) -> Result:
+        '''Run resumable export of vulnerabilities.
+
+        Args:
+            arguments (str): Extra command arguments.
+
+        Returns:
+            Result: Command result.
+        '''
+        return CliRunner().invoke(
+            rekono,
+            ['vulnerabilities', 'get', '--json', self.output, '--resume', self.checkpoint, *arguments],
+            env={'REKONO_TOKEN': 'test', 'REKONO_CACHE_DIR': self.directory.name}
+        )
+
+    def test_resume_after_failure(self) -> None:
+        '''Test export is resumed from the first page that wasn't completed.'''
+        FailingRekono.failures = {2}
+        result = self._export('--output-format', 'ndjson')
+        self.assertEqual(1, result.exit_code)
+        self.assertIn('Connection reset by peer', result.output)
+        with open(self.checkpoint, 'r', encoding='utf-8') as file:
+            self.assertEqual(100, json.load(file)['items'])
+        result = self._export('--output-format', 'ndjson')
+        self.assertEqual(0, result.exit_code)
+        self.assertIn('Resuming export after 100 items', result.output)
+        self.assertEqual([1, 2, 5], [parameters['page'] for parameters in FailingRekono.requests])   # Last page shrunk
+        self.assertEqual('id', FailingRekono.requests[0]['o'])                  # Stable ordering
+        with open(self.output, 'r', encoding='utf-8') as file:
+            self.assertEqual(list(range(250)), [json.loads(line)['id'] for line in file])
+        self.assertFalse(os.path.exists(self.checkpoint))
+
+    def test_partially_written_page(self) -> None:
+        '''Test content written after the last checkpoint is discarded when the export is resumed.'''
+        FailingRekono.failures = {3}
+        self._export()
+        with open(self.output, 'a', encoding='utf-8') as file:                  # Interrupted while writing page
+            file.write(',\n    {\n        "id": 2')
+        self.assertEqual(0, self._export().exit_code)
+        with open(self.output, 'r', encoding='utf-8') as file:
+            self.assertEqual(list(range(250)), [item['id'] for item in json.load(file)])
+
+    def test_streamed_export(self) -> None:
+        '''Test streamed pages are exported and checkpointed like the rest of pages.'''
+        FailingRekono.failures = {3}
+        self.assertEqual(1, self._export('--stream').exit_code)
+        with open(self.checkpoint, 'r', encoding='utf-8') as file:
+            self.assertEqual(200, json.load(file)['items'])
+        self.assertEqual(0, self._export('--stream').exit_code)
+        with open(self.output, 'r', encoding='utf-8') as file:
+            self.assertEqual(list(range(250)), [item['id'] for item in json.load(file)])
+
+    def test_resume_at_the_end(self) -> None:
+        '''Test export interrupted after its last page is finished without requesting pages after the last one.'''
+        FailingRekono.total = 200                                               # Multiple of the page size
+        try:
+            with mock.patch.object(ExportCheckpoint, 'remove'):                 # Interrupted before cleanup
+                self.assertEqual(0, self._export().exit_code)
+            with open(self.checkpoint, 'r', encoding='utf-8') as file:
+                self.assertEqual(200, json.load(file)['items'])
+            FailingRekono.requests = []
+            result = self._export()
+        finally:
+            FailingRekono.total = 250
+        self.assertEqual(0, result.exit_code)
+        self.assertIn('Resuming export after 200 items', result.output)
+        self.assertEqual([], FailingRekono.requests)
+        with open(self.output, 'r', encoding='utf-8') as file:
+            self.assertEqual(list(range(200)), [item['id'] for item in json.load(file)])
+        self.assertFalse(os.path.exists(self.checkpoint))
+
+    def test_export_cut_short(self) -> None:
+        '''Test checkpoint is kept when the pages end before the last item, so that the export can be resumed.'''
+        FailingRekono.failures = {3}
+        self._export()
+        FailingRekono.invalid = {3}                                             # Rejected after the count is known
+        result = self._export()
+        self.assertEqual(1, result.exit_code)
+        self.assertIn('Export stopped after 200 of 250 items', result.output)
+        with open(self.checkpoint, 'r', encoding='utf-8') as file:
+            self.assertEqual(200, json.load(file)['items'])
+        self.assertEqual(0, self._export().exit_code)
+        with open(self.output, 'r', encoding='utf-8') as file:
+            self.assertEqual(list(range(250)), [item['id'] for item in json.load(file)])
+        self.assertFalse(os.path.exists(self.checkpoint))
+
+    def test_different_export(self) -> None:
+        '''Test checkpoint isn't used for a different export.'''
+        FailingRekono.failures = {2}
+        self._export()
+        result = self._export('--severity', 'High')
+        self.assertEqual(1, result.exit_code)
+        self.assertIn('belongs to a different export', result.output)
+
+    def test_json_output_required(self) -> None:
+        '''Test resumable exports require an output file.'''
+        result = CliRunner().invoke(rekono, ['vulnerabilities', 'get', '--resume', self.checkpoint])
+        self.assertEqual(2, result.exit_code)
+
+    def test_compressed_output(self) -> None:
+        '''Test resumable exports can't be compressed, because compressed files can't be truncated by checkpoints.'''
+        self.output += '.gz'
+        self.assertEqual(2, self._export().exit_code)
+
+
+@mock.patch('rekono.framework.commands.command.Rekono', FailingRekono)
+class CompressedOutputTest(TestCase):
+    '''Test compact and compressed output files.'''
+
+    def setUp(self) -> None:
+        '''Create temporal directory for the output files.'''
+        self.directory = tempfile.TemporaryDirectory()
+        FailingRekono.failures = set()
+
+    def tearDown(self) -> None:
+        '''Remove temporal directory.'''
+        self.directory.cleanup()
+
+    def _get(self, filename: str, *arguments: str) -> str:
+        '''Get all vulnerabilities and save them in an output file.
+
+        Args:
+            filename (str): Output filename.
+            arguments (str): Extra command arguments.
+
+        Returns:
+            str: Output filepath.
+        '''
+        filepath = os.path.join(self.directory.name, filename)
+        result = CliRunner().invoke(
+            rekono,
+            ['vulnerabilities', 'get', '--quiet', '--json', filepath, *arguments],
+            env={'REKONO_TOKEN': 'test', 'REKONO_CACHE_DIR': self.directory.name}
+        )
+        self.assertEqual(0, result.exit_code)
+        return filepath
+
+    def test_compact(self) -> None:
+        '''Test compact output has no indentation.'''
+        with open(self._get('export.json', '--compact'), 'r', encoding='utf-8') as file:
+            content = file.read()
+        self.assertEqual(json.dumps([{'id': i} for i in range(250)], separators=(',', ':')), content)
+
+    def test_compressed(self) -> None:
+        '''Test output is compressed based on the file extension.'''
+        compressions: List[Tuple[str, Callable[..., IO[str]]]] = [
+            ('export.json.gz', gzip.open),
+            ('export.json.xz', lzma.open)
+        ]
+        for filename, open_file in compressions:
+            with open_file(self._get(filename), 'rt', encoding='utf-8') as file:
+                self.assertEqual(list(range(250)), [item['id'] for item in json.load(file)])
+        with gzip.open(self._get('export.ndjson.gz', '--output-format', 'ndjson'), 'rt', encoding='utf-8') as file:
+            self.assertEqual(list(range(250)), [json.loads(line)['id'] for line in file])
+
+    @mock.patch('rekono.framework.output.zstandard', None)
+    def test_zstandard_not_installed(self) -> None:
+        '''Test .zst output requires the optional Zstandard dependency.'''
+        result = CliRunner().invoke(
+            rekono,
+            ['vulnerabilities', 'get', '--json', os.path.join(self.directory.name, 'export.json.zst')],
+            env={'REKONO_TOKEN': 'test', 'REKONO_CACHE_DIR': self.directory.name}
+        )
+        self.assertEqual(1, result.exit_code)
+        self.assertIn('zstd extra', result.output)
@@ -1,7 +1,12 @@
 '''Test findings CLI command.'''
 
+import tempfile
+from typing import Dict, List
 from unittest import mock
 
+from click.testing import CliRunner
+
+from rekono.main import rekono
 from tests.framework import RekonoCommandTest
 from tests.mock import RekonoMock
 
@@ -9,6 +14,22 @@ from tests.mock import RekonoMock
 class FindingsTest(RekonoCommandTest):
     '''Test findings CLI command.'''
 
+    def _get_query_parameters(self, arguments: List[str]) -> Dict[str, str]:
+        '''Get query parameters sent by Rekono CLI command to retrieve all pages.
+
+        Args:
+            arguments (List[str]): Command arguments.
+
+        Returns:
+            Dict[str, str]: Query parameters.
+        '''
+        with mock.patch.object(RekonoMock, 'iter_pages', autospec=True, side_effect=RekonoMock.iter_pages) as pages:
+            with tempfile.TemporaryDirectory() as cache_directory:             # Don't use user cache for testing
+                env = {'REKONO_CACHE_DIR': cache_directory}
+                result = CliRunner().invoke(rekono, arguments, input='test\n', env=env)
+        self.assertEqual(0, result.exit_code)
+        return pages.call_args[0][2]
+
     @mock.patch('rekono.framework.commands.command.Rekono', RekonoMock)
     def test_get_one_finding(self) -> None:
         '''Test to get one finding by ID.'''
@@ -22,6 +43,14 @@ class FindingsTest(RekonoCommandTest):
             self._json_body([RekonoMock.data, RekonoMock.data, RekonoMock.data])
         )
 
+    @mock.patch('rekono.framework.commands.command.Rekono', RekonoMock)
+    def test_get_multiple_findings_as_ndjson(self) -> None:
+        '''Test to get multiple findings as JSON Lines.'''
+        self._cli(
+            [self.__class__.__name__.lower().replace('test', ''), 'get', '--output-format', 'ndjson'],
+            self._ndjson_body([RekonoMock.data, RekonoMock.data, RekonoMock.data])
+        )
+
     @mock.patch('rekono.framework.commands.command.Rekono', RekonoMock)
     def test_disable_finding(self) -> None:
         '''Test to disable one finding.'''
@@ -61,6 +90,24 @@ class TechnologiesTest(FindingsTest):
 class VulnerabilitiesTest(FindingsTest):
     '''Test "vulnerabilities" CLI command.'''
 
+    @mock.patch('rekono.framework.commands.command.Rekono', RekonoMock)
+    def test_get_filtered_findings(self) -> None:
+        '''Test to get multiple findings filtered and sorted by Rekono.'''
+        parameters = self._get_query_parameters([
+            'vulnerabilities', 'get',
+            '--project', '1', '--disabled', '--since', '2023-01-01', '--ordering', '-id'
+        ])
+        self.assertEqual({'project', 'is_active', 'last_seen__gte', 'o'}, set(parameters.keys()))
+        self.assertEqual('false', parameters['is_active'])
+        self.assertTrue(parameters['last_seen__gte'].startswith('2023-01-01T00:00:00'))
+        self.assertEqual('-id', parameters['o'])
+
+    @mock.patch('rekono.framework.commands.command.Rekono', RekonoMock)
+    def test_get_vulnerabilities_by_severity(self) -> None:
+        '''Test to get vulnerabilities filtered by severity.'''
+        parameters = self._get_query_parameters(['vulnerabilities', 'get', '--severity', 'Critical'])
+        self.assertEqual({'severity': 'Critical'}, parameters)
+
 
 class OSINTTest(FindingsTest):
     '''Test "osint" CLI command.'''
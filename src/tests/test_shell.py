@@ -0,0 +1,62 @@
+'''Test "shell" CLI command.'''
+
+import tempfile
+from typing import Any
+from unittest import TestCase, mock
+
+from click.testing import CliRunner
+
+from rekono.commands.shell import complete
+from rekono.main import rekono
+from tests.framework import RekonoCommandTest
+from tests.mock import AsyncRekonoMock, RekonoMock
+
+
+class CountedRekonoMock(RekonoMock):
+    '''Rekono API client mock that counts created clients.'''
+
+    instances = 0                                                               # Number of created clients
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        '''Mock constructor for Rekono API client.'''
+        super().__init__(*args, **kwargs)
+        CountedRekonoMock.instances += 1
+
+
+class ShellTest(TestCase):
+    '''Test "shell" CLI command.'''
+
+    @mock.patch('rekono.framework.commands.command.Rekono', CountedRekonoMock)
+    def test_shell(self) -> None:
+        '''Test commands run in the shell reuse the same client.'''
+        CountedRekonoMock.instances = 0
+        commands = 'tools get 1\ntest\ntools get 1\nbogus\nexit\n'              # Token is only requested once
+        with tempfile.TemporaryDirectory() as cache_directory:
+            result = CliRunner().invoke(rekono, ['shell'], input=commands, env={'REKONO_CACHE_DIR': cache_directory})
+        self.assertEqual(0, result.exit_code)
+        self.assertEqual(1, CountedRekonoMock.instances)
+        self.assertEqual(1, result.output.count('API token: '))
+        self.assertEqual(2, result.output.count(RekonoCommandTest._json_body(RekonoMock.data)))
+        self.assertIn('No such command \'bogus\'', result.output)
+
+    @mock.patch('rekono.framework.commands.api.AsyncRekono', AsyncRekonoMock)
+    @mock.patch('rekono.framework.commands.command.AsyncRekono', AsyncRekonoMock)
+    @mock.patch('rekono.framework.commands.command.Rekono', CountedRekonoMock)
+    def test_shell_asyncio(self) -> None:
+        '''Test the API token is only requested once, also for commands that use the asynchronous client.'''
+        command = 'api get --all-pages --asyncio --concurrency 2 entities\n'
+        commands = f'{command}test\n{command}tools get 1\nexit\n'
+        with tempfile.TemporaryDirectory() as cache_directory:
+            result = CliRunner().invoke(rekono, ['shell'], input=commands, env={'REKONO_CACHE_DIR': cache_directory})
+        self.assertEqual(0, result.exit_code)
+        self.assertEqual(1, result.output.count('API token: '))
+        self.assertEqual(1, result.output.count(RekonoCommandTest._json_body(RekonoMock.data)))
+
+    def test_completion(self) -> None:
+        '''Test tab completion of commands and options.'''
+        self.assertEqual(['target-ports ', 'targets ', 'tasks ', 'technologies ', 'tools '], complete(rekono, 't', 't'))
+        self.assertEqual(['get '], complete(rekono, 'tools g', 'g'))
+        self.assertEqual(
+            ['--no-cache ', '--no-verify ', '--no-compression '], complete(rekono, 'tools get --no', '--no')
+        )
+        self.assertEqual([], complete(rekono, 'bogus g', 'g'))
@@ -0,0 +1,90 @@
+'''Test Rekono CLI startup time.'''
+
+import importlib
+import os
+import subprocess
+import sys
+import time
+from typing import List, Set
+from unittest import TestCase, skipUnless
+
+from rekono.main import commands
+
+
+class StartupTest(TestCase):
+    '''Test Rekono CLI startup time.'''
+
+    source = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))        # Directory that contains rekono
+    max_overhead = 0.25                                                         # Seconds over Python startup time
+    runs = 5                                                                    # Runs to measure startup time
+
+    def _run(self, code: str) -> str:
+        '''Execute Python code in a new interpreter.
+
+        Args:
+            code (str): Python code.
+
+        Returns:
+            str: Standard output.
+        '''
+        result = subprocess.run(
+            [sys.executable, '-c', code], cwd=self.source, stdout=subprocess.PIPE, check=True, universal_newlines=True
+        )
+        return result.stdout
+
+    def _get_imported_modules(self, arguments: List[str]) -> Set[str]:
+        '''Get modules imported by Rekono CLI command.
+
+        Args:
+            arguments (List[str]): Command arguments.
+
+        Returns:
+            Set[str]: Names of imported modules.
+        '''
+        code = (
+            'import sys\nfrom rekono.main import rekono\n'
+            f'rekono({arguments}, standalone_mode=False)\nprint("\\n".join(sys.modules))'
+        )
+        return set(self._run(code).splitlines())
+
+    def _measure(self, code: str) -> float:
+        '''Measure the best execution time of Python code in a new interpreter.
+
+        Args:
+            code (str): Python code.
+
+        Returns:
+            float: Seconds.
+        '''
+        times = []
+        for _ in range(self.runs):
+            start = time.perf_counter()
+            self._run(code)
+            times.append(time.perf_counter() - start)
+        return min(times)
+
+    def test_version_and_help_imports(self) -> None:
+        '''Test version and help don't import the HTTP stack nor any command.'''
+        for arguments in [['--version'], ['--help']]:
+            modules = self._get_imported_modules(arguments)
+            for module in ['requests', 'urllib3', 'aiohttp', 'rekono.commands', 'rekono.framework.commands']:
+                self.assertNotIn(module, modules)
+
+    def test_command_imports(self) -> None:
+        '''Test commands don't import optional dependencies that they don't use.'''
+        self.assertNotIn('aiohttp', self._get_imported_modules(['tools', '--help']))
+
+    @skipUnless(os.getenv('REKONO_BENCHMARK'), 'benchmarks depend on machine load, set REKONO_BENCHMARK to run them')
+    def test_startup_time(self) -> None:
+        '''Benchmark Rekono CLI startup time against Python startup time.'''
+        python = self._measure('pass')
+        rekono = self._measure('from rekono.main import rekono\nrekono(["--version"], standalone_mode=False)')
+        self.assertLess(rekono - python, self.max_overhead)
+
+    def test_command_help_messages(self) -> None:
+        '''Test help messages displayed without importing commands are the same than command ones.'''
+        for name, (path, help_message) in commands.items():
+            module, attribute = path.split(':')
+            command = getattr(importlib.import_module(module), attribute)
+            self.assertEqual(name, command.name)
+            self.assertEqual(help_message, command.help)
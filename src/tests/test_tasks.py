@@ -16,6 +16,16 @@ class TasksTest(RekonoCommandTest):
             'arguments': ['tasks', 'get'],
             'output': RekonoCommandTest._json_body([RekonoMock.data, RekonoMock.data, RekonoMock.data])
         },
+        {
+            'arguments': ['tasks', 'get', '--count', '1'],
+            'output': (
+                'Usage: rekono tasks get [OPTIONS] [ID]\n'
+                'Try \'rekono tasks get --help\' for help.\n\n'
+                'Error: Number of entities can\'t be retrieved for one ID'
+            ),
+            'exit_code': 2,
+            'input_values': False
+        },
         {
             'arguments': ['tasks', 'create', '--target', '1', '--process', '1', '--intensity', 'Normal'],
             'output': RekonoCommandTest._json_body(RekonoMock.data)
@@ -56,3 +66,19 @@ class TasksTest(RekonoCommandTest):
             'output': RekonoCommandTest._json_body(RekonoMock.data)
         }
     ]
+
+    def test_get_filtered_tasks(self) -> None:
+        '''Test query parameters sent to get tasks filtered by Rekono.'''
+        arguments = ['tasks', 'get', '--target', '1', '--status', 'Completed', '--search', 'nmap']
+        parameters = self._get_client_call(arguments, 'iter_pages')['parameters']
+        self.assertEqual({'target': '1', 'status': 'Completed', 'search': 'nmap'}, parameters)
+
+    def test_count_tasks(self) -> None:
+        '''Test endpoint and query parameters used to get number of tasks.'''
+        count = self._get_client_call(['tasks', 'get', '--count', '--status', 'Completed'], 'count')
+        self.assertEqual(('/api/tasks/', {'status': 'Completed'}), (count['endpoint'], count['parameters']))
+
+    def test_get_latest_tasks(self) -> None:
+        '''Test limit and ordering used to get the latest tasks.'''
+        pages = self._get_client_call(['tasks', 'get', '--limit', '50', '--ordering', '-start'], 'iter_pages')
+        self.assertEqual((50, 0, {'o': '-start'}), (pages['limit'], pages['offset'], pages['parameters']))
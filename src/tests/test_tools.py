@@ -15,5 +15,19 @@ class ToolsTest(RekonoCommandTest):
         {
             'arguments': ['tools', 'get'],
             'output': RekonoCommandTest._json_body([RekonoMock.data, RekonoMock.data, RekonoMock.data])
+        },
+        {
+            'arguments': ['tools', 'get', '--refresh'],
+            'output': RekonoCommandTest._json_body([RekonoMock.data, RekonoMock.data, RekonoMock.data])
+        },
+        {
+            'arguments': ['tools', 'get', '--concurrency', '2'],
+            'output': RekonoCommandTest._json_body([RekonoMock.data, RekonoMock.data, RekonoMock.data])
         }
     ]
+
+    def test_get_filtered_tools(self) -> None:
+        '''Test query parameters sent to get tools filtered and sorted by Rekono.'''
+        arguments = ['tools', 'get', '--search', 'nmap', '--ordering', 'name']
+        parameters = self._get_client_call(arguments, 'iter_pages')['parameters']
+        self.assertEqual({'search': 'nmap', 'o': 'name'}, parameters)
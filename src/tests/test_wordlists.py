@@ -1,7 +1,14 @@
 '''Test "wordlists" CLI command.'''
 
 import os
+import tempfile
+from typing import Any, List
+from unittest import TestCase, mock
 
+from click.testing import CliRunner
+from requests.models import Response
+
+from rekono.main import rekono
 from tests.framework import RekonoCommandTest
 from tests.mock import RekonoMock
 
@@ -22,8 +29,65 @@ class WordlistsTest(RekonoCommandTest):
             'arguments': ['wordlists', 'create', '-n', 'Wordlist', '-t', 'Endpoint', '-f', os.path.realpath(__file__)],
             'output': RekonoCommandTest._json_body(RekonoMock.data)
         },
+        {
+            'arguments': [
+                'wordlists', 'create', '-n', 'Wordlist', '-f', os.path.realpath(__file__), '--skip-unchanged'
+            ],
+            'output': RekonoCommandTest._json_body(RekonoMock.data)
+        },
         {
             'arguments': ['wordlists', 'delete', '1'],
             'output': RekonoCommandTest._json_body([])
         }
     ]
+
+
+class UploadedRekonoMock(RekonoMock):
+    '''Rekono API client mock that records upload requests.'''
+
+    uploads: List[str] = []                                                     # Methods of the upload requests
+
+    def post(self, *args: Any, **kwargs: Any) -> Response:
+        '''Mock POST request to Rekono API.
+
+        Returns:
+            Response: HTTP response.
+        '''
+        UploadedRekonoMock.uploads.append('POST')
+        return super().post(*args, **kwargs)
+
+    def put(self, *args: Any, **kwargs: Any) -> Response:
+        '''Mock PUT request to Rekono API.
+
+        Returns:
+            Response: HTTP response.
+        '''
+        UploadedRekonoMock.uploads.append('PUT')
+        return super().put(*args, **kwargs)
+
+
+class SkipUnchangedTest(TestCase):
+    '''Test wordlist uploads are skipped when their content hasn't changed.'''
+
+    @mock.patch('rekono.framework.commands.command.Rekono', UploadedRekonoMock)
+    def test_skip_unchanged(self) -> None:
+        '''Test unchanged wordlists aren't uploaded again and the ones with changes in file or fields are updated.'''
+        UploadedRekonoMock.uploads = []
+        with tempfile.TemporaryDirectory() as directory:
+            filepath = os.path.join(directory, 'wordlist.txt')
+            arguments = ['wordlists', 'create', '-n', 'Wordlist', '-f', filepath, '--skip-unchanged']
+            env = {'REKONO_CACHE_DIR': directory}
+            outputs = []
+            for content, wordlist_type in [
+                ('admin\n', 'Endpoint'), ('admin\n', 'Endpoint'),               # Same file and fields
+                ('admin\n', 'Subdomain'), ('admin\nlogin\n', 'Subdomain')       # Changes in fields and file
+            ]:
+                with open(filepath, 'w', encoding='utf-8') as file:
+                    file.write(content)
+                result = CliRunner().invoke(rekono, [*arguments, '-t', wordlist_type], input='test\n', env=env)
+                self.assertEqual(0, result.exit_code)
+                outputs.append(result.output)
+        self.assertEqual(['POST', 'PUT', 'PUT'], UploadedRekonoMock.uploads)
+        self.assertIn('Wordlist Wordlist hasn\'t changed since its last upload', outputs[1])
+        for output in outputs:
+            self.assertIn(RekonoCommandTest._json_body(RekonoMock.data), output)